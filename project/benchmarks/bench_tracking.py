@@ -0,0 +1,147 @@
+"""
+Benchmark de ArucoTracker.detect sobre escenas sintéticas 1080p
+(benchmarks/synthetic.py): FPS de detección, latencia por etapa y error
+de pose contra las poses verdaderas del render.
+
+Los frames se renderizan antes de medir, así que el tiempo de render no
+cuenta. Cada variante recorre la misma secuencia en orden (el modo ROI
+depende del frame anterior).
+
+    python -m project.benchmarks.bench_tracking --frames 120 --noise 4 --motion-blur 7
+
+Etapas (diagnostics.profiler):
+    gray     cvtColor BGR → gris
+    detect   búsqueda de marcadores (imagen completa, pirámide o ROIs)
+    markers  pose de los marcadores de referencia
+    board    estimatePoseBoard del instrumento
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from project.benchmarks.synthetic import Degradation, SyntheticScene, pose_error, spread_board
+from project.calibration.registry import registry as calibration_registry
+from project.diagnostics.profiler import Profiler
+from project.tracking.aruco_tracker import ArucoTracker
+
+# Etapas que ArucoTracker.detect registra en su Profiler
+STAGES = {
+    "gray": "tracker.gray",
+    "detect": "tracker.detect_markers",
+    "markers": "tracker.marker_pose",
+    "board": "tracker.board_pose",
+}
+
+VARIANTS = {
+    "full": {},
+    "roi": {"roi_tracking": True},
+    "pyramid1": {"pyramid_levels": 1},
+}
+
+
+def run_variant(frames, scene, options, marker_length):
+    profiler = Profiler(capacity=len(frames))
+    tracker = ArucoTracker(marker_length, scene.camera_matrix, scene.dist_coeffs, profiler=profiler, **options)
+    tracker.board = scene.board
+
+    # Calentamiento fuera de la medición
+    tracker.detect(frames[0].image)
+    tracker.reset_tracking()
+
+    # Throughput de detect() tal cual
+    totals = []
+    errors = {0: [], "instrument": []}
+    for frame in frames:
+        start = time.perf_counter()
+        transforms, _, _, _ = tracker.detect(frame.image)
+        totals.append(1000.0 * (time.perf_counter() - start))
+
+        for tool_id, samples in errors.items():
+            if tool_id in transforms:
+                samples.append(pose_error(transforms[tool_id], frame.truth[tool_id]))
+
+    # Desglose por etapa en una segunda pasada, con el perfilador activo
+    tracker.reset_tracking()
+    profiler.enable()
+    for frame in frames:
+        tracker.detect(frame.image)
+
+    stages = profiler.snapshot()["stages"]
+    return totals, {name: stages.get(key) for name, key in STAGES.items()}, errors
+
+
+def summarize(values):
+    values = np.asarray(values)
+    if len(values) == 0:
+        return float("nan"), float("nan"), float("nan")
+    return float(values.mean()), float(np.percentile(values, 50)), float(np.percentile(values, 95))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--frames", type=int, default=90)
+    parser.add_argument("--variants", nargs="+", default=list(VARIANTS), choices=list(VARIANTS))
+    parser.add_argument("--marker-length", type=float, default=0.045)
+    parser.add_argument(
+        "--board-radius",
+        type=float,
+        default=0.05,
+        help="separa los marcadores del board a lo largo de su normal (m); 0 usa el JSON tal cual",
+    )
+    parser.add_argument("--noise", type=float, default=2.0, help="sigma del ruido (niveles de gris)")
+    parser.add_argument("--blur", type=float, default=0.6, help="sigma del blur gaussiano (px)")
+    parser.add_argument("--motion-blur", type=int, default=0, help="longitud del blur de movimiento (px)")
+    parser.add_argument("--gain", type=float, default=1.0)
+    parser.add_argument("--gradient", type=float, default=0.2, help="variación de iluminación de lado a lado")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    board, _ = calibration_registry.instrument_board()
+    if args.board_radius:
+        board = spread_board(board, args.board_radius)
+
+    scene = SyntheticScene(
+        marker_length=args.marker_length,
+        board=board,
+        degradation=Degradation(args.noise, args.blur, args.motion_blur, args.gain, args.gradient),
+        seed=args.seed,
+    )
+
+    start = time.perf_counter()
+    frames = scene.frames(args.frames)
+    print(f"{len(frames)} frames {scene.size[0]}x{scene.size[1]} renderizados en {time.perf_counter() - start:.1f} s\n")
+
+    header = f"{'variante':<10} {'fps':>7} {'media ms':>9} {'p50':>7} {'p95':>7}"
+    for stage in STAGES:
+        header += f" {stage + ' p50':>12}"
+    print(header)
+
+    results = {}
+    for name in args.variants:
+        totals, timings, errors = run_variant(frames, scene, VARIANTS[name], args.marker_length)
+        results[name] = errors
+
+        mean, p50, p95 = summarize(totals)
+        line = f"{name:<10} {1000.0 / mean:>7.1f} {mean:>9.2f} {p50:>7.2f} {p95:>7.2f}"
+        for stage in STAGES:
+            entry = timings[stage]
+            line += f" {entry['p50_ms'] if entry else float('nan'):>12.2f}"
+        print(line)
+
+    print(f"\n{'variante':<10} {'herramienta':<12} {'detección':>9} {'mm media':>9} {'mm p95':>7} {'° media':>8} {'° p95':>7}")
+    for name, errors in results.items():
+        for tool_id, samples in errors.items():
+            samples = np.array(samples).reshape(-1, 2)
+            rate = 100.0 * len(samples) / len(frames)
+            mm_mean, _, mm_p95 = summarize(samples[:, 0])
+            deg_mean, _, deg_p95 = summarize(samples[:, 1])
+            print(
+                f"{name:<10} {str(tool_id):<12} {rate:>8.0f}% "
+                f"{mm_mean:>9.2f} {mm_p95:>7.2f} {deg_mean:>8.2f} {deg_p95:>7.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
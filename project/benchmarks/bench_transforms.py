@@ -0,0 +1,121 @@
+"""
+Microbenchmark de la cadena de transformaciones que se hace en cada frame:
+
+    T_camera_pointer    = T_camera_instrument @ T_tip
+    T_reference_pointer = T_camera_reference.inverse() @ T_camera_pointer
+    matriz 4x4 para OpenIGTLink
+
+Compara la implementación anterior de Transform (copia en cada
+construcción y en cada acceso), la actual con operadores (reserva memoria
+en cada paso) y la versión *_into sobre buffers reutilizados.
+
+    python -m project.benchmarks.bench_transforms
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from project.math3d.transforms import Transform
+
+
+class CopyingTransform:
+    """
+    Transform tal como estaba antes: astype en __init__ y copias al leer.
+    """
+
+    def __init__(self, matrix):
+        self._T = matrix.astype(np.float64)
+
+    def inverse(self):
+        R = self._T[:3, :3]
+        t = self._T[:3, 3]
+        T_inv = np.eye(4, dtype=np.float64)
+        T_inv[:3, :3] = R.T
+        T_inv[:3, 3] = -R.T @ t
+        return CopyingTransform(T_inv)
+
+    def __matmul__(self, other):
+        return CopyingTransform(self._T @ other._T)
+
+    def matrix(self):
+        return self._T.copy()
+
+
+def make_inputs(seed=0):
+    rng = np.random.default_rng(seed)
+    T_camera_reference = Transform.from_rvec_tvec(rng.normal(size=3), rng.normal(size=3))
+    T_camera_instrument = Transform.from_rvec_tvec(rng.normal(size=3), rng.normal(size=3))
+    T_tip = Transform.from_rotation_translation(np.eye(3), np.array([0.0, 0.0, 0.2013]))
+    return T_camera_reference, T_camera_instrument, T_tip
+
+
+def chain_allocating(T_camera_reference, T_camera_instrument, T_tip):
+    def step():
+        T_camera_pointer = T_camera_instrument @ T_tip
+        T_reference_pointer = T_camera_reference.inverse() @ T_camera_pointer
+        return T_reference_pointer.matrix()
+
+    return step
+
+
+def chain_copying(T_camera_reference, T_camera_instrument, T_tip):
+    T_camera_reference = CopyingTransform(T_camera_reference.matrix())
+    T_camera_instrument = CopyingTransform(T_camera_instrument.matrix())
+    T_tip = CopyingTransform(T_tip.matrix())
+    return chain_allocating(T_camera_reference, T_camera_instrument, T_tip)
+
+
+def chain_into(T_camera_reference, T_camera_instrument, T_tip):
+    T_camera_pointer = Transform.identity()
+    T_reference_camera = Transform.identity()
+    T_reference_pointer = Transform.identity()
+
+    def step():
+        T_camera_instrument.compose_into(T_tip, T_camera_pointer)
+        T_camera_reference.inverse_into(T_reference_camera)
+        T_reference_camera.compose_into(T_camera_pointer, T_reference_pointer)
+        return T_reference_pointer.view()
+
+    return step
+
+
+def measure(step, iterations):
+    for _ in range(1000):
+        step()
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        step()
+    elapsed = time.perf_counter() - start
+
+    return 1e6 * elapsed / iterations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=100000)
+    args = parser.parse_args()
+
+    inputs = make_inputs()
+    variants = (
+        ("antes", chain_copying),
+        ("operadores", chain_allocating),
+        ("into", chain_into),
+    )
+
+    expected = chain_copying(*inputs)()
+    for _, factory in variants:
+        assert np.allclose(factory(*inputs)(), expected)
+
+    print(f"{'variante':<12} {'us/frame':>10} {'vs antes':>10}")
+    baseline = None
+    for name, factory in variants:
+        per_call = measure(factory(*inputs), args.iterations)
+        baseline = baseline or per_call
+        print(f"{name:<12} {per_call:>10.2f} {baseline / per_call:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
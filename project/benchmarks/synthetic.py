@@ -0,0 +1,293 @@
+"""
+Escenas sintéticas para medir ArucoTracker: el marcador de referencia y
+el board del instrumento renderizados en poses conocidas, con ruido, blur
+y variaciones de iluminación.
+
+Cada marcador se dibuja con una homografía del bitmap de ArUco (con su
+margen blanco) a las esquinas proyectadas con los intrínsecos y la
+distorsión de la cámara, solo dentro de su bounding box. Las caras que no
+miran a la cámara se omiten y el resto se pinta de atrás hacia delante.
+"""
+
+import math
+from dataclasses import dataclass
+
+import cv2
+import numpy as np
+from calibration.registry import registry as calibration_registry
+from math3d.transforms import Transform
+from tracking.marker import marker_object_points
+
+DICTIONARY = cv2.aruco.DICT_6X6_250
+
+
+@dataclass(slots=True)
+class SceneFrame:
+    """
+    image: BGR uint8
+    truth: {0: T_camera_reference, "instrument": T_camera_instrument}
+    """
+
+    image: np.ndarray
+    truth: dict
+    timestamp: float
+
+
+@dataclass(slots=True)
+class Degradation:
+    """
+    noise_sigma: ruido gaussiano por píxel (niveles de gris)
+    blur_sigma: blur gaussiano (px); motion_blur: longitud (px), 0 sin
+    gain: ganancia global; gradient: variación lineal de iluminación de
+          un borde de la imagen al otro (fracción)
+    """
+
+    noise_sigma: float = 2.0
+    blur_sigma: float = 0.6
+    motion_blur: int = 0
+    gain: float = 1.0
+    gradient: float = 0.2
+
+
+class MarkerRenderer:
+    """
+    Dibuja marcadores planos (esquinas 3D en el orden de OpenCV) sobre
+    una imagen.
+    """
+
+    def __init__(self, camera_matrix, dist_coeffs, texture_size=240):
+        self.camera_matrix = np.asarray(camera_matrix, dtype=np.float64)
+        self.dist_coeffs = np.asarray(dist_coeffs, dtype=np.float64)
+        self.dictionary = cv2.aruco.getPredefinedDictionary(DICTIONARY)
+        self.texture_size = texture_size
+
+        # Margen blanco de un módulo alrededor del cuadrado negro
+        self._margin = texture_size // 8
+        self._textures = {}
+
+    def texture(self, marker_id):
+        texture = self._textures.get(marker_id)
+        if texture is None:
+            marker = cv2.aruco.generateImageMarker(self.dictionary, marker_id, self.texture_size)
+            texture = cv2.copyMakeBorder(
+                marker, self._margin, self._margin, self._margin, self._margin,
+                cv2.BORDER_CONSTANT, value=255,
+            )
+            self._textures[marker_id] = texture
+        return texture
+
+    def draw(self, image, markers):
+        """
+        markers: [(marker_id, esquinas (4, 3) en el sistema de la cámara)].
+        """
+        visible = []
+        for marker_id, corners in markers:
+            corners = np.asarray(corners, dtype=np.float64)
+            # Con el orden de OpenCV este producto apunta al dorso del marcador
+            back = np.cross(corners[1] - corners[0], corners[3] - corners[0])
+            center = corners.mean(axis=0)
+
+            # Cara de frente a la cámara y delante de ella
+            if np.dot(back, center) > 0 and np.all(corners[:, 2] > 0.05):
+                visible.append((float(np.linalg.norm(center)), marker_id, corners))
+
+        for _, marker_id, corners in sorted(visible, key=lambda item: -item[0]):
+            self._draw_one(image, marker_id, corners)
+
+        return image
+
+    def _draw_one(self, image, marker_id, corners):
+        projected, _ = cv2.projectPoints(
+            corners, np.zeros(3), np.zeros(3), self.camera_matrix, self.dist_coeffs
+        )
+        projected = projected.reshape(4, 2)
+
+        m, s = self._margin, self.texture_size
+        source = np.array([[m, m], [m + s, m], [m + s, m + s], [m, m + s]], dtype=np.float64)
+        H = cv2.getPerspectiveTransform(source.astype(np.float32), projected.astype(np.float32))
+
+        # Bounding box del marcador con su margen blanco
+        texture = self.texture(marker_id)
+        size = texture.shape[0]
+        outline = cv2.perspectiveTransform(
+            np.array([[[0, 0], [size, 0], [size, size], [0, size]]], dtype=np.float64), H
+        )[0]
+
+        height, width = image.shape[:2]
+        x0 = max(int(math.floor(outline[:, 0].min())), 0)
+        y0 = max(int(math.floor(outline[:, 1].min())), 0)
+        x1 = min(int(math.ceil(outline[:, 0].max())) + 1, width)
+        y1 = min(int(math.ceil(outline[:, 1].max())) + 1, height)
+        if x1 <= x0 or y1 <= y0:
+            return
+
+        shift = np.array([[1.0, 0.0, -x0], [0.0, 1.0, -y0], [0.0, 0.0, 1.0]])
+        H_roi = shift @ H
+        roi_size = (x1 - x0, y1 - y0)
+
+        warped = cv2.warpPerspective(texture, H_roi, roi_size, flags=cv2.INTER_LINEAR)
+        mask = cv2.warpPerspective(np.full_like(texture, 255), H_roi, roi_size, flags=cv2.INTER_LINEAR)
+
+        roi = image[y0:y1, x0:x1]
+        alpha = (mask.astype(np.float32) / 255.0)[..., None]
+        roi[...] = (alpha * warped[..., None] + (1.0 - alpha) * roi).astype(np.uint8)
+
+
+def board_markers(board, T_camera_board):
+    """
+    [(marker_id, esquinas en la cámara)] de un cv2.aruco.Board.
+    """
+    R = T_camera_board.rotation()
+    t = T_camera_board.translation()
+    return [
+        (int(marker_id), np.asarray(points, dtype=np.float64).reshape(4, 3) @ R.T + t)
+        for marker_id, points in zip(board.getIds().ravel(), board.getObjPoints())
+    ]
+
+
+def spread_board(board, radius):
+    """
+    Copia del board con cada marcador desplazado radius metros a lo largo
+    de su normal. instrument_marker_calibration.json guarda todos los
+    marcadores centrados en el origen (solo difieren en la rotación), así
+    que sin esto se dibujan uno encima de otro.
+    """
+    objects = []
+    for points in board.getObjPoints():
+        points = np.asarray(points, dtype=np.float64).reshape(4, 3)
+        front = -np.cross(points[1] - points[0], points[3] - points[0])
+        objects.append((points + radius * front / np.linalg.norm(front)).astype(np.float32))
+
+    return cv2.aruco.Board(objects, board.getDictionary(), board.getIds())
+
+
+def single_marker(marker_id, marker_length, T_camera_marker):
+    points = marker_object_points(marker_length).astype(np.float64)
+    return [(marker_id, points @ T_camera_marker.rotation().T + T_camera_marker.translation())]
+
+
+def degrade(image, degradation, rng):
+    """
+    Aplica iluminación, blur y ruido; devuelve una imagen nueva.
+    """
+    height, width = image.shape[:2]
+    result = image.astype(np.float32)
+
+    if degradation.gain != 1.0 or degradation.gradient:
+        ramp = np.linspace(-0.5, 0.5, width, dtype=np.float32) * degradation.gradient
+        result *= (degradation.gain * (1.0 + ramp))[None, :, None]
+
+    if degradation.blur_sigma > 0:
+        result = cv2.GaussianBlur(result, (0, 0), degradation.blur_sigma)
+
+    if degradation.motion_blur > 1:
+        kernel = np.zeros((degradation.motion_blur, degradation.motion_blur), dtype=np.float32)
+        kernel[degradation.motion_blur // 2, :] = 1.0 / degradation.motion_blur
+        result = cv2.filter2D(result, -1, kernel)
+
+    if degradation.noise_sigma > 0:
+        noise = np.empty((height, width), dtype=np.float32)
+        cv2.setRNGSeed(int(rng.integers(2 ** 31)))
+        cv2.randn(noise, 0.0, degradation.noise_sigma)
+        result += noise[..., None]
+
+    return np.clip(result, 0, 255).astype(np.uint8)
+
+
+class SyntheticScene:
+    """
+    Secuencia de frames 1080p con el marcador de referencia (id 0) fijo
+    cerca del centro y el instrumento moviéndose suavemente delante de la
+    cámara (apto para roi_tracking).
+
+    board: cv2.aruco.Board del instrumento; por defecto el del registro de
+    calibración (instrument_marker_calibration.json) tal cual. Sus
+    marcadores miran hacia +y del board.
+    """
+
+    def __init__(
+        self,
+        camera_matrix=None,
+        dist_coeffs=None,
+        size=(1920, 1080),
+        marker_length=0.045,
+        board=None,
+        degradation=None,
+        fps=30.0,
+        seed=0,
+    ):
+        if camera_matrix is None:
+            camera_matrix, dist_coeffs = calibration_registry.intrinsics()
+        if board is None:
+            board, _ = calibration_registry.instrument_board()
+
+        self.camera_matrix = np.asarray(camera_matrix, dtype=np.float64)
+        self.dist_coeffs = np.zeros(5) if dist_coeffs is None else np.asarray(dist_coeffs, dtype=np.float64)
+        self.size = size
+        self.marker_length = marker_length
+        self.board = board
+        self.degradation = Degradation() if degradation is None else degradation
+        self.fps = fps
+
+        self.renderer = MarkerRenderer(self.camera_matrix, self.dist_coeffs)
+        self._rng = np.random.default_rng(seed)
+        self._background = self._make_background()
+
+    def _make_background(self):
+        width, height = self.size
+        # Fondo gris con variación suave para que el umbral adaptativo trabaje
+        low = self._rng.uniform(100, 160, (height // 60 + 2, width // 60 + 2)).astype(np.float32)
+        background = cv2.resize(low, (width, height), interpolation=cv2.INTER_CUBIC)
+        return cv2.cvtColor(np.clip(background, 0, 255).astype(np.uint8), cv2.COLOR_GRAY2BGR)
+
+    def poses(self, k):
+        """
+        Poses verdaderas del frame k.
+        """
+        t = k / self.fps
+
+        # Referencia: inclinada hacia la cámara a 0.45 m
+        T_camera_reference = Transform.from_rvec_tvec(
+            np.array([math.pi + 0.3, 0.0, 0.1]), np.array([-0.08, 0.04, 0.45])
+        )
+
+        # Instrumento: trayectoria suave y giro lento alrededor de su eje
+        position = np.array([
+            0.06 + 0.04 * math.sin(0.7 * t),
+            -0.05 + 0.03 * math.sin(1.1 * t),
+            0.40 + 0.05 * math.sin(0.5 * t),
+        ])
+        rvec = np.array([-math.pi * 0.5 + 0.3 * math.sin(0.9 * t), 0.4 * math.sin(0.6 * t), 0.2])
+        T_camera_instrument = Transform.from_rvec_tvec(rvec, position)
+
+        return {0: T_camera_reference, "instrument": T_camera_instrument}
+
+    def render(self, k, hidden=()):
+        """
+        hidden: herramientas (0 o "instrument") que no se dibujan en este
+        frame, p. ej. para simular una oclusión; su pose sigue en truth.
+        """
+        truth = self.poses(k)
+
+        markers = []
+        if 0 not in hidden:
+            markers += single_marker(0, self.marker_length, truth[0])
+        if "instrument" not in hidden:
+            markers += board_markers(self.board, truth["instrument"])
+
+        image = self.renderer.draw(self._background.copy(), markers)
+        image = degrade(image, self.degradation, self._rng)
+        return SceneFrame(image, truth, k / self.fps)
+
+    def frames(self, count):
+        return [self.render(k) for k in range(count)]
+
+
+def pose_error(T_estimated, T_true):
+    """
+    (error de traslación en mm, error de rotación en grados).
+    """
+    translation = 1000.0 * float(np.linalg.norm(T_estimated.translation() - T_true.translation()))
+    R = T_true.rotation().T @ T_estimated.rotation()
+    angle = math.acos(max(-1.0, min(1.0, (np.trace(R) - 1.0) / 2.0)))
+    return translation, math.degrees(angle)
@@ -4,8 +4,10 @@ import json
 import os
 from scipy.spatial.transform import Rotation
 
+from project.calibration.registry import load_intrinsics
 from project.camera.camera import Camera
 from project.tracking.aruco_tracker import ArucoTracker
+from project.tracking.marker import estimate_marker_poses
 
 
 def main():
@@ -16,9 +18,7 @@ def main():
 
     camera = Camera(index=0, width=1920, height=1080)
 
-    calib = np.load("project/calibration/calibration.npz")
-    camera_matrix = calib["mtx"]
-    dist_coeffs = calib["dist"]
+    camera_matrix, dist_coeffs = load_intrinsics()
 
     tracker = ArucoTracker(
         marker_length=0.045,
@@ -43,23 +43,19 @@ def main():
 
         if ids is not None:
 
-            ids_flat = ids.flatten()
+            pose_ids, rvecs, tvecs = estimate_marker_poses(
+                corners,
+                ids,
+                tracker.marker_length,
+                camera_matrix,
+                dist_coeffs,
+                wanted_ids=[target_id],
+            )
 
-            if target_id in ids_flat:
+            if len(pose_ids) > 0:
 
-                idx = np.where(ids_flat == target_id)[0][0]
-
-                marker_corners = np.array([corners[idx]])
-
-                rvecs, tvecs, _ = cv2.aruco.estimatePoseSingleMarkers(
-                    marker_corners,
-                    tracker.marker_length,
-                    camera_matrix,
-                    dist_coeffs
-                )
-
-                rvec_marker = rvecs[0][0]
-                tvec_marker = tvecs[0][0]
+                rvec_marker = rvecs[0]
+                tvec_marker = tvecs[0]
 
                 R_marker, _ = cv2.Rodrigues(rvec_marker)
 
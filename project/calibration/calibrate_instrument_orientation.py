@@ -2,8 +2,10 @@ import cv2
 import numpy as np
 from scipy.spatial.transform import Rotation as R_scipy
 
+from project.calibration.registry import load_intrinsics
 from project.camera.camera import Camera
 from project.tracking.aruco_tracker import ArucoTracker
+from project.tracking.marker import estimate_marker_poses
 
 def main():
     print("Iniciando calibración del instrumento.")
@@ -13,9 +15,7 @@ def main():
     camera = Camera(index=0, width=1920, height=1080)
 
     # 2. Calibración real
-    calib = np.load("project/calibration/calibration.npz")
-    camera_matrix = calib["mtx"]
-    dist_coeffs = calib["dist"]
+    camera_matrix, dist_coeffs = load_intrinsics()
 
     # 3. Tracker
     tracker = ArucoTracker(
@@ -43,34 +43,21 @@ def main():
             T_camera_board = transforms["instrument"]
             R_camera_board = T_camera_board.rotation()
 
-            # 2. Obtener la pose individual del marcador 10 usando estimatePoseSingleMarkers
-            idx = np.where(ids.flatten() == 10)[0][0]
-            corner_10 = corners[idx]
+            # 2. Obtener la pose individual del marcador 10 (IPPE_SQUARE)
+            pose_ids, rvecs_10, _ = estimate_marker_poses(
+                corners,
+                ids,
+                tracker.marker_length,
+                tracker.camera_matrix,
+                tracker.dist_coeffs,
+                wanted_ids=[10],
+            )
 
             R_camera_10 = None
             valid_pose = False
-            if hasattr(cv2.aruco, 'estimatePoseSingleMarkers'):
-                rvec_10, tvec_10, _ = cv2.aruco.estimatePoseSingleMarkers(
-                    [corner_10], tracker.marker_length, tracker.camera_matrix, tracker.dist_coeffs
-                )
-                if rvec_10 is not None:
-                    R_camera_10, _ = cv2.Rodrigues(rvec_10[0][0])
-                    valid_pose = True
-            else:
-                # Fallback para OpenCV 4.7+ si estimatePoseSingleMarkers no está disponible
-                half_l = tracker.marker_length / 2.0
-                obj_points = np.array([
-                    [-half_l,  half_l, 0],
-                    [ half_l,  half_l, 0],
-                    [ half_l, -half_l, 0],
-                    [-half_l, -half_l, 0]
-                ], dtype=np.float32)
-                success, rvec_10, tvec_10 = cv2.solvePnP(
-                    obj_points, corner_10, tracker.camera_matrix, tracker.dist_coeffs, flags=cv2.SOLVEPNP_IPPE_SQUARE
-                )
-                if success:
-                    R_camera_10, _ = cv2.Rodrigues(rvec_10)
-                    valid_pose = True
+            if len(pose_ids) > 0:
+                R_camera_10, _ = cv2.Rodrigues(rvecs_10[0])
+                valid_pose = True
 
             if valid_pose and R_camera_10 is not None:
                 # 3. Calcular la normal del marcador 10 en coordenadas de cámara
@@ -1,6 +1,7 @@
 import os
 
 import cv2
+from camera.camera import default_backend
 
 OUTPUT_DIR = "project/calibration/images"
 
@@ -9,7 +10,7 @@ def main():
 
     os.makedirs(OUTPUT_DIR, exist_ok=True)
 
-    cap = cv2.VideoCapture(0, cv2.CAP_DSHOW)
+    cap = cv2.VideoCapture(0, default_backend())
     cap.set(cv2.CAP_PROP_FRAME_WIDTH, 1920)
     cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 1080)
 
@@ -1,8 +1,10 @@
 import cv2
 import numpy as np
 
+from project.calibration.registry import load_intrinsics
 from project.camera.camera import Camera
 from project.tracking.aruco_tracker import ArucoTracker
+from project.tracking.marker import estimate_marker_poses
 
 
 def rotation_matrix(rx, ry, rz):
@@ -39,9 +41,7 @@ def main():
 
     camera = Camera(index=0, width=1920, height=1080)
 
-    calib = np.load("project/calibration/calibration.npz")
-    camera_matrix = calib["mtx"]
-    dist_coeffs = calib["dist"]
+    camera_matrix, dist_coeffs = load_intrinsics()
 
     tracker = ArucoTracker(
         marker_length=0.045,
@@ -59,16 +59,18 @@ def main():
 
         frame = camera.read()
 
-        transforms, corners, ids, rvecs = tracker.detect(frame)
+        transforms, corners, ids, _ = tracker.detect(frame)
 
         if ids is not None:
             cv2.aruco.drawDetectedMarkers(frame, corners, ids)
 
-        if ids is not None and 10 in ids.flatten():
+        pose_ids, rvecs, _ = estimate_marker_poses(
+            corners, ids, tracker.marker_length, camera_matrix, dist_coeffs, wanted_ids=[10]
+        )
 
-            idx = np.where(ids.flatten()==10)[0][0]
+        if len(pose_ids) > 0:
 
-            rvec = rvecs[idx]
+            rvec = rvecs[0]
             R_cam_marker, _ = cv2.Rodrigues(rvec)
 
             R_manual = rotation_matrix(rx, ry, rz)
@@ -5,17 +5,17 @@ import json
 import os
 from scipy.spatial.transform import Rotation as R_scipy
 
+from project.calibration.registry import load_intrinsics
 from project.camera.camera import Camera
 from project.tracking.aruco_tracker import ArucoTracker
+from project.tracking.marker import estimate_marker_poses
 
 def main():
     print("Iniciando calibración manual de marcadores...")
     
     camera = Camera(index=0, width=1920, height=1080)
     
-    calib = np.load("project/calibration/calibration.npz")
-    camera_matrix = calib["mtx"]
-    dist_coeffs = calib["dist"]
+    camera_matrix, dist_coeffs = load_intrinsics()
     
     tracker = ArucoTracker(
         marker_length=0.045,
@@ -57,22 +57,19 @@ def main():
         if ids is not None:
             cv2.aruco.drawDetectedMarkers(frame, corners, ids)
             
-            ids_flat = ids.flatten()
-            if target_id in ids_flat:
+            pose_ids, rvecs, tvecs = estimate_marker_poses(
+                corners,
+                ids,
+                tracker.marker_length,
+                camera_matrix,
+                dist_coeffs,
+                wanted_ids=[target_id],
+            )
+            if len(pose_ids) > 0:
                 target_detected = True
                 
-                idx = np.where(ids_flat == target_id)[0][0]
-                marker_corners = np.array([corners[idx]])
-                
-                rvecs, tvecs, _ = cv2.aruco.estimatePoseSingleMarkers(
-                    marker_corners,
-                    tracker.marker_length,
-                    camera_matrix,
-                    dist_coeffs
-                )
-                
-                rvec = rvecs[0][0]
-                tvec = tvecs[0][0]
+                rvec = rvecs[0]
+                tvec = tvecs[0]
                 
                 R_marker, _ = cv2.Rodrigues(rvec)
                 T_marker = np.eye(4)
@@ -2,8 +2,10 @@ import cv2
 import numpy as np
 import trimesh
 
+from project.calibration.registry import load_intrinsics
 from project.camera.camera import Camera
 from project.tracking.aruco_tracker import ArucoTracker
+from project.tracking.marker import estimate_marker_poses
 from pathlib import Path
 
 
@@ -51,9 +53,7 @@ def main():
 
     camera = Camera(index=0,width=1920,height=1080)
 
-    calib = np.load("project/calibration/calibration.npz")
-    camera_matrix = calib["mtx"]
-    dist = calib["dist"]
+    camera_matrix, dist = load_intrinsics()
 
     tracker = ArucoTracker(
         marker_length=0.045,
@@ -81,19 +81,19 @@ def main():
         if ids is not None:
             cv2.aruco.drawDetectedMarkers(frame,corners,ids)
 
-        if ids is not None and 10 in ids.flatten():
+        pose_ids,rvecs,tvecs = estimate_marker_poses(
+            corners,
+            ids,
+            tracker.marker_length,
+            camera_matrix,
+            dist,
+            wanted_ids=[10]
+        )
 
-            rvecs,tvecs,_ = cv2.aruco.estimatePoseSingleMarkers(
-                corners,
-                tracker.marker_length,
-                camera_matrix,
-                dist
-            )
-
-            idx = np.where(ids.flatten()==10)[0][0]
+        if len(pose_ids) > 0:
 
-            rvec = rvecs[idx]
-            tvec = tvecs[idx]
+            rvec = rvecs[0]
+            tvec = tvecs[0]
 
             R_manual = rotation_matrix(rx,ry,rz)
 
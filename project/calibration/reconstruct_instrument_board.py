@@ -3,8 +3,11 @@ import numpy as np
 import time
 from scipy.spatial.transform import Rotation as R_scipy
 
+from project.calibration.registry import load_intrinsics
+from project.math3d.transforms import TransformBatch
 from project.camera.camera import Camera
 from project.tracking.aruco_tracker import ArucoTracker
+from project.tracking.marker import estimate_marker_poses
 
 def main():
 
@@ -13,9 +16,7 @@ def main():
 
     camera = Camera(index=0, width=1920, height=1080)
 
-    calib = np.load("project/calibration/calibration.npz")
-    camera_matrix = calib["mtx"]
-    dist_coeffs = calib["dist"]
+    camera_matrix, dist_coeffs = load_intrinsics()
 
     tracker = ArucoTracker(
         marker_length=0.045,
@@ -40,8 +41,9 @@ def main():
 
             cv2.aruco.drawDetectedMarkers(frame, corners, ids)
 
-            rvecs, tvecs, _ = cv2.aruco.estimatePoseSingleMarkers(
+            pose_ids, rvecs, tvecs = estimate_marker_poses(
                 corners,
+                ids,
                 tracker.marker_length,
                 camera_matrix,
                 dist_coeffs
@@ -50,37 +52,17 @@ def main():
             now = time.time()
             if now - last_capture > capture_interval:
                 
-                # Precalcular transformaciones para todos los marcadores detectados en este frame
-                T_cameras = {}
-                for i, marker_id in enumerate(ids.flatten()):
-                    marker_id = int(marker_id)
-                    rvec = rvecs[i][0]
-                    tvec = tvecs[i][0]
-
-                    R, _ = cv2.Rodrigues(rvec)
-
-                    T_camera_marker = np.eye(4)
-                    T_camera_marker[:3, :3] = R
-                    T_camera_marker[:3, 3] = tvec
-                    
-                    T_cameras[marker_id] = T_camera_marker
-
-                # Calcular transformaciones relativas entre cada par de marcadores visibles
-                marcadores_presentes = list(T_cameras.keys())
-                for i in range(len(marcadores_presentes)):
-                    for j in range(i + 1, len(marcadores_presentes)):
-                        id_i = marcadores_presentes[i]
-                        id_j = marcadores_presentes[j]
-                        
-                        T_camera_i = T_cameras[id_i]
-                        T_camera_j = T_cameras[id_j]
-                        
-                        T_i_j = np.linalg.inv(T_camera_i) @ T_camera_j
-                        
-                        if (id_i, id_j) not in relative_edges:
-                            relative_edges[(id_i, id_j)] = []
-                            
-                        relative_edges[(id_i, id_j)].append(T_i_j)
+                # Transformaciones de todos los marcadores del frame en un solo lote
+                T_cameras = TransformBatch.from_rvecs_tvecs(rvecs, tvecs)
+                T_markers_camera = T_cameras.inverse()
+
+                # Transformaciones relativas entre cada par de marcadores visibles
+                first, second = np.triu_indices(len(pose_ids), k=1)
+                T_pairs = (T_markers_camera[first] @ T_cameras[second]).matrices()
+
+                for k in range(len(first)):
+                    edge = (int(pose_ids[first[k]]), int(pose_ids[second[k]]))
+                    relative_edges.setdefault(edge, []).append(T_pairs[k])
 
                 last_capture = now
                 
@@ -0,0 +1,115 @@
+import os
+import sys
+import threading
+from pathlib import Path
+
+import numpy as np
+
+from tracking.instrument_board import create_instrument_board
+
+
+CALIBRATION_DIR = Path(__file__).resolve().parent
+INTRINSICS_PATH = CALIBRATION_DIR / "calibration.npz"
+INSTRUMENT_BOARD_PATH = CALIBRATION_DIR / "instrument_marker_calibration.json"
+
+
+def _file_signature(path):
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
+
+def _read_only(array):
+    array.setflags(write=False)
+    return array
+
+
+class CalibrationRegistry:
+    """
+    Carga intrínsecos y geometría del board una sola vez por proceso.
+
+    Cada valor se memoiza junto con (mtime, tamaño) del archivo de origen;
+    si el archivo cambia se vuelve a cargar en la siguiente consulta.
+    Los arrays devueltos son de solo lectura porque se comparten.
+    """
+
+    def __init__(self, intrinsics_path=INTRINSICS_PATH, board_path=INSTRUMENT_BOARD_PATH):
+        self.intrinsics_path = Path(intrinsics_path)
+        self.board_path = Path(board_path)
+
+        self._cache = {}
+        self._lock = threading.Lock()
+
+    def intrinsics(self):
+        """
+        Devuelve (camera_matrix, dist_coeffs).
+        """
+        return self._get(self.intrinsics_path, self._load_intrinsics)
+
+    def instrument_board(self):
+        """
+        Devuelve (board, tip_offset).
+        """
+        return self._get(self.board_path, self._load_board)
+
+    def changed(self):
+        """
+        True si algún archivo ya cargado cambió en disco.
+        """
+        with self._lock:
+            items = list(self._cache.items())
+
+        for path, (signature, _) in items:
+            try:
+                if _file_signature(path) != signature:
+                    return True
+            except FileNotFoundError:
+                return True
+        return False
+
+    def reload(self):
+        with self._lock:
+            self._cache.clear()
+
+    def _get(self, path, loader):
+        if not path.exists():
+            raise FileNotFoundError(f"No se encuentra el archivo de calibracion en: {path}")
+
+        signature = _file_signature(path)
+
+        with self._lock:
+            cached = self._cache.get(path)
+            if cached is not None and cached[0] == signature:
+                return cached[1]
+
+            value = loader(path)
+            self._cache[path] = (signature, value)
+            return value
+
+    @staticmethod
+    def _load_intrinsics(path):
+        with np.load(path) as calib:
+            camera_matrix = _read_only(np.ascontiguousarray(calib["mtx"], dtype=np.float64))
+            dist_coeffs = _read_only(np.ascontiguousarray(calib["dist"], dtype=np.float64))
+        return camera_matrix, dist_coeffs
+
+    @staticmethod
+    def _load_board(path):
+        board, tip_offset = create_instrument_board(path)
+        return board, _read_only(tip_offset)
+
+
+registry = CalibrationRegistry()
+
+# Los scripts importan este módulo como project.calibration.registry y la
+# librería como calibration.registry; sin esto habría dos registros, cada
+# uno con su caché. Ambos nombres apuntan al mismo módulo.
+for _name in ("calibration.registry", "project.calibration.registry"):
+    sys.modules.setdefault(_name, sys.modules[__name__])
+
+
+def load_intrinsics():
+    return registry.intrinsics()
+
+
+def load_instrument_board():
+    return registry.instrument_board()
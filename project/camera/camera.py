@@ -1,9 +1,47 @@
+import sys
+import threading
+import time
+
 import cv2
 
+from camera.frame import Frame
+
+
+def default_backend():
+    """
+    Backend de captura de OpenCV según la plataforma: DirectShow en
+    Windows, AVFoundation en macOS y V4L2 en Linux.
+    """
+    if sys.platform.startswith("win"):
+        return cv2.CAP_DSHOW
+    if sys.platform == "darwin":
+        return cv2.CAP_AVFOUNDATION
+    if sys.platform.startswith("linux"):
+        return cv2.CAP_V4L2
+    return cv2.CAP_ANY
+
 
 class Camera:
-    def __init__(self, index=0, width=1920, height=1080):
-        self.cap = cv2.VideoCapture(index, cv2.CAP_DSHOW)
+    """
+    Adquisición de frames desde una cámara USB.
+
+    Con threaded=True un hilo de fondo captura continuamente sobre un triple
+    buffer preasignado: el hilo escribe en un slot, el último frame completo
+    queda en otro y el consumidor lee del tercero. Si el consumidor se atrasa,
+    los frames intermedios se descartan en lugar de encolarse, así la latencia
+    por frame queda acotada.
+
+    backend: API de captura de OpenCV; por defecto default_backend(). Para
+    datos grabados, ReplayCamera (camera.replay) tiene la misma interfaz.
+
+    device_timestamps: usa el timestamp del buffer que entrega el driver
+    (CAP_PROP_POS_MSEC) en lugar del reloj del host tras grab(); no incluye
+    la latencia variable de USB y del hilo, lo que importa al emparejar
+    varias cámaras (MultiCamera). Si el backend no lo da se usa el host.
+    """
+
+    def __init__(self, index=0, width=1920, height=1080, threaded=False, backend=None, device_timestamps=False):
+        self.cap = cv2.VideoCapture(index, default_backend() if backend is None else backend)
 
         if not self.cap.isOpened():
             raise RuntimeError("No se pudo abrir la cámara.")
@@ -14,12 +52,188 @@ class Camera:
         self.width = width
         self.height = height
 
+        self.threaded = threaded
+        self.device_timestamps = device_timestamps
+        self._device_offset = None
+        self.frames_captured = 0
+        self.frames_dropped = 0
+
+        self._thread = None
+        self._running = False
+        self._error = None
+        self._cond = threading.Condition()
+
+        if threaded:
+            self._start_grabber()
+
+    # -----------------------------
+    # Lectura
+    # -----------------------------
     def read(self):
-        ret, frame = self.cap.read()
-        if not ret:
-            raise RuntimeError("No se pudo leer frame.")
-        return frame
+        return self.read_frame().image
+
+    def read_frame(self, latest=False, timeout=1.0):
+        """
+        Igual que read() pero devuelve un Frame con timestamp y secuencia.
+        En modo threaded, latest=True no espera a un frame nuevo y el Frame
+        se reutiliza: es válido hasta la siguiente llamada de lectura.
+        """
+        if not self.threaded:
+            return self._capture()
+
+        with self._cond:
+            if latest:
+                self._wait_for(lambda: self._latest_seq > 0, timeout)
+
+                # Con el hilo de captura caído no se repite el último frame
+                # para siempre: se entrega lo pendiente y luego el error
+                if self._error is not None and self._ready_seq <= self._delivered_seq:
+                    raise self._error
+            else:
+                self._wait_for(lambda: self._latest_seq > self._delivered_seq, timeout)
+            self._swap_ready()
+            return self._slots[self._read_slot]
+
+    def read_latest(self, timeout=1.0):
+        """
+        Devuelve el frame más reciente sin esperar a uno nuevo.
+        El array es válido hasta la siguiente llamada de lectura.
+        """
+        self._require_threaded()
+        return self.read_frame(latest=True, timeout=timeout).image
+
+    def read_next(self, timeout=1.0):
+        """
+        Espera un frame más nuevo que el último entregado.
+        El array es válido hasta la siguiente llamada de lectura.
+        """
+        self._require_threaded()
+        return self.read_frame(timeout=timeout).image
 
     def release(self):
+        self._stop_grabber()
         self.cap.release()
-        cv2.destroyAllWindows()
\ No newline at end of file
+        try:
+            cv2.destroyAllWindows()
+        except cv2.error:
+            # OpenCV sin soporte de GUI (build headless)
+            pass
+
+    # -----------------------------
+    # Hilo de captura
+    # -----------------------------
+    def _capture(self, into=None):
+        # grab() fija el frame; el timestamp se toma antes de decodificar
+        if not self.cap.grab():
+            raise RuntimeError("No se pudo leer frame.")
+
+        timestamp = time.monotonic()
+        wall_time = time.time()
+
+        if self.device_timestamps:
+            device = self._device_timestamp(timestamp)
+            wall_time -= timestamp - device
+            timestamp = device
+
+        ret, image = self.cap.retrieve(None if into is None else into.image)
+        if not ret:
+            raise RuntimeError("No se pudo leer frame.")
+
+        self.frames_captured += 1
+
+        if into is None:
+            return Frame(image, self.frames_captured, timestamp, wall_time)
+
+        # retrieve puede reasignar si cambia la resolución
+        into.image = image
+        into.sequence = self.frames_captured
+        into.timestamp = timestamp
+        into.wall_time = wall_time
+        return into
+
+    def _device_timestamp(self, host):
+        device = self.cap.get(cv2.CAP_PROP_POS_MSEC) / 1000.0
+        if device <= 0:
+            return host
+
+        # V4L2 entrega CLOCK_MONOTONIC, el mismo reloj que time.monotonic
+        offset = host - device
+        if 0.0 <= offset < 1.0:
+            return device
+
+        # Reloj propio del dispositivo: se alinea con el menor desfase visto
+        # (el frame que llegó con menos latencia)
+        if self._device_offset is None or offset < self._device_offset:
+            self._device_offset = offset
+        return device + self._device_offset
+
+    def _start_grabber(self):
+        first = self._capture()
+
+        # Triple buffer: escritura, último listo y lectura
+        self._slots = [
+            first,
+            Frame(first.image.copy(), 0, first.timestamp, first.wall_time),
+            Frame(first.image.copy(), 0, first.timestamp, first.wall_time),
+        ]
+        self._write_slot = 0
+        self._ready_slot = 1
+        self._read_slot = 2
+        self._ready_seq = 0
+        self._latest_seq = 0
+        self._delivered_seq = 0
+
+        self._publish()
+
+        self._running = True
+        self._thread = threading.Thread(target=self._grab_loop, daemon=True)
+        self._thread.start()
+
+    def _stop_grabber(self):
+        if self._thread is None:
+            return
+
+        self._running = False
+        self._thread.join(timeout=2.0)
+        self._thread = None
+
+    def _grab_loop(self):
+        while self._running:
+            try:
+                self._capture(into=self._slots[self._write_slot])
+            except RuntimeError as e:
+                with self._cond:
+                    self._error = e
+                    self._running = False
+                    self._cond.notify_all()
+                return
+
+            self._publish()
+
+    def _publish(self):
+        with self._cond:
+            if self._ready_seq > self._delivered_seq:
+                self.frames_dropped += 1
+
+            self._write_slot, self._ready_slot = self._ready_slot, self._write_slot
+            self._latest_seq = self._slots[self._ready_slot].sequence
+            self._ready_seq = self._latest_seq
+            self._cond.notify_all()
+
+    def _swap_ready(self):
+        # Llamar con self._cond adquirido
+        if self._ready_seq > self._delivered_seq:
+            self._read_slot, self._ready_slot = self._ready_slot, self._read_slot
+            self._delivered_seq = self._ready_seq
+
+    def _wait_for(self, predicate, timeout):
+        # Llamar con self._cond adquirido
+        if not self._cond.wait_for(lambda: predicate() or self._error is not None, timeout):
+            raise RuntimeError("Tiempo de espera agotado leyendo frame.")
+
+        if self._error is not None and not predicate():
+            raise self._error
+
+    def _require_threaded(self):
+        if not self.threaded:
+            raise RuntimeError("read_latest/read_next requieren Camera(threaded=True).")
@@ -0,0 +1,76 @@
+import cv2
+import numpy as np
+
+
+class CameraModel:
+    """
+    Intrínsecos + distorsión con mapas de corrección precalculados.
+
+    cv2.undistort recalcula el mapeo en cada llamada. Aquí los mapas se
+    calculan una vez por resolución con initUndistortRectifyMap en formato
+    de punto fijo (CV_16SC2) y se reutilizan con cv2.remap, también sobre
+    una sola ROI.
+
+    alpha: None conserva la matriz de cámara original para la imagen
+    corregida; un valor en [0, 1] se pasa a getOptimalNewCameraMatrix.
+    """
+
+    def __init__(self, camera_matrix, dist_coeffs, alpha=None):
+        self.camera_matrix = np.asarray(camera_matrix, dtype=np.float64)
+        self.dist_coeffs = np.asarray(dist_coeffs, dtype=np.float64).reshape(-1)
+        self.alpha = alpha
+
+        self._maps = {}
+
+    def undistorted(self, image_size):
+        """
+        Modelo sin distorsión válido para las imágenes que devuelve
+        undistort() a esa resolución. Con él, undistortPoints/solvePnP/
+        projectPoints no evalúan el polinomio de distorsión.
+        """
+        new_camera_matrix, _, _ = self._get_maps(image_size)
+        return CameraModel(new_camera_matrix, np.zeros(5, dtype=np.float64))
+
+    def undistort(self, image, roi=None):
+        """
+        image: imagen original (distorsionada)
+        roi: (x0, y0, x1, y1) en coordenadas de la imagen corregida; si se
+             da, solo se remapea esa región.
+        """
+        height, width = image.shape[:2]
+        _, map1, map2 = self._get_maps((width, height))
+
+        if roi is not None:
+            x0, y0, x1, y1 = roi
+            map1 = map1[y0:y1, x0:x1]
+            map2 = map2[y0:y1, x0:x1]
+
+        return cv2.remap(image, map1, map2, cv2.INTER_LINEAR)
+
+    def _get_maps(self, image_size):
+        image_size = (int(image_size[0]), int(image_size[1]))
+
+        maps = self._maps.get(image_size)
+        if maps is not None:
+            return maps
+
+        if self.alpha is None:
+            new_camera_matrix = self.camera_matrix.copy()
+        else:
+            new_camera_matrix, _ = cv2.getOptimalNewCameraMatrix(
+                self.camera_matrix, self.dist_coeffs, image_size, self.alpha
+            )
+
+        map1, map2 = cv2.initUndistortRectifyMap(
+            self.camera_matrix,
+            self.dist_coeffs,
+            None,
+            new_camera_matrix,
+            image_size,
+            cv2.CV_16SC2,
+        )
+
+        new_camera_matrix.setflags(write=False)
+        maps = (new_camera_matrix, map1, map2)
+        self._maps[image_size] = maps
+        return maps
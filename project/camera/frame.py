@@ -0,0 +1,39 @@
+import time
+from dataclasses import dataclass
+
+import numpy as np
+
+
+@dataclass(slots=True)
+class Frame:
+    """
+    Imagen capturada junto con su momento de captura.
+
+    timestamp: reloj monotónico (time.monotonic) justo después de grab(),
+               sirve para medir latencias y dt entre frames.
+    wall_time: el mismo instante en tiempo Unix, para la cabecera IGTL.
+    sequence:  contador de la cámara; un salto indica frames perdidos.
+    """
+
+    image: np.ndarray
+    sequence: int
+    timestamp: float
+    wall_time: float
+
+    @staticmethod
+    def now(image, sequence):
+        return Frame(image, sequence, time.monotonic(), time.time())
+
+    def age(self, now=None):
+        if now is None:
+            now = time.monotonic()
+        return now - self.timestamp
+
+
+def frame_image(frame):
+    """
+    Acepta Frame o ndarray y devuelve la imagen.
+    """
+    # Sin isinstance: el módulo puede importarse como camera.frame o
+    # project.camera.frame según el punto de entrada.
+    return getattr(frame, "image", frame)
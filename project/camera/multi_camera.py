@@ -0,0 +1,261 @@
+import threading
+import time
+import warnings
+from collections import deque
+from dataclasses import dataclass
+
+from camera.camera import Camera
+
+
+@dataclass(slots=True)
+class FrameSet:
+    """
+    Frames de varias cámaras tomados (casi) en el mismo instante.
+
+    frames:    un Frame por cámara, en el orden de MultiCamera.cameras
+    sequence:  contador de sets entregados
+    timestamp: timestamp del frame de la primera cámara (la que marca el ritmo)
+    wall_time: el mismo instante en tiempo Unix
+    skew:      diferencia entre el frame más viejo y el más nuevo (s)
+    """
+
+    frames: tuple
+    sequence: int
+    timestamp: float
+    wall_time: float
+    skew: float
+
+    @property
+    def images(self):
+        return tuple(frame.image for frame in self.frames)
+
+
+class MultiCamera:
+    """
+    Captura varias cámaras, cada una en su propio hilo, y entrega sets de
+    frames emparejados por timestamp.
+
+    La primera cámara marca el ritmo: para cada uno de sus frames se busca
+    en las demás el de timestamp más cercano. Si todos quedan a menos de
+    tolerance segundos se entrega el set; si alguna cámara ya tiene frames
+    posteriores sin ninguno dentro de la tolerancia, el frame se descarta
+    (contador unmatched). Con tolerance de medio periodo o menos, el frame
+    elegido es el más cercano posible.
+
+    cameras: objetos con read_frame() que devuelven un Frame nuevo en cada
+    llamada: Camera(threaded=False) o ReplayCamera. Cada cámara guarda
+    como mucho buffer_size frames sin emparejar; los más viejos se
+    descartan (contador dropped).
+
+    Si una cámara falla (cualquier excepción de read_frame), read_frame_set()
+    relanza su error una vez que no queda ningún set por entregar
+    (EndOfStream de ReplayCamera llega así al Pipeline como fin normal de
+    la fuente).
+    """
+
+    def __init__(self, cameras, tolerance=0.010, buffer_size=8):
+        self.cameras = list(cameras)
+        if len(self.cameras) < 2:
+            raise ValueError("MultiCamera necesita al menos dos cámaras.")
+        if any(getattr(camera, "threaded", False) for camera in self.cameras):
+            raise ValueError("MultiCamera captura en sus propios hilos: use Camera(threaded=False).")
+
+        self.tolerance = tolerance
+
+        self.sets_delivered = 0
+        self.unmatched = 0
+        self.skipped = 0
+        self.dropped = [0] * len(self.cameras)
+        self._skew_sum = 0.0
+        self.max_skew = 0.0
+
+        self._buffers = [deque(maxlen=buffer_size) for _ in self.cameras]
+        self._cond = threading.Condition()
+        self._error = None
+        self._finished = [False] * len(self.cameras)
+        self._running = True
+
+        self._threads = [
+            threading.Thread(target=self._capture_loop, args=(index,), daemon=True)
+            for index in range(len(self.cameras))
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    @classmethod
+    def open(cls, indices, width=1920, height=1080, backend=None, device_timestamps=True, **options):
+        """
+        Abre una Camera por índice con timestamps del driver.
+        """
+        cameras = []
+        try:
+            for index in indices:
+                cameras.append(
+                    Camera(index, width, height, backend=backend, device_timestamps=device_timestamps)
+                )
+        except RuntimeError:
+            for camera in cameras:
+                camera.release()
+            raise
+
+        return cls(cameras, **options)
+
+    # -----------------------------
+    # Lectura
+    # -----------------------------
+    def read_frame_set(self, latest=False, timeout=1.0):
+        """
+        Devuelve el siguiente FrameSet. latest=True entrega el set más
+        reciente disponible y descarta los anteriores (contador skipped),
+        para consumidores más lentos que las cámaras.
+        """
+        deadline = time.monotonic() + timeout
+
+        with self._cond:
+            while True:
+                frame_set = self._match(latest)
+                if frame_set is not None:
+                    return frame_set
+
+                # Sin frames de la primera cámara y alguna cámara terminó
+                if not self._buffers[0] and any(self._finished):
+                    raise self._error
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise RuntimeError("Tiempo de espera agotado leyendo frames sincronizados.")
+                self._cond.wait(remaining)
+
+    def read(self):
+        return self.read_frame_set().images
+
+    def stats(self):
+        with self._cond:
+            buffered = [len(buffer) for buffer in self._buffers]
+
+        return {
+            "sets": self.sets_delivered,
+            "unmatched": self.unmatched,
+            "skipped": self.skipped,
+            "dropped": list(self.dropped),
+            "buffered": buffered,
+            "mean_skew_ms": 1000.0 * self._skew_sum / self.sets_delivered if self.sets_delivered else 0.0,
+            "max_skew_ms": 1000.0 * self.max_skew,
+        }
+
+    def release(self, timeout=2.0):
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+
+        # read_frame() de cada cámara vuelve en como mucho un frame
+        for thread in self._threads:
+            thread.join(timeout=timeout)
+
+        for camera, thread in zip(self.cameras, self._threads):
+            # Liberar la captura mientras read_frame() sigue dentro rompe el backend
+            if thread.is_alive():
+                warnings.warn(f"{camera!r} sigue leyendo tras release(); no se libera.", RuntimeWarning)
+                continue
+            camera.release()
+
+    # -----------------------------
+    # Hilos de captura
+    # -----------------------------
+    def _capture_loop(self, index):
+        camera = self.cameras[index]
+        buffer = self._buffers[index]
+
+        while self._running:
+            try:
+                frame = camera.read_frame()
+            except Exception as e:
+                # También cv2.error u otros errores del backend: sin esto el
+                # hilo moriría sin avisar y read_frame_set() solo vería el timeout
+                with self._cond:
+                    if self._error is None:
+                        self._error = e
+                    self._finished[index] = True
+                    self._cond.notify_all()
+                return
+
+            with self._cond:
+                if len(buffer) == buffer.maxlen:
+                    self.dropped[index] += 1
+                buffer.append(frame)
+                self._cond.notify_all()
+
+    # -----------------------------
+    # Emparejamiento
+    # -----------------------------
+    def _match(self, latest):
+        # Llamar con self._cond adquirido
+        anchors = self._buffers[0]
+        others = self._buffers[1:]
+        candidates = list(reversed(anchors)) if latest else list(anchors)
+
+        for anchor in candidates:
+            chosen = self._nearest(anchor.timestamp, others)
+
+            if chosen is None:
+                if latest:
+                    continue
+                if not self._hopeless(anchor.timestamp):
+                    return None
+
+                # Alguna cámara ya pasó de este frame sin uno cercano
+                anchors.popleft()
+                self.unmatched += 1
+                continue
+
+            if latest:
+                # Los frames de la primera cámara anteriores al elegido
+                while anchors[0] is not anchor:
+                    anchors.popleft()
+                    self.skipped += 1
+
+            anchors.popleft()
+            for buffer, frame in zip(others, chosen):
+                while buffer[0] is not frame:
+                    buffer.popleft()
+                buffer.popleft()
+
+            return self._frame_set((anchor,) + chosen)
+
+        if latest:
+            # Sin set completo: descartar los frames que ya no tienen pareja
+            return self._match(False)
+        return None
+
+    def _nearest(self, timestamp, buffers):
+        chosen = []
+        for buffer in buffers:
+            best = min(buffer, key=lambda frame: abs(frame.timestamp - timestamp), default=None)
+            if best is None or abs(best.timestamp - timestamp) > self.tolerance:
+                return None
+            chosen.append(best)
+        return tuple(chosen)
+
+    def _hopeless(self, timestamp):
+        """
+        True si alguna cámara sin frame dentro de la tolerancia ya pasó de
+        timestamp + tolerance o terminó: el frame de la primera cámara no se
+        va a poder emparejar.
+        """
+        for buffer, finished in zip(self._buffers[1:], self._finished[1:]):
+            if any(abs(frame.timestamp - timestamp) <= self.tolerance for frame in buffer):
+                continue
+            if finished or (buffer and buffer[-1].timestamp > timestamp + self.tolerance):
+                return True
+        return False
+
+    def _frame_set(self, frames):
+        timestamps = [frame.timestamp for frame in frames]
+        skew = max(timestamps) - min(timestamps)
+
+        self.sets_delivered += 1
+        self._skew_sum += skew
+        self.max_skew = max(self.max_skew, skew)
+
+        anchor = frames[0]
+        return FrameSet(frames, self.sets_delivered, anchor.timestamp, anchor.wall_time, skew)
@@ -0,0 +1,237 @@
+import os
+import time
+
+import cv2
+from camera.frame import Frame
+from recording.session_log import SessionReader
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp", ".tif", ".tiff")
+
+
+class EndOfStream(EOFError):
+    """
+    La fuente de replay no tiene más frames (Pipeline la trata como fin
+    normal de la fuente).
+    """
+
+
+class ReplayCamera:
+    """
+    Fuente de frames grabados con la misma interfaz que Camera.
+
+    source: archivo de video, directorio de imágenes (orden alfabético) o
+    directorio de sesión de SessionRecorder grabada con frames.
+
+    paced=False entrega los frames tan rápido como se pidan; los timestamps
+    siguen la línea de tiempo original (los filtros ven los dt reales),
+    así que Frame.age() no tiene sentido. paced=True espera al instante de
+    cada frame (dividido entre speed); con drop_late=True además salta los
+    frames cuyo instante ya pasó, como una cámara real con un consumidor
+    lento.
+
+    fps: para video sin FPS en el contenedor y para directorios de imágenes.
+
+    metadata: metadatos de la sesión grabada (intrínsecos, etc.); {} para
+    video e imágenes.
+    """
+
+    def __init__(self, source, paced=False, speed=1.0, drop_late=False, loop=False, fps=30.0):
+        self.source = str(source)
+        self.paced = paced
+        self.speed = speed
+        self.drop_late = drop_late
+        self.loop = loop
+
+        self.threaded = False
+        self.frames_captured = 0
+        self.frames_dropped = 0
+
+        self.metadata = {}
+        if os.path.isdir(self.source):
+            if os.path.exists(os.path.join(self.source, "session.json")):
+                self._reader = _SessionSource(self.source)
+                self.metadata = self._reader.reader.metadata
+            else:
+                self._reader = _ImageSource(self.source, fps)
+        else:
+            self._reader = _VideoSource(self.source, fps)
+
+        self._start = None
+        self._start_wall = None
+        self._t0 = 0.0
+        self._offset = 0.0      # tiempo acumulado de vueltas anteriores (loop)
+        self._pending = self._next()
+
+        if self._pending is None:
+            raise RuntimeError(f"No hay frames en {self.source}.")
+
+        self.height, self.width = self._pending[0].shape[:2]
+
+    # -----------------------------
+    # Lectura (interfaz de Camera)
+    # -----------------------------
+    def read(self):
+        return self.read_frame().image
+
+    def read_frame(self, latest=False, timeout=1.0):
+        if self._pending is None:
+            raise EndOfStream(f"Fin de {self.source}.")
+
+        if self._start is None:
+            self._start = time.monotonic()
+            self._start_wall = time.time()
+            self._t0 = self._pending[1]
+
+        image, t, wall_time = self._pending
+        self._pending = self._next()
+        timestamp = self._start + (t - self._t0) / self.speed
+
+        if self.paced:
+            now = time.monotonic()
+
+            # Cámara real con consumidor lento: los frames viejos se pierden
+            while self.drop_late and self._pending is not None and now >= self._due(self._pending):
+                image, t, wall_time = self._pending
+                self._pending = self._next()
+                timestamp = self._due((image, t, wall_time))
+                self.frames_dropped += 1
+
+            if timestamp > now:
+                time.sleep(timestamp - now)
+
+        if wall_time is None:
+            wall_time = self._start_wall + (timestamp - self._start)
+
+        self.frames_captured += 1
+        return Frame(image, self.frames_captured, timestamp, wall_time)
+
+    def read_latest(self, timeout=1.0):
+        return self.read_frame(latest=True, timeout=timeout).image
+
+    def read_next(self, timeout=1.0):
+        return self.read_frame(timeout=timeout).image
+
+    def release(self):
+        self._reader.close()
+        self._pending = None
+
+    # -----------------------------
+    # Internos
+    # -----------------------------
+    def _due(self, entry):
+        return self._start + (entry[1] - self._t0) / self.speed
+
+    def _next(self):
+        """
+        (imagen, tiempo relativo en s, wall_time o None) o None al final.
+        """
+        entry = self._reader.next()
+
+        if entry is None and self.loop:
+            # La vuelta siguiente continúa la línea de tiempo
+            self._offset += self._reader.duration()
+            self._reader.rewind()
+            entry = self._reader.next()
+
+        if entry is None:
+            return None
+
+        image, t, wall_time = entry
+        return image, t + self._offset, None if self._offset else wall_time
+
+
+class _VideoSource:
+    def __init__(self, path, fps):
+        self.cap = cv2.VideoCapture(path)
+        if not self.cap.isOpened():
+            raise RuntimeError(f"No se pudo abrir el video {path}.")
+
+        self.fps = self.cap.get(cv2.CAP_PROP_FPS) or fps
+        self.index = 0
+
+    def next(self):
+        ret, image = self.cap.read()
+        if not ret:
+            return None
+        t = self.index / self.fps
+        self.index += 1
+        return image, t, None
+
+    def duration(self):
+        return self.index / self.fps
+
+    def rewind(self):
+        self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+        self.index = 0
+
+    def close(self):
+        self.cap.release()
+
+
+class _ImageSource:
+    def __init__(self, path, fps):
+        self.paths = [
+            os.path.join(path, name)
+            for name in sorted(os.listdir(path))
+            if name.lower().endswith(IMAGE_EXTENSIONS)
+        ]
+        self.fps = fps
+        self.index = 0
+
+    def next(self):
+        while self.index < len(self.paths):
+            image = cv2.imread(self.paths[self.index], cv2.IMREAD_COLOR)
+            t = self.index / self.fps
+            self.index += 1
+            if image is not None:
+                return image, t, None
+        return None
+
+    def duration(self):
+        return len(self.paths) / self.fps
+
+    def rewind(self):
+        self.index = 0
+
+    def close(self):
+        pass
+
+
+class _SessionSource:
+    def __init__(self, path):
+        self.reader = SessionReader(path)
+        if self.reader.frames == "none":
+            raise RuntimeError(f"La sesión {path} se grabó sin imágenes.")
+
+        self.index = 0
+        self.t0 = None
+        self.last_t = 0.0
+        self.interval = 0.0
+
+    def next(self):
+        while self.index < len(self.reader):
+            recorded = self.reader[self.index]
+            self.index += 1
+
+            if self.t0 is None:
+                self.t0 = recorded.timestamp
+
+            t = recorded.timestamp - self.t0
+            self.interval = t - self.last_t
+            self.last_t = t
+
+            # Frames descartados por el grabador (cola llena) no tienen imagen
+            if recorded.image is not None:
+                return recorded.image, t, recorded.wall_time
+        return None
+
+    def duration(self):
+        # Un intervalo más para que la vuelta siguiente no repita el instante
+        return self.last_t + self.interval
+
+    def rewind(self):
+        self.index = 0
+        self.last_t = 0.0
+
+    def close(self):
+        pass
@@ -0,0 +1,177 @@
+import select
+import socket
+import threading
+import time
+
+
+CONNECTED = "connected"
+RECONNECTING = "reconnecting"
+DOWN = "down"
+
+
+class IGTLConnection:
+    """
+    Socket TCP hacia Slicer que se reconecta solo.
+
+    Un hilo de fondo abre la conexión con backoff exponencial
+    (initial_backoff, x2 por intento, hasta max_backoff) y vigila que el
+    otro lado siga abierto. send() nunca espera a que haya conexión: si no
+    la hay devuelve False y el mensaje se descarta (una pose vieja no le
+    sirve a Slicer).
+
+    state:
+        connected     hay socket y se puede escribir
+        reconnecting  se perdió (o aún no hay) conexión y se está reintentando
+        down          lleva más de down_after segundos sin conexión; se
+                      sigue reintentando cada max_backoff
+    """
+
+    def __init__(
+        self,
+        host="127.0.0.1",
+        port=18944,
+        initial_backoff=0.1,
+        max_backoff=5.0,
+        down_after=10.0,
+        connect_timeout=1.0,
+        send_timeout=0.5,
+    ):
+        self.host = host
+        self.port = port
+        self.initial_backoff = initial_backoff
+        self.max_backoff = max_backoff
+        self.down_after = down_after
+        self.connect_timeout = connect_timeout
+        self.send_timeout = send_timeout
+
+        self.connects = 0
+        self.disconnects = 0
+        self.failed_attempts = 0
+        self.bytes_sent = 0
+        self.backoff = initial_backoff
+
+        self._sock = None
+        self._lost_at = time.monotonic()
+        self._send_lock = threading.Lock()
+        self._state_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    @property
+    def connected(self):
+        return self._sock is not None
+
+    @property
+    def state(self):
+        if self._sock is not None:
+            return CONNECTED
+        if time.monotonic() - self._lost_at > self.down_after:
+            return DOWN
+        return RECONNECTING
+
+    def send(self, data):
+        """
+        Escribe data completo o nada. Devuelve True si se envió.
+        """
+        sock = self._sock
+        if sock is None:
+            return False
+
+        with self._send_lock:
+            try:
+                sock.sendall(data)
+            except OSError:
+                self._drop(sock)
+                return False
+
+        self.bytes_sent += len(data)
+        return True
+
+    def wait_connected(self, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._sock is None:
+            if deadline is not None and time.monotonic() > deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def stats(self):
+        return {
+            "state": self.state,
+            "connects": self.connects,
+            "disconnects": self.disconnects,
+            "failed_attempts": self.failed_attempts,
+            "backoff_s": self.backoff,
+            "bytes_sent": self.bytes_sent,
+        }
+
+    def close(self):
+        self._running = False
+        self._wake.set()
+        self._thread.join(timeout=2.0)
+
+        sock = self._sock
+        if sock is not None:
+            self._drop(sock, count=False)
+
+    # -----------------------------
+    # Hilo de conexión
+    # -----------------------------
+    def _run(self):
+        while self._running:
+            sock = self._sock
+
+            if sock is None:
+                self._wake.clear()
+                if not self._connect() and self._running:
+                    # Espera interrumpible: close() la corta
+                    self._wake.wait(self.backoff)
+                    self.backoff = min(self.backoff * 2.0, self.max_backoff)
+                continue
+
+            self._watch(sock)
+
+    def _connect(self):
+        try:
+            sock = socket.create_connection((self.host, self.port), timeout=self.connect_timeout)
+        except OSError:
+            self.failed_attempts += 1
+            return False
+
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        # sendall con timeout: un Slicer colgado no bloquea para siempre
+        sock.settimeout(self.send_timeout)
+
+        self.backoff = self.initial_backoff
+        self.connects += 1
+        self._sock = sock
+        return True
+
+    def _watch(self, sock):
+        """
+        Descarta lo que manda Slicer y detecta el cierre del otro lado.
+        """
+        try:
+            readable, _, _ = select.select([sock], [], [], 0.2)
+            if readable and not sock.recv(65536):
+                self._drop(sock)
+        except (OSError, ValueError):
+            self._drop(sock)
+
+    def _drop(self, sock, count=True):
+        with self._state_lock:
+            if self._sock is not sock:
+                return
+            self._sock = None
+            self._lost_at = time.monotonic()
+            if count:
+                self.disconnects += 1
+
+        try:
+            sock.close()
+        except OSError:
+            pass
+
+        self._wake.set()
@@ -1,19 +1,227 @@
+import json
+import threading
+import time
+
 import pyigtl
 import numpy as np
+from communication.connection import IGTLConnection
+from diagnostics.profiler import profiler as default_profiler
 
 
 class IGTLSender:
+    """
+    La conexión (IGTLConnection) se reintenta sola con backoff; mientras no
+    hay conexión los mensajes se descartan en lugar de bloquear al tracker.
+    stats() incluye el estado de salud y contadores por dispositivo.
+
+    En modo síncrono send_transforms escribe en el socket del hilo que
+    llama: con Slicer conectado pero trabado, cada envío puede bloquear
+    hasta send_timeout (0.5 s por defecto) antes de dar la conexión por
+    caída. En un bucle de captura conviene asynchronous=True.
+
+    asynchronous=True: send_transform solo deja el mensaje en un slot por
+    dispositivo y vuelve de inmediato; un hilo de fondo lo envía. Si Slicer
+    se atrasa, cada slot se sobrescribe con el valor más reciente
+    (coalescing) en lugar de encolar transformaciones viejas. Un lote
+    nuevo quita sus dispositivos de los lotes pendientes más viejos, así
+    nunca sale un valor viejo de un dispositivo después de uno nuevo.
+
+    profiler: Profiler para empaquetado y escritura en el socket; por
+    defecto el global de diagnostics.profiler.
+    """
+
+    STATUS_DEVICE = "TrackingStatus"
 
-    def __init__(self, host="127.0.0.1", port=18944):
-        self.client = pyigtl.OpenIGTLinkClient(host, port)
+    def __init__(self, host="127.0.0.1", port=18944, asynchronous=False, profiler=None, **connection_options):
+        self.connection = IGTLConnection(host, port, **connection_options)
+        self.asynchronous = asynchronous
+        self.profiler = default_profiler if profiler is None else profiler
 
-    def send_transform(self, name, matrix):
+        self.sent = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.device_sent = {}
+        self.device_dropped = {}
+        self.last_latency = 0.0
+        self.max_latency = 0.0
+        self._latency_sum = 0.0
+
+        self._pending = {}
+        self._next_key = 0
+        self._cond = threading.Condition()
+        self._running = False
+        self._thread = None
+
+        if asynchronous:
+            self._running = True
+            self._thread = threading.Thread(target=self._send_loop, daemon=True)
+            self._thread.start()
+
+    def send_transform(self, name, matrix, timestamp=None, sequence=None):
         """
         matrix: 4x4 numpy transform
+        timestamp: tiempo Unix de captura (Frame.wall_time); por defecto, ahora
+        sequence: Frame.sequence; se envía como message_id (cabecera v2)
+        """
+        msg = self._transform_message(name, matrix, timestamp, sequence)
+        self._dispatch((name,), [msg.pack()])
+
+    def send_transforms(self, transforms, timestamp=None, sequence=None, status=None):
+        """
+        Envía todas las transformaciones de un frame en una sola escritura.
+        transforms: {device_name: matriz 4x4}
+        status: opcional, str o dict (se envía como JSON) en un STRING
+                "TrackingStatus" dentro del mismo lote
+        Todos los mensajes comparten timestamp, así Slicer recibe poses
+        consistentes entre sí.
+        """
+        if timestamp is None:
+            timestamp = time.time()
+
+        t0 = self.profiler.start()
+        messages = [
+            self._transform_message(name, matrix, timestamp, sequence)
+            for name, matrix in transforms.items()
+        ]
+
+        if status is not None:
+            if not isinstance(status, str):
+                status = json.dumps(status)
+            msg = pyigtl.StringMessage(status, timestamp=timestamp, device_name=self.STATUS_DEVICE)
+            self._set_sequence(msg, sequence)
+            messages.append(msg)
+
+        if not messages:
+            return
+
+        # Un solo buffer: una escritura en el socket por frame.
+        names = tuple(msg.device_name for msg in messages)
+        packed = [msg.pack() for msg in messages]
+        self.profiler.stop("igtl.pack", t0)
+
+        self._dispatch(names, packed)
+
+    @property
+    def state(self):
+        return self.connection.state
+
+    def stats(self):
         """
+        queue_depth: lotes pendientes de envío
+        latency: desde send_transform hasta que el mensaje salió (ms)
+        devices: {nombre: {"sent": n, "dropped": n}}
+        """
+        with self._cond:
+            queue_depth = len(self._pending)
+
+        devices = {
+            name: {
+                "sent": self.device_sent.get(name, 0),
+                "dropped": self.device_dropped.get(name, 0),
+            }
+            for name in set(self.device_sent) | set(self.device_dropped)
+        }
+
+        return {
+            "state": self.connection.state,
+            "connection": self.connection.stats(),
+            "queue_depth": queue_depth,
+            "sent": self.sent,
+            "dropped": self.dropped,
+            "coalesced": self.coalesced,
+            "last_latency_ms": 1000.0 * self.last_latency,
+            "mean_latency_ms": 1000.0 * self._latency_sum / self.sent if self.sent else 0.0,
+            "max_latency_ms": 1000.0 * self.max_latency,
+            "devices": devices,
+        }
+
+    def close(self):
+        if self._thread is not None:
+            with self._cond:
+                self._running = False
+                self._cond.notify_all()
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+        self.connection.close()
+
+    @staticmethod
+    def _set_sequence(msg, sequence):
+        if sequence is not None:
+            msg.header_version = 2
+            msg.message_id = sequence & 0xFFFFFFFF
+
+    def _transform_message(self, name, matrix, timestamp, sequence):
         msg = pyigtl.TransformMessage(
             device_name=name,
-            matrix=matrix
+            matrix=matrix,
+            timestamp=timestamp,
         )
+        self._set_sequence(msg, sequence)
+        return msg
+
+    def _dispatch(self, names, packed):
+        """
+        names y packed: nombre de dispositivo y mensaje empaquetado de cada
+        mensaje del lote, en el mismo orden.
+        """
+        if self.asynchronous:
+            self._enqueue(names, packed)
+        else:
+            self._write(names, b"".join(packed), time.perf_counter())
+
+    def _write(self, names, data, enqueued):
+        t0 = self.profiler.start()
+        ok = self.connection.send(data)
+        self.profiler.stop("igtl.send", t0)
+
+        if not ok:
+            self.profiler.count("igtl.dropped")
+            self.dropped += 1
+            for name in names:
+                self.device_dropped[name] = self.device_dropped.get(name, 0) + 1
+            return
+
+        latency = time.perf_counter() - enqueued
+        self.sent += 1
+        self.last_latency = latency
+        self.max_latency = max(self.max_latency, latency)
+        self._latency_sum += latency
+
+        for name in names:
+            self.device_sent[name] = self.device_sent.get(name, 0) + 1
+
+    # -----------------------------
+    # Envío en segundo plano
+    # -----------------------------
+    def _enqueue(self, names, packed):
+        with self._cond:
+            # Cada dispositivo tiene un solo slot: se quita de los lotes viejos
+            replaced = set(names)
+            for key, (old_names, old_packed, enqueued) in list(self._pending.items()):
+                if replaced.isdisjoint(old_names):
+                    continue
+
+                self.coalesced += 1
+                kept = [(n, m) for n, m in zip(old_names, old_packed) if n not in replaced]
+                if kept:
+                    self._pending[key] = (tuple(n for n, _ in kept), [m for _, m in kept], enqueued)
+                else:
+                    del self._pending[key]
+
+            # Los lotes salen en el orden en que se encolaron
+            self._pending[self._next_key] = (tuple(names), list(packed), time.perf_counter())
+            self._next_key += 1
+            self._cond.notify()
+
+    def _send_loop(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending or not self._running)
+                if not self._running:
+                    return
+                key = next(iter(self._pending))
+                names, packed, enqueued = self._pending.pop(key)
 
-        self.client.send_message(msg)
\ No newline at end of file
+            # Bloquea solo este hilo, como mucho send_timeout
+            self._write(names, b"".join(packed), enqueued)
@@ -0,0 +1,229 @@
+"""
+Instrumentación del camino crítico: tiempos por etapa con perf_counter_ns,
+percentiles (p50/p95/p99) sobre las últimas capacity muestras y contadores.
+
+Uso en el código instrumentado:
+
+    t0 = profiler.start()
+    ...
+    profiler.stop("tracker.gray", t0)
+    profiler.count("tracker.frames")
+
+Desactivado (el valor por defecto) start() devuelve 0 y stop()/count()
+vuelven sin hacer nada: un par de llamadas por etapa, sin reloj ni lock.
+
+El perfilador global `profiler` es el que usan ArucoTracker, las etapas
+del pipeline e IGTLSender; tracking_service lo activa con --profile.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+import numpy as np
+
+DEFAULT_PERCENTILES = (50, 95, 99)
+
+
+class _StageTimes:
+    """
+    Buffer circular de duraciones (ns) más totales acumulados.
+    """
+
+    __slots__ = ("samples", "head", "count", "total_ns", "max_ns")
+
+    def __init__(self, capacity):
+        # Lista de Python: asignar un int es más barato que en un array
+        self.samples = [0] * capacity
+        self.head = 0
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+
+    def add(self, elapsed):
+        samples = self.samples
+        samples[self.head] = elapsed
+        self.head = (self.head + 1) % len(samples)
+        self.count += 1
+        self.total_ns += elapsed
+        if elapsed > self.max_ns:
+            self.max_ns = elapsed
+
+    def window(self):
+        return self.samples[:min(self.count, len(self.samples))]
+
+
+class Profiler:
+    """
+    enabled: si es False, start/stop/count no miden nada.
+    capacity: muestras por etapa para los percentiles; media, máximo y
+    número de llamadas cubren toda la ejecución.
+
+    Se puede usar desde varios hilos (cada etapa del pipeline corre en
+    el suyo).
+    """
+
+    def __init__(self, enabled=False, capacity=2048, percentiles=DEFAULT_PERCENTILES):
+        self.enabled = enabled
+        self.capacity = capacity
+        self.percentiles = tuple(percentiles)
+
+        self._lock = threading.Lock()
+        self._stages = {}
+        self._counters = {}
+
+    def enable(self, enabled=True):
+        self.enabled = enabled
+
+    def disable(self):
+        self.enabled = False
+
+    # -----------------------------
+    # Camino crítico
+    # -----------------------------
+    def start(self):
+        return time.perf_counter_ns() if self.enabled else 0
+
+    def stop(self, name, start):
+        """
+        Registra el tiempo desde start (valor de start()); devuelve el
+        instante actual para encadenar etapas consecutivas.
+        """
+        if not self.enabled or not start:
+            return 0
+
+        now = time.perf_counter_ns()
+        with self._lock:
+            stage = self._stages.get(name)
+            if stage is None:
+                stage = _StageTimes(self.capacity)
+                self._stages[name] = stage
+            stage.add(now - start)
+        return now
+
+    def count(self, name, value=1):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    @contextmanager
+    def timer(self, name):
+        """
+        Para código fuera del camino crítico (cuesta más que start/stop).
+        """
+        start = self.start()
+        try:
+            yield
+        finally:
+            self.stop(name, start)
+
+    # -----------------------------
+    # Reportes
+    # -----------------------------
+    def snapshot(self):
+        """
+        {"stages": {nombre: {"count", "total_ms", "mean_ms", "max_ms", "p50_ms", ...}},
+         "counters": {nombre: valor}}
+        """
+        with self._lock:
+            stages = {
+                name: (stage.count, stage.total_ns, stage.max_ns, stage.window())
+                for name, stage in self._stages.items()
+            }
+            counters = dict(self._counters)
+
+        result = {}
+        for name, (count, total_ns, max_ns, window) in sorted(stages.items()):
+            entry = {
+                "count": count,
+                "total_ms": total_ns / 1e6,
+                "mean_ms": total_ns / count / 1e6,
+                "max_ms": max_ns / 1e6,
+            }
+            values = np.percentile(window, self.percentiles) / 1e6
+            for p, value in zip(self.percentiles, values):
+                entry[f"p{p}_ms"] = float(value)
+            result[name] = entry
+
+        return {"stages": result, "counters": dict(sorted(counters.items()))}
+
+    def to_json(self, indent=2):
+        return json.dumps(self.snapshot(), indent=indent)
+
+    def to_prometheus(self, prefix="navigation"):
+        """
+        Formato de texto de Prometheus: un summary en segundos por etapa
+        (cuantiles de la ventana, _sum y _count acumulados) y un counter
+        por contador.
+        """
+        snapshot = self.snapshot()
+        lines = []
+
+        if snapshot["stages"]:
+            metric = f"{prefix}_stage_seconds"
+            lines.append(f"# HELP {metric} Duración de cada etapa instrumentada.")
+            lines.append(f"# TYPE {metric} summary")
+            for name, entry in snapshot["stages"].items():
+                for p in self.percentiles:
+                    quantile = p / 100.0
+                    seconds = entry[f"p{p}_ms"] / 1e3
+                    lines.append(f'{metric}{{stage="{name}",quantile="{quantile:g}"}} {seconds:.9f}')
+                lines.append(f'{metric}_sum{{stage="{name}"}} {entry["total_ms"] / 1e3:.9f}')
+                lines.append(f'{metric}_count{{stage="{name}"}} {entry["count"]}')
+
+        for name, value in snapshot["counters"].items():
+            metric = f"{prefix}_{_metric_name(name)}_total"
+            lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric} {value}")
+
+        return "\n".join(lines) + "\n"
+
+    def format_report(self):
+        snapshot = self.snapshot()
+        if not snapshot["stages"] and not snapshot["counters"]:
+            return "Sin datos de perfilado."
+
+        columns = "".join(f" {'p' + str(p):>8}" for p in self.percentiles)
+        lines = [f"{'etapa':<24} {'n':>8} {'media':>8}{columns} {'max':>8}  (ms)"]
+        for name, entry in snapshot["stages"].items():
+            values = "".join(f" {entry[f'p{p}_ms']:>8.3f}" for p in self.percentiles)
+            lines.append(
+                f"{name:<24} {entry['count']:>8} {entry['mean_ms']:>8.3f}{values} {entry['max_ms']:>8.3f}"
+            )
+        for name, value in snapshot["counters"].items():
+            lines.append(f"{name:<24} {value:>8}")
+        return "\n".join(lines)
+
+    def write(self, path):
+        """
+        Vuelca el reporte a path: Prometheus si termina en .prom, JSON si no.
+        Escribe en un temporal y renombra para no dejar archivos a medias.
+        """
+        path = str(path)
+        text = self.to_prometheus() if path.endswith(".prom") else self.to_json()
+        temporary = path + ".tmp"
+        with open(temporary, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(temporary, path)
+
+    def reset(self):
+        with self._lock:
+            self._stages.clear()
+            self._counters.clear()
+
+
+def _metric_name(name):
+    return "".join(c if c.isalnum() else "_" for c in name)
+
+
+profiler = Profiler()
+
+# Como calibration.registry: los scripts importan project.diagnostics.profiler
+# y la librería diagnostics.profiler. Ambos nombres apuntan al mismo módulo,
+# así profiler.enable() desde un script activa el perfilador de la librería.
+for _name in ("diagnostics.profiler", "project.diagnostics.profiler"):
+    sys.modules.setdefault(_name, sys.modules[__name__])
@@ -0,0 +1,174 @@
+import math
+import threading
+
+import numpy as np
+
+# Columnas del buffer: x, y, z y distancia a la cámara / referencia
+_COLUMNS = 4
+
+
+class _ToolAudit:
+    """
+    Ventana de las últimas capacity muestras de una herramienta.
+    Media y varianza con Welford (alta y baja de muestras en O(1));
+    mínimo, máximo y percentiles se calculan del buffer al pedirlos.
+    """
+
+    __slots__ = ("buffer", "head", "count", "total", "mean", "m2")
+
+    def __init__(self, capacity):
+        self.buffer = np.empty((capacity, _COLUMNS))
+        self.head = 0
+        self.count = 0
+        self.total = 0
+        # Floats de Python: con 4 columnas es más rápido que NumPy
+        self.mean = [0.0] * _COLUMNS
+        self.m2 = [0.0] * _COLUMNS
+
+    def add(self, sample):
+        capacity = len(self.buffer)
+
+        if self.count == capacity:
+            self._remove(self.buffer[self.head].tolist())
+
+        self.buffer[self.head] = sample
+        self.head = (self.head + 1) % capacity
+        self.total += 1
+
+        # Welford
+        self.count += 1
+        mean, m2 = self.mean, self.m2
+        for i, value in enumerate(sample):
+            delta = value - mean[i]
+            mean[i] += delta / self.count
+            m2[i] += delta * (value - mean[i])
+
+    def _remove(self, sample):
+        self.count -= 1
+        mean, m2 = self.mean, self.m2
+
+        if self.count == 0:
+            mean[:] = [0.0] * _COLUMNS
+            m2[:] = [0.0] * _COLUMNS
+            return
+
+        for i, value in enumerate(sample):
+            delta = value - mean[i]
+            mean[i] -= delta / self.count
+            # max: errores de redondeo acumulados
+            m2[i] = max(m2[i] - delta * (value - mean[i]), 0.0)
+
+    def window(self):
+        if self.count < len(self.buffer):
+            return self.buffer[:self.count]
+        return self.buffer
+
+
+class StabilityAuditor:
+    """
+    Auditoría de estabilidad por herramienta sobre las últimas capacity
+    muestras, sin listas ni pop(0): un buffer circular de NumPy
+    preasignado por herramienta.
+
+    add() cuesta O(1); report() devuelve media y desviación (Welford),
+    mínimo, máximo y percentiles por eje y de la distancia. Se puede
+    llamar desde cualquier hilo: el servicio sin GUI lo imprime cada cierto
+    tiempo en lugar de esperar la tecla "a".
+    """
+
+    def __init__(self, capacity=1000, percentiles=(50, 95, 99)):
+        self.capacity = capacity
+        self.percentiles = tuple(percentiles)
+
+        self._lock = threading.Lock()
+        self._tools = {}
+
+    def add(self, tool_id, translation, distance=None):
+        """
+        translation: (3,) en metros. distance: por defecto |translation|.
+        """
+        x, y, z = np.reshape(translation, 3).tolist()
+        if distance is None:
+            distance = math.sqrt(x * x + y * y + z * z)
+        sample = (x, y, z, float(distance))
+
+        with self._lock:
+            audit = self._tools.get(tool_id)
+            if audit is None:
+                audit = _ToolAudit(self.capacity)
+                self._tools[tool_id] = audit
+            audit.add(sample)
+
+    def add_transform(self, tool_id, T):
+        self.add(tool_id, T.view()[:3, 3])
+
+    @property
+    def tools(self):
+        return list(self._tools)
+
+    def report(self, tool_id, percentiles=None):
+        """
+        Estadísticas de la ventana actual o None si no hay muestras.
+        Los arrays "mean", "std", "min", "max" son (x, y, z); los de
+        distancia son escalares. "percentiles" es {p: (x, y, z)} y
+        "distance_percentiles" {p: distancia}.
+        """
+        percentiles = self.percentiles if percentiles is None else tuple(percentiles)
+
+        with self._lock:
+            audit = self._tools.get(tool_id)
+            if audit is None or audit.count == 0:
+                return None
+
+            window = audit.window().copy()
+            count = audit.count
+            total = audit.total
+            mean = np.array(audit.mean)
+            std = np.sqrt(np.array(audit.m2) / count)
+
+        minimum = window.min(axis=0)
+        maximum = window.max(axis=0)
+        values = np.percentile(window, percentiles, axis=0) if percentiles else np.empty((0, _COLUMNS))
+
+        return {
+            "frames": count,
+            "total_frames": total,
+            "mean": mean[:3],
+            "std": std[:3],
+            "min": minimum[:3],
+            "max": maximum[:3],
+            "percentiles": {p: row[:3] for p, row in zip(percentiles, values)},
+            "mean_distance": float(mean[3]),
+            "std_distance": float(std[3]),
+            "max_deviation": float(np.max(np.abs(window[:, 3] - mean[3]))),
+            "distance_percentiles": {p: float(row[3]) for p, row in zip(percentiles, values)},
+        }
+
+    def format_report(self, tool_id):
+        report = self.report(tool_id)
+        if report is None:
+            return "No data to analyze yet."
+
+        mean, std = report["mean"], report["std"]
+        lines = [
+            f"--- Stability Audit Report ({tool_id}) ---",
+            f"Frames analyzed: {report['frames']}",
+            f"Mean (X, Y, Z): ({mean[0]:.4f}, {mean[1]:.4f}, {mean[2]:.4f})",
+            f"Std (X, Y, Z): ({std[0]:.4f}, {std[1]:.4f}, {std[2]:.4f})",
+            f"Mean distance: {report['mean_distance']:.4f}",
+            f"Std distance: {report['std_distance']:.4f}",
+            f"Max deviation: {report['max_deviation']:.4f}",
+        ]
+
+        for p, value in report["distance_percentiles"].items():
+            lines.append(f"P{p} distance: {value:.4f}")
+
+        lines.append("-" * 30)
+        return "\n".join(lines)
+
+    def reset(self, tool_id=None):
+        with self._lock:
+            if tool_id is None:
+                self._tools.clear()
+            else:
+                self._tools.pop(tool_id, None)
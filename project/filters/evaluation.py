@@ -0,0 +1,186 @@
+"""
+Evaluación offline de filtros de pose: jitter contra retraso.
+
+Un stream de poses es (timestamps (N,), translations (N, 3),
+quaternions (N, 4) en orden (x, y, z, w)). Los filtros se evalúan con la
+interfaz update(tool_id, pose, timestamp) de PoseEMAFilter /
+OneEuroPoseFilter.
+"""
+
+import numpy as np
+from math3d.pose import Pose
+from math3d.quaternion import quat_conjugate, quat_from_rotvec, quat_multiply, quat_to_rotvec
+
+
+def load_pose_stream(path):
+    """
+    .npz con timestamps, translations y quaternions, o .csv con columnas
+    t, x, y, z, qx, qy, qz, qw (con encabezado).
+    """
+    path = str(path)
+
+    if path.endswith(".npz"):
+        data = np.load(path)
+        return (
+            np.asarray(data["timestamps"], dtype=np.float64),
+            np.asarray(data["translations"], dtype=np.float64),
+            np.asarray(data["quaternions"], dtype=np.float64),
+        )
+
+    data = np.loadtxt(path, delimiter=",", skiprows=1, ndmin=2)
+    return data[:, 0], data[:, 1:4], data[:, 4:8]
+
+
+def synthetic_pose_stream(duration=12.0, rate=30.0, noise_m=0.0005, noise_rad=0.003, seed=0):
+    """
+    Trayectoria de prueba: reposo, movimiento lento y movimiento rápido
+    (un tercio cada uno), con ruido gaussiano en la medición.
+    Devuelve (timestamps, translations, quaternions, true_translations,
+    true_quaternions).
+    """
+    rng = np.random.default_rng(seed)
+    timestamps = np.arange(0.0, duration, 1.0 / rate)
+    third = duration / 3.0
+
+    # Fase acumulada: 0 en reposo, 0.5 Hz y luego 2 Hz
+    frequency = np.where(timestamps < third, 0.0, np.where(timestamps < 2 * third, 0.5, 2.0))
+    phase = 2.0 * np.pi * np.cumsum(frequency) / rate
+
+    true_translations = np.stack([
+        0.05 * np.sin(phase),
+        0.03 * (1.0 - np.cos(phase)),
+        0.30 + 0.01 * np.sin(0.5 * phase),
+    ], axis=-1)
+
+    angle = 0.4 * np.sin(phase)
+    true_rotvecs = np.stack([0.3 * angle, angle, np.zeros_like(angle)], axis=-1)
+    true_quaternions = quat_from_rotvec(true_rotvecs)
+
+    translations = true_translations + rng.normal(0.0, noise_m, true_translations.shape)
+    noise = rng.normal(0.0, noise_rad, true_rotvecs.shape)
+    quaternions = quat_multiply(true_quaternions, quat_from_rotvec(noise))
+
+    return timestamps, translations, quaternions, true_translations, true_quaternions
+
+
+def run_filter(pose_filter, timestamps, translations, quaternions, tool_id="Pointer"):
+    """
+    Pasa el stream por el filtro. Devuelve (translations, quaternions).
+    """
+    n = len(timestamps)
+    out_t = np.empty((n, 3))
+    out_q = np.empty((n, 4))
+
+    for k in range(n):
+        pose = Pose(quaternions[k], translations[k])
+        filtered = pose_filter.update(tool_id, pose, float(timestamps[k]))
+        out_t[k] = filtered.translation_tuple
+        out_q[k] = filtered.quaternion_tuple
+
+    return out_t, out_q
+
+
+def static_mask(timestamps, translations, speed_threshold=0.01, window=9):
+    """
+    Muestras en reposo: velocidad (m/s) de la trayectoria cruda suavizada
+    con una media móvil centrada por debajo de speed_threshold.
+    """
+    kernel = np.ones(window) / window
+    padded = np.pad(translations, ((window // 2, window // 2), (0, 0)), mode="edge")
+    smooth = np.stack([np.convolve(padded[:, i], kernel, mode="valid") for i in range(3)], axis=-1)
+
+    velocity = np.gradient(smooth, timestamps, axis=0)
+    return np.linalg.norm(velocity, axis=-1) < speed_threshold
+
+
+def translation_jitter(translations, mask=None):
+    """
+    Desviación estándar del ruido por eje (m) estimada con la segunda
+    diferencia: para ruido blanco var(x[k+1] - 2x[k] + x[k-1]) = 6 sigma².
+    mask: usar solo tramos en reposo (static_mask); el jitter se mide
+    quieto y el retraso en movimiento.
+    """
+    return _second_difference_sigma(np.asarray(translations), mask)
+
+
+def rotation_jitter(quaternions, mask=None):
+    """
+    Igual que translation_jitter con los incrementos de rotación (rad).
+    """
+    relative = quat_multiply(quat_conjugate(quaternions[:-1]), quaternions[1:])
+    steps = quat_to_rotvec(relative)
+
+    # steps[k] va de k a k+1: mismo papel que la primera diferencia
+    if mask is not None:
+        mask = mask[:-1] & mask[1:]
+    return _second_difference_sigma(np.cumsum(steps, axis=0), mask)
+
+
+def _second_difference_sigma(values, mask):
+    second = values[2:] - 2.0 * values[1:-1] + values[:-2]
+
+    if mask is not None:
+        # Las tres muestras de cada segunda diferencia deben estar en reposo
+        mask = np.asarray(mask, dtype=bool)
+        second = second[mask[2:] & mask[1:-1] & mask[:-2]]
+
+    if len(second) == 0:
+        return float("nan")
+
+    return float(np.sqrt(np.mean(np.sum(second ** 2, axis=-1)) / (6.0 * values.shape[-1])))
+
+
+def estimate_lag(timestamps, raw, filtered, max_lag=0.5):
+    """
+    Retraso (s) del filtrado respecto al crudo: el desplazamiento que
+    minimiza el error cuadrático entre filtered[k] y raw[k - s], refinado
+    con una parábola entre muestras. Se prueban desplazamientos en los dos
+    sentidos para poder refinar retrasos menores que una muestra (y
+    adelantos, con predicción).
+    """
+    dt = float(np.median(np.diff(timestamps)))
+    max_shift = max(1, min(int(round(max_lag / dt)), len(raw) // 4))
+    shifts = range(-max_shift, max_shift + 1)
+
+    errors = np.array([_shifted_error(raw, filtered, shift) for shift in shifts])
+
+    best = int(np.argmin(errors))
+    offset = 0.0
+    if 0 < best < len(errors) - 1:
+        left, center, right = errors[best - 1], errors[best], errors[best + 1]
+        curvature = left - 2.0 * center + right
+        if curvature > 0:
+            offset = 0.5 * (left - right) / curvature
+
+    return (shifts[best] + offset) * dt
+
+
+def _shifted_error(raw, filtered, shift):
+    # filtered[k] contra raw[k - shift]
+    if shift >= 0:
+        difference = filtered[shift:] - raw[:len(raw) - shift]
+    else:
+        difference = filtered[:shift] - raw[-shift:]
+    return np.mean(np.sum(difference ** 2, axis=-1))
+
+
+def evaluate(pose_filter, timestamps, translations, quaternions, true_translations=None):
+    """
+    Devuelve jitter en reposo (mm, grados), retraso de la traslación (ms)
+    y, si se da la trayectoria real, el error RMS (mm).
+    """
+    out_t, out_q = run_filter(pose_filter, timestamps, translations, quaternions)
+    static = static_mask(timestamps, translations)
+
+    result = {
+        "jitter_mm": 1000.0 * translation_jitter(out_t, static),
+        "rotation_jitter_deg": float(np.degrees(rotation_jitter(out_q, static))),
+        "lag_ms": 1000.0 * float(estimate_lag(timestamps, translations, out_t)),
+    }
+
+    if true_translations is not None:
+        error = np.linalg.norm(out_t - true_translations, axis=-1)
+        result["rms_error_mm"] = 1000.0 * float(np.sqrt(np.mean(error ** 2)))
+
+    return result
+
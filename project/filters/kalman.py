@@ -0,0 +1,319 @@
+import threading
+from dataclasses import dataclass
+
+import numpy as np
+from math3d.pose import Pose
+from math3d.quaternion import (
+    quat_conjugate,
+    quat_from_rotvec,
+    quat_multiply,
+    quat_normalize,
+    quat_to_rotvec,
+)
+
+
+@dataclass(slots=True)
+class TrackedPose:
+    """
+    Salida de PoseKalmanFilter para una herramienta.
+    covariance: 6x6 (traslación m², rotación rad²), diagonal por ejes
+    coasting: True si no hubo medición en este instante (solo predicción)
+    """
+
+    pose: Pose
+    covariance: np.ndarray
+    timestamp: float
+    coasting: bool
+
+
+class PoseKalmanFilter:
+    """
+    Kalman de velocidad constante para poses, vectorizado por herramientas.
+
+    Traslación: estado (posición, velocidad) por eje. Rotación: filtro de
+    estado de error; la actitud nominal es un cuaternio y el estado es
+    (error de ángulo, velocidad angular) por eje, en el sistema del mundo.
+    Los ejes se tratan desacoplados: cada uno es un Kalman 2x2 resuelto en
+    forma cerrada sobre arrays (herramientas, 3).
+
+    Si falta la medición de una herramienta, su pose se predice durante
+    coast_time segundos; pasado ese tiempo se olvida. predict() extrapola
+    a cualquier instante (p. ej. el de envío) sin cambiar el estado. Todos
+    los métodos públicos toman el mismo lock: predict() y filtered() se
+    pueden llamar desde otro hilo.
+
+    acceleration_noise: m/s² (ruido de proceso, aceleración blanca)
+    measurement_noise: m (desviación de la posición medida)
+    angular_acceleration_noise: rad/s²
+    rotation_noise: rad
+    """
+
+    def __init__(
+        self,
+        acceleration_noise=0.5,
+        measurement_noise=0.001,
+        angular_acceleration_noise=2.0,
+        rotation_noise=0.005,
+        coast_time=0.2,
+        initial_velocity_std=0.5,
+        initial_angular_velocity_std=3.0,
+    ):
+        self.q_translation = acceleration_noise ** 2
+        self.r_translation = measurement_noise ** 2
+        self.q_rotation = angular_acceleration_noise ** 2
+        self.r_rotation = rotation_noise ** 2
+        self.coast_time = coast_time
+        self.initial_velocity_var = initial_velocity_std ** 2
+        self.initial_angular_velocity_var = initial_angular_velocity_std ** 2
+
+        self._lock = threading.Lock()
+        self._index = {}
+        self._active = np.zeros(0, dtype=bool)
+        self._time = np.zeros(0)
+        self._last_measurement = np.zeros(0)
+
+        # Traslación
+        self._x = np.zeros((0, 3))
+        self._v = np.zeros((0, 3))
+        self._pos_cov = np.zeros((0, 3, 3))   # p00, p01, p11 por eje
+
+        # Rotación
+        self._q = np.zeros((0, 4))
+        self._w = np.zeros((0, 3))
+        self._rot_cov = np.zeros((0, 3, 3))
+
+    # -----------------------------
+    # Interfaz por herramienta (como PoseEMAFilter)
+    # -----------------------------
+    def update(self, tool_id, pose, timestamp=None):
+        """
+        pose: Pose o Transform medido. Devuelve la Pose filtrada.
+        timestamp es opcional en la firma para coincidir con PoseEMAFilter,
+        pero el modelo de velocidad lo necesita: sin él, ValueError.
+        """
+        if timestamp is None:
+            raise ValueError("PoseKalmanFilter necesita el timestamp de cada medición.")
+
+        tracked = self.update_all({tool_id: pose}, timestamp, tools=(tool_id,))
+        return tracked[tool_id].pose
+
+    def coast(self, tool_id, timestamp):
+        """
+        Sin medición en este frame: devuelve la Pose predicha mientras no
+        pase coast_time desde la última medición; si pasó, la olvida y
+        devuelve None.
+        """
+        tracked = self.update_all({}, timestamp, tools=(tool_id,))
+        entry = tracked.get(tool_id)
+        return None if entry is None else entry.pose
+
+    def filtered(self, tool_id):
+        with self._lock:
+            row = self._index.get(tool_id)
+            if row is None or not self._active[row]:
+                return None
+            return self._pose(row)
+
+    def reset(self, tool_id=None):
+        with self._lock:
+            if tool_id is None:
+                self._active[:] = False
+            elif tool_id in self._index:
+                self._active[self._index[tool_id]] = False
+
+    # -----------------------------
+    # Interfaz vectorizada
+    # -----------------------------
+    def update_all(self, measurements, timestamp, tools=None):
+        """
+        measurements: {tool_id: Pose o Transform} medidos en timestamp.
+        tools: herramientas a avanzar (por defecto todas las conocidas).
+        Devuelve {tool_id: TrackedPose} de las medidas y de las que siguen
+        en coast; las que superan coast_time se olvidan.
+        """
+        with self._lock:
+            return self._update_all(measurements, timestamp, tools)
+
+    def _update_all(self, measurements, timestamp, tools):
+        fresh = set()
+        for tool_id, pose in measurements.items():
+            self._ensure_row(tool_id)
+            if not self._active[self._index[tool_id]]:
+                self._initialize(self._index[tool_id], pose, timestamp)
+                fresh.add(tool_id)
+
+        if tools is None:
+            tools = list(self._index)
+
+        rows = np.array([self._index[t] for t in tools if t in self._index], dtype=np.intp)
+        rows = rows[self._active[rows]]
+        if len(rows) == 0:
+            return {}
+
+        self._predict(rows, timestamp)
+
+        # Las recién inicializadas ya tienen su medición como estado
+        measured_tools = [t for t in tools if t in measurements and t not in fresh]
+        if measured_tools:
+            measured_rows = np.array([self._index[t] for t in measured_tools], dtype=np.intp)
+            poses = [_as_pose(measurements[t]) for t in measured_tools]
+            positions = np.array([p.translation_tuple for p in poses])
+            quaternions = np.array([p.quaternion_tuple for p in poses])
+            self._correct(measured_rows, positions, quaternions, timestamp)
+
+        # Fuera del tiempo de coast: se olvida
+        expired = timestamp - self._last_measurement[rows] > self.coast_time
+        self._active[rows[expired]] = False
+
+        result = {}
+        row_to_tool = {row: tool_id for tool_id, row in self._index.items()}
+        for row in rows[~expired]:
+            tool_id = row_to_tool[row]
+            result[tool_id] = TrackedPose(
+                self._pose(row),
+                self._covariance(row),
+                timestamp,
+                tool_id not in measurements,
+            )
+        return result
+
+    def predict(self, tool_id, timestamp):
+        """
+        Pose extrapolada a timestamp con la velocidad estimada, sin
+        modificar el estado (compensación de latencia al enviar).
+        """
+        with self._lock:
+            row = self._index.get(tool_id)
+            if row is None or not self._active[row]:
+                return None
+
+            dt = timestamp - self._time[row]
+            x = self._x[row] + self._v[row] * dt
+            q = quat_multiply(quat_from_rotvec(self._w[row] * dt), self._q[row])
+        return Pose.from_quaternion_translation(q.tolist(), x.tolist(), normalized=True)
+
+    def predict_all(self, timestamp):
+        with self._lock:
+            rows = np.flatnonzero(self._active)
+            dt = (timestamp - self._time[rows])[:, None]
+            x = self._x[rows] + self._v[rows] * dt
+            q = quat_multiply(quat_from_rotvec(self._w[rows] * dt), self._q[rows])
+            row_to_tool = {row: tool_id for tool_id, row in self._index.items()}
+
+        return {
+            row_to_tool[row]: Pose.from_quaternion_translation(q[k].tolist(), x[k].tolist(), normalized=True)
+            for k, row in enumerate(rows)
+        }
+
+    def covariance(self, tool_id):
+        with self._lock:
+            row = self._index.get(tool_id)
+            if row is None or not self._active[row]:
+                return None
+            return self._covariance(row)
+
+    # -----------------------------
+    # Kalman por eje
+    # -----------------------------
+    def _predict(self, rows, timestamp):
+        dt = np.maximum(timestamp - self._time[rows], 0.0)[:, None]
+        self._time[rows] = timestamp
+
+        self._x[rows] += self._v[rows] * dt
+        self._pos_cov[rows] = _predict_covariance(self._pos_cov[rows], dt, self.q_translation)
+
+        # Actitud nominal: q <- exp(w dt) q; el error se mantiene en cero
+        self._q[rows] = quat_normalize(
+            quat_multiply(quat_from_rotvec(self._w[rows] * dt), self._q[rows])
+        )
+        self._rot_cov[rows] = _predict_covariance(self._rot_cov[rows], dt, self.q_rotation)
+
+    def _correct(self, rows, positions, quaternions, timestamp):
+        self._last_measurement[rows] = timestamp
+
+        innovation = positions - self._x[rows]
+        dx, dv, self._pos_cov[rows] = _correct_axes(self._pos_cov[rows], innovation, self.r_translation)
+        self._x[rows] += dx
+        self._v[rows] += dv
+
+        # Innovación de rotación: log(q_medido q_nominal^-1), en el mundo
+        innovation = quat_to_rotvec(quat_multiply(quaternions, quat_conjugate(self._q[rows])))
+        dtheta, dw, self._rot_cov[rows] = _correct_axes(self._rot_cov[rows], innovation, self.r_rotation)
+        self._q[rows] = quat_normalize(quat_multiply(quat_from_rotvec(dtheta), self._q[rows]))
+        self._w[rows] += dw
+
+    def _pose(self, row):
+        return Pose.from_quaternion_translation(self._q[row].tolist(), self._x[row].tolist(), normalized=True)
+
+    def _initialize(self, row, pose, timestamp):
+        pose = _as_pose(pose)
+
+        self._active[row] = True
+        self._time[row] = timestamp
+        self._last_measurement[row] = timestamp
+
+        self._x[row] = pose.translation_tuple
+        self._v[row] = 0.0
+        self._pos_cov[row] = 0.0
+        self._pos_cov[row, :, 0] = self.r_translation
+        self._pos_cov[row, :, 2] = self.initial_velocity_var
+
+        self._q[row] = pose.quaternion_tuple
+        self._w[row] = 0.0
+        self._rot_cov[row] = 0.0
+        self._rot_cov[row, :, 0] = self.r_rotation
+        self._rot_cov[row, :, 2] = self.initial_angular_velocity_var
+
+    def _ensure_row(self, tool_id):
+        if tool_id in self._index:
+            return
+
+        self._index[tool_id] = len(self._active)
+        self._active = np.append(self._active, False)
+        self._time = np.append(self._time, 0.0)
+        self._last_measurement = np.append(self._last_measurement, 0.0)
+        self._x = np.vstack([self._x, np.zeros((1, 3))])
+        self._v = np.vstack([self._v, np.zeros((1, 3))])
+        self._pos_cov = np.concatenate([self._pos_cov, np.zeros((1, 3, 3))])
+        self._q = np.vstack([self._q, [[0.0, 0.0, 0.0, 1.0]]])
+        self._w = np.vstack([self._w, np.zeros((1, 3))])
+        self._rot_cov = np.concatenate([self._rot_cov, np.zeros((1, 3, 3))])
+
+    def _covariance(self, row):
+        return np.diag(np.concatenate([self._pos_cov[row, :, 0], self._rot_cov[row, :, 0]]))
+
+
+def _predict_covariance(cov, dt, q):
+    """
+    cov: (..., 3, 3) con [p00, p01, p11] por eje; dt: (..., 1).
+    F = [[1, dt], [0, 1]], Q = q [[dt³/3, dt²/2], [dt²/2, dt]].
+    """
+    p00, p01, p11 = cov[..., 0], cov[..., 1], cov[..., 2]
+    return np.stack([
+        p00 + 2.0 * dt * p01 + dt * dt * p11 + q * dt ** 3 / 3.0,
+        p01 + dt * p11 + q * dt * dt / 2.0,
+        p11 + q * dt,
+    ], axis=-1)
+
+
+def _correct_axes(cov, innovation, r):
+    """
+    Corrección con H = [1, 0]. Devuelve (delta de valor, delta de
+    velocidad, nueva covarianza).
+    """
+    p00, p01, p11 = cov[..., 0], cov[..., 1], cov[..., 2]
+    s = p00 + r
+    k0 = p00 / s
+    k1 = p01 / s
+
+    new_cov = np.stack([
+        (1.0 - k0) * p00,
+        (1.0 - k0) * p01,
+        p11 - k1 * p01,
+    ], axis=-1)
+
+    return k0 * innovation, k1 * innovation, new_cov
+
+
+def _as_pose(pose):
+    return pose if hasattr(pose, "slerp") else Pose.from_transform(pose)
@@ -0,0 +1,144 @@
+import math
+
+import numpy as np
+from math3d.pose import Pose
+
+
+def smoothing_factor(cutoff, dt):
+    """
+    alpha del paso bajo de primer orden con frecuencia de corte cutoff (Hz)
+    para un intervalo dt (s): 1 / (1 + tau / dt), tau = 1 / (2 pi cutoff).
+    """
+    tau = 1.0 / (2.0 * math.pi * cutoff)
+    return 1.0 / (1.0 + tau / dt)
+
+
+class OneEuroFilter:
+    """
+    Filtro One Euro (Casiez et al., 2012) para un vector.
+
+    La frecuencia de corte sube con la velocidad filtrada:
+        cutoff = min_cutoff + beta * |velocidad|
+    Quieto filtra fuerte (poco jitter); en movimiento rápido casi no filtra
+    (poco retraso).
+
+    min_cutoff: Hz en reposo; bajarlo reduce el jitter
+    beta: s/m (o s/rad); subirlo reduce el retraso en movimiento
+    d_cutoff: Hz del paso bajo de la derivada
+    frequency: Hz supuestos cuando update() no recibe timestamp
+    """
+
+    def __init__(self, min_cutoff=1.0, beta=0.0, d_cutoff=1.0, frequency=30.0):
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self.frequency = frequency
+
+        self.reset()
+
+    def reset(self):
+        self.value = None
+        self.velocity = None
+        self.timestamp = None
+
+    def update(self, value, timestamp=None):
+        value = np.asarray(value, dtype=np.float64)
+
+        if self.value is None:
+            self.value = value
+            self.velocity = np.zeros_like(value)
+            self.timestamp = timestamp
+            return value
+
+        dt = _interval(self.timestamp, timestamp, self.frequency)
+        self.timestamp = timestamp
+
+        velocity = (value - self.value) / dt
+        self.velocity = self.velocity + smoothing_factor(self.d_cutoff, dt) * (velocity - self.velocity)
+
+        cutoff = self.min_cutoff + self.beta * float(np.linalg.norm(self.velocity))
+        self.value = self.value + smoothing_factor(cutoff, dt) * (value - self.value)
+        return self.value
+
+
+class OneEuroPoseFilter:
+    """
+    One Euro por herramienta para poses: la traslación como vector y la
+    rotación con la velocidad angular (rad/s) y un slerp hacia la medición.
+    Misma interfaz que PoseEMAFilter.
+
+    Los parámetros de rotación usan los de traslación si no se dan.
+    """
+
+    def __init__(
+        self,
+        min_cutoff=1.0,
+        beta=0.0,
+        d_cutoff=1.0,
+        rotation_min_cutoff=None,
+        rotation_beta=None,
+        frequency=30.0,
+    ):
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self.rotation_min_cutoff = min_cutoff if rotation_min_cutoff is None else rotation_min_cutoff
+        self.rotation_beta = beta if rotation_beta is None else rotation_beta
+        self.frequency = frequency
+
+        self._translation = {}
+        self._rotation = {}
+
+    def update(self, tool_id, pose, timestamp=None):
+        """
+        pose: Pose o Transform medido. Devuelve la Pose filtrada.
+        """
+        if not hasattr(pose, "slerp"):
+            pose = Pose.from_transform(pose)
+
+        translation = self._translation.get(tool_id)
+        if translation is None:
+            translation = OneEuroFilter(self.min_cutoff, self.beta, self.d_cutoff, self.frequency)
+            self._translation[tool_id] = translation
+
+        previous_timestamp = translation.timestamp
+        t = translation.update(pose.translation_tuple, timestamp)
+
+        state = self._rotation.get(tool_id)
+        if state is None:
+            rotation = pose
+            angular_speed = 0.0
+        else:
+            previous, angular_speed = state
+            dt = _interval(previous_timestamp, timestamp, self.frequency)
+
+            speed = previous.angle_to(pose) / dt
+            angular_speed += smoothing_factor(self.d_cutoff, dt) * (speed - angular_speed)
+
+            cutoff = self.rotation_min_cutoff + self.rotation_beta * angular_speed
+            rotation = previous.slerp(pose, smoothing_factor(cutoff, dt))
+
+        self._rotation[tool_id] = (rotation, angular_speed)
+        return Pose.from_quaternion_translation(rotation.quaternion_tuple, t, normalized=True)
+
+    def filtered(self, tool_id):
+        state = self._rotation.get(tool_id)
+        if state is None:
+            return None
+        t = self._translation[tool_id].value
+        return Pose.from_quaternion_translation(state[0].quaternion_tuple, t, normalized=True)
+
+    def reset(self, tool_id=None):
+        if tool_id is None:
+            self._translation.clear()
+            self._rotation.clear()
+        else:
+            self._translation.pop(tool_id, None)
+            self._rotation.pop(tool_id, None)
+
+
+def _interval(previous_timestamp, timestamp, frequency):
+    if timestamp is None or previous_timestamp is None:
+        return 1.0 / frequency
+    # Timestamps repetidos o desordenados: no dividir entre cero
+    return max(timestamp - previous_timestamp, 1e-6)
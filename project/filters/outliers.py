@@ -0,0 +1,191 @@
+import math
+
+import numpy as np
+from math3d.pose import Pose
+
+# 1.4826 * MAD estima la desviación estándar con ruido gaussiano
+_MAD_SCALE = 1.4826
+
+
+class _ToolWindow:
+    __slots__ = ("changes", "count", "head", "last", "velocity", "timestamp", "consecutive", "rejected")
+
+    def __init__(self, window):
+        self.changes = np.zeros((window, 3))
+        self.count = 0
+        self.head = 0
+        self.last = None
+        self.velocity = None
+        self.timestamp = None
+        self.consecutive = 0
+        self.rejected = 0
+
+    def accept(self, pose, velocity, timestamp):
+        if self.velocity is not None:
+            px, py, pz = self.velocity
+            vx, vy, vz = velocity
+            self.changes[self.head] = (vx - px, vy - py, vz - pz)
+            self.head = (self.head + 1) % len(self.changes)
+            self.count = min(self.count + 1, len(self.changes))
+
+        self.last = pose
+        self.velocity = velocity
+        self.timestamp = timestamp
+        self.consecutive = 0
+
+    def restart(self, pose, timestamp):
+        self.count = 0
+        self.head = 0
+        self.last = pose
+        self.velocity = None
+        self.timestamp = timestamp
+        self.consecutive = 0
+
+
+class PoseOutlierRejector:
+    """
+    Rechazo de poses atípicas por herramienta, antes del suavizado.
+
+    Una medición se rechaza si falla alguna de tres pruebas:
+      innovation: salto de traslación respecto a la última pose aceptada
+                  mayor que translation_gate + max_speed * dt
+      hampel:     cambio de velocidad (respecto a la última pose aceptada)
+                  a más de hampel_k desviaciones (1.4826 * MAD) de la
+                  mediana de los últimos window cambios aceptados, en
+                  algún eje
+      rotation:   ángulo respecto a la última pose aceptada mayor que
+                  rotation_gate + max_angular_speed * dt
+
+    Hampel se aplica al cambio de velocidad y no a la posición: una
+    ventana causal de posiciones (o de velocidades) se queda atrás y
+    rechaza el inicio de un movimiento o los giros rápidos. La ventana es
+    un buffer circular fijo, así que el coste por frame es constante.
+
+    Tras max_consecutive_rejects rechazos seguidos, o si pasan más de
+    max_gap segundos sin mediciones, la herramienta se reinicia con la
+    medición actual: un movimiento real grande (o un atípico que se colara)
+    no deja el filtro bloqueado en un valor viejo. A 30 fps, aceleraciones
+    por encima de ~5 m/s² pueden confundirse con picos de 1 cm.
+
+    Distancias en m, ángulos en rad, velocidades por segundo.
+    """
+
+    def __init__(
+        self,
+        window=7,
+        hampel_k=3.0,
+        min_deviation=0.1,
+        translation_gate=0.01,
+        max_speed=0.5,
+        rotation_gate=math.radians(10.0),
+        max_angular_speed=math.radians(360.0),
+        max_consecutive_rejects=3,
+        max_gap=0.5,
+        frequency=30.0,
+    ):
+        self.window = window
+        self.hampel_k = hampel_k
+        self.min_deviation = min_deviation
+        self.translation_gate = translation_gate
+        self.max_speed = max_speed
+        self.rotation_gate = rotation_gate
+        self.max_angular_speed = max_angular_speed
+        self.max_consecutive_rejects = max_consecutive_rejects
+        self.max_gap = max_gap
+        self.frequency = frequency
+
+        self._tools = {}
+
+        self.accepted = 0
+        self.reinitialized = 0
+        self.rejected = {"innovation": 0, "hampel": 0, "rotation": 0}
+
+    def update(self, tool_id, pose, timestamp=None):
+        """
+        pose: Pose o Transform medido. Devuelve la Pose si se acepta o
+        None si es atípica.
+        """
+        if not hasattr(pose, "slerp"):
+            pose = Pose.from_transform(pose)
+
+        state = self._tools.get(tool_id)
+        if state is None:
+            state = _ToolWindow(self.window)
+            self._tools[tool_id] = state
+
+        if state.last is None:
+            state.restart(pose, timestamp)
+            self.accepted += 1
+            return pose
+
+        if timestamp is None or state.timestamp is None or timestamp <= state.timestamp:
+            dt = 1.0 / self.frequency
+        else:
+            dt = timestamp - state.timestamp
+
+        if dt > self.max_gap:
+            state.restart(pose, timestamp)
+            self.reinitialized += 1
+            return pose
+
+        tx, ty, tz = pose.translation_tuple
+        lx, ly, lz = state.last.translation_tuple
+        velocity = ((tx - lx) / dt, (ty - ly) / dt, (tz - lz) / dt)
+
+        reason = self._check(state, pose, velocity, dt)
+
+        if reason is None:
+            state.accept(pose, velocity, timestamp)
+            self.accepted += 1
+            return pose
+
+        state.consecutive += 1
+        state.rejected += 1
+        self.rejected[reason] += 1
+
+        if state.consecutive >= self.max_consecutive_rejects:
+            state.restart(pose, timestamp)
+            self.reinitialized += 1
+            return pose
+
+        return None
+
+    def _check(self, state, pose, velocity, dt):
+        vx, vy, vz = velocity
+        jump = math.sqrt(vx * vx + vy * vy + vz * vz) * dt
+        if jump > self.translation_gate + self.max_speed * dt:
+            return "innovation"
+
+        # Hampel necesita unas cuantas muestras para que la mediana tenga sentido
+        if state.count >= 3:
+            window = state.changes[:state.count]
+            median = np.median(window, axis=0)
+            deviation = _MAD_SCALE * np.median(np.abs(window - median), axis=0)
+            limit = self.hampel_k * np.maximum(deviation, self.min_deviation)
+            px, py, pz = state.velocity
+            change = np.array((vx - px, vy - py, vz - pz))
+            if np.any(np.abs(change - median) > limit):
+                return "hampel"
+
+        if state.last.angle_to(pose) > self.rotation_gate + self.max_angular_speed * dt:
+            return "rotation"
+
+        return None
+
+    def last_accepted(self, tool_id):
+        state = self._tools.get(tool_id)
+        return None if state is None else state.last
+
+    def reset(self, tool_id=None):
+        if tool_id is None:
+            self._tools.clear()
+        else:
+            self._tools.pop(tool_id, None)
+
+    def stats(self):
+        return {
+            "accepted": self.accepted,
+            "rejected": dict(self.rejected),
+            "reinitialized": self.reinitialized,
+            "tools": {tool_id: state.rejected for tool_id, state in self._tools.items()},
+        }
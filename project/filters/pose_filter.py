@@ -0,0 +1,90 @@
+import math
+
+from math3d.pose import Pose
+
+
+class PoseEMAFilter:
+    """
+    Suavizado exponencial de poses por herramienta.
+
+    Traslación: EMA. Rotación: slerp del valor filtrado hacia la medición,
+    en forma cerrada sobre el cuaternio (Pose.slerp), sin objetos de SciPy.
+
+    alpha: peso del valor filtrado anterior, como en los demos (0.85).
+    translation_alpha: alpha distinto para la traslación (0 la deja pasar
+                       sin filtrar); por defecto el mismo alpha.
+    time_constant: si se da (segundos), alpha = exp(-dt / time_constant)
+                   con los timestamps de update(), igual que
+                   smooth_vector_timed.
+    translation_time_constant: con time_constant, la constante de la
+                   traslación (0 la deja pasar sin filtrar); por defecto
+                   time_constant. translation_alpha no se combina con
+                   time_constant.
+    """
+
+    def __init__(self, alpha=0.85, translation_alpha=None, time_constant=None, translation_time_constant=None):
+        if time_constant is not None and translation_alpha is not None:
+            raise ValueError("Con time_constant use translation_time_constant en lugar de translation_alpha.")
+
+        self.alpha = alpha
+        self.translation_alpha = alpha if translation_alpha is None else translation_alpha
+        self.time_constant = time_constant
+        self.translation_time_constant = (
+            time_constant if translation_time_constant is None else translation_time_constant
+        )
+
+        self._state = {}
+
+    def update(self, tool_id, pose, timestamp=None):
+        """
+        pose: Pose o Transform medido. Devuelve la Pose filtrada.
+        """
+        if not hasattr(pose, "slerp"):
+            pose = Pose.from_transform(pose)
+
+        previous = self._state.get(tool_id)
+
+        if previous is None:
+            filtered = pose
+        else:
+            previous_pose, previous_timestamp = previous
+            rotation_alpha, translation_alpha = self._alphas(previous_timestamp, timestamp)
+
+            # slerp(previous -> actual, 1 - alpha) y EMA de la traslación
+            rotated = previous_pose.slerp(pose, 1.0 - rotation_alpha)
+            if translation_alpha == rotation_alpha:
+                filtered = rotated
+            else:
+                moved = previous_pose.slerp(pose, 1.0 - translation_alpha)
+                filtered = Pose.from_quaternion_translation(
+                    rotated.quaternion_tuple, moved.translation_tuple, normalized=True
+                )
+
+        self._state[tool_id] = (filtered, timestamp)
+        return filtered
+
+    def _alphas(self, previous_timestamp, timestamp):
+        if self.time_constant is None or timestamp is None or previous_timestamp is None:
+            return self.alpha, self.translation_alpha
+
+        dt = max(timestamp - previous_timestamp, 0.0)
+        return _timed_alpha(dt, self.time_constant), _timed_alpha(dt, self.translation_time_constant)
+
+    def filtered(self, tool_id):
+        previous = self._state.get(tool_id)
+        return None if previous is None else previous[0]
+
+    def reset(self, tool_id=None):
+        """
+        Olvida el estado de una herramienta (o de todas) al perder el tracking.
+        """
+        if tool_id is None:
+            self._state.clear()
+        else:
+            self._state.pop(tool_id, None)
+
+
+def _timed_alpha(dt, time_constant):
+    if time_constant <= 0.0:
+        return 0.0
+    return math.exp(-dt / time_constant)
@@ -1,3 +1,6 @@
+import numpy as np
+
+
 def smooth_vector(marker_id, current_vec, storage, alpha):
     if marker_id in storage:
         smoothed = alpha * storage[marker_id] + (1 - alpha) * current_vec
@@ -6,3 +9,22 @@ def smooth_vector(marker_id, current_vec, storage, alpha):
 
     storage[marker_id] = smoothed
     return smoothed
+
+
+def smooth_vector_timed(marker_id, current_vec, storage, time_constant, timestamp):
+    """
+    EMA con constante de tiempo en segundos en lugar de alpha fijo.
+    alpha = exp(-dt / time_constant), así el suavizado no depende de los FPS
+    y un frame perdido (dt mayor) pesa más la medición nueva.
+    timestamp: Frame.timestamp del frame de la medición.
+    """
+    if marker_id in storage:
+        previous, last_timestamp = storage[marker_id]
+        dt = max(timestamp - last_timestamp, 0.0)
+        alpha = np.exp(-dt / time_constant)
+        smoothed = alpha * previous + (1 - alpha) * current_vec
+    else:
+        smoothed = current_vec
+
+    storage[marker_id] = (smoothed, timestamp)
+    return smoothed
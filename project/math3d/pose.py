@@ -0,0 +1,283 @@
+import math
+
+import numpy as np
+from math3d.transforms import Transform
+
+
+class Pose:
+    """
+    Pose rígida como cuaternio unitario (x, y, z, w) + traslación.
+
+    Misma convención que Transform: P_a_b lleva coordenadas de b a a y
+    P_a_c = P_a_b @ P_b_c. Los componentes se guardan como tuplas de
+    floats: componer, invertir e interpolar una sola pose no crea arrays
+    de NumPy. El Transform equivalente se construye solo si se pide y se
+    guarda.
+    """
+
+    __slots__ = ("_q", "_t", "_transform")
+
+    def __init__(self, quaternion, translation):
+        x, y, z, w = (float(v) for v in np.reshape(quaternion, 4))
+        norm = math.sqrt(x * x + y * y + z * z + w * w)
+        self._q = (x / norm, y / norm, z / norm, w / norm)
+        self._t = tuple(float(v) for v in np.reshape(translation, 3))
+        self._transform = None
+
+    @staticmethod
+    def _wrap(q, t):
+        # q ya unitario: sin validar ni normalizar
+        pose = Pose.__new__(Pose)
+        pose._q = q
+        pose._t = t
+        pose._transform = None
+        return pose
+
+    @staticmethod
+    def from_quaternion_translation(quaternion, translation, normalized=False):
+        """
+        quaternion (x, y, z, w) y translation: tuplas, listas o arrays.
+        normalized=True evita normalizar un cuaternio que ya es unitario
+        (estado de un filtro, salida de otra Pose).
+        """
+        if not normalized:
+            return Pose(quaternion, translation)
+
+        x, y, z, w = quaternion
+        tx, ty, tz = translation
+        return Pose._wrap((float(x), float(y), float(z), float(w)), (float(tx), float(ty), float(tz)))
+
+    @staticmethod
+    def identity():
+        return Pose._wrap((0.0, 0.0, 0.0, 1.0), (0.0, 0.0, 0.0))
+
+    @staticmethod
+    def from_rotation_translation(R, t):
+        q = _quat_from_matrix(np.asarray(R, dtype=np.float64).tolist())
+        return Pose._wrap(q, tuple(float(v) for v in np.reshape(t, 3)))
+
+    @staticmethod
+    def from_matrix(matrix):
+        # Una sola conversión a floats de Python para toda la matriz
+        (m00, m01, m02, tx), (m10, m11, m12, ty), (m20, m21, m22, tz), _ = (
+            np.asarray(matrix, dtype=np.float64).tolist()
+        )
+        q = _quat_from_matrix(((m00, m01, m02), (m10, m11, m12), (m20, m21, m22)))
+        return Pose._wrap(q, (tx, ty, tz))
+
+    @staticmethod
+    def from_transform(T):
+        # No se guarda T: puede ser un buffer que se reutiliza (compose_into)
+        return Pose.from_matrix(T.view())
+
+    @staticmethod
+    def from_rvec_tvec(rvec, tvec):
+        rx, ry, rz = (float(v) for v in np.reshape(rvec, 3))
+        angle = math.sqrt(rx * rx + ry * ry + rz * rz)
+
+        if angle < 1e-12:
+            q = (0.0, 0.0, 0.0, 1.0)
+        else:
+            s = math.sin(0.5 * angle) / angle
+            q = (rx * s, ry * s, rz * s, math.cos(0.5 * angle))
+
+        return Pose._wrap(q, tuple(float(v) for v in np.reshape(tvec, 3)))
+
+    # -----------------------------
+    # Componentes
+    # -----------------------------
+    @property
+    def quaternion(self):
+        return np.array(self._q)
+
+    @property
+    def translation(self):
+        return np.array(self._t)
+
+    @property
+    def quaternion_tuple(self):
+        """
+        (x, y, z, w) como floats de Python, sin crear arrays.
+        """
+        return self._q
+
+    @property
+    def translation_tuple(self):
+        return self._t
+
+    def rotation_matrix(self):
+        return np.array(_rows_from_quat(self._q))
+
+    def transform(self):
+        """
+        Transform equivalente (se calcula una vez).
+        """
+        if self._transform is None:
+            (r00, r01, r02), (r10, r11, r12), (r20, r21, r22) = _rows_from_quat(self._q)
+            tx, ty, tz = self._t
+            T = np.array([
+                [r00, r01, r02, tx],
+                [r10, r11, r12, ty],
+                [r20, r21, r22, tz],
+                [0.0, 0.0, 0.0, 1.0],
+            ])
+            self._transform = Transform._wrap(T)
+        return self._transform
+
+    def matrix(self):
+        return self.transform().matrix()
+
+    # -----------------------------
+    # Operaciones
+    # -----------------------------
+    def __matmul__(self, other):
+        return self.compose(other)
+
+    def compose(self, other):
+        q = _qmul(self._q, other._q)
+        rx, ry, rz = _qrotate(self._q, other._t)
+        tx, ty, tz = self._t
+        return Pose._wrap(q, (tx + rx, ty + ry, tz + rz))
+
+    def inverse(self):
+        x, y, z, w = self._q
+        q_inv = (-x, -y, -z, w)
+        rx, ry, rz = _qrotate(q_inv, self._t)
+        return Pose._wrap(q_inv, (-rx, -ry, -rz))
+
+    def transform_point(self, point):
+        rx, ry, rz = _qrotate(self._q, np.reshape(point, 3).tolist())
+        tx, ty, tz = self._t
+        return np.array((tx + rx, ty + ry, tz + rz))
+
+    def slerp(self, other, fraction):
+        """
+        Pose intermedia: rotación por slerp y traslación lineal.
+        fraction = 0 devuelve self, 1 devuelve other.
+        """
+        q = _qslerp(self._q, other._q, fraction)
+        ax, ay, az = self._t
+        bx, by, bz = other._t
+        t = (ax + fraction * (bx - ax), ay + fraction * (by - ay), az + fraction * (bz - az))
+        return Pose._wrap(q, t)
+
+    @staticmethod
+    def interpolate(pose0, time0, pose1, time1, time):
+        """
+        Pose en el instante time a partir de dos muestras con timestamp.
+        Fuera de [time0, time1] extrapola con la misma velocidad.
+        """
+        if time1 == time0:
+            return pose1
+        return pose0.slerp(pose1, (time - time0) / (time1 - time0))
+
+    def angle_to(self, other):
+        """
+        Ángulo (rad) de la rotación relativa entre las dos poses.
+        """
+        ax, ay, az, aw = self._q
+        bx, by, bz, bw = other._q
+        dot = abs(ax * bx + ay * by + az * bz + aw * bw)
+        return 2.0 * math.acos(min(dot, 1.0))
+
+    def __repr__(self):
+        return f"Pose(quaternion={self._q}, translation={self._t})"
+
+
+# -----------------------------
+# Cuaternios escalares (x, y, z, w)
+# -----------------------------
+# Las mismas fórmulas que math3d.quaternion, sobre tuplas: para una sola
+# pose las funciones vectorizadas cuestan 15-25 µs (150 µs from_matrix)
+# contra menos de 1 µs aquí, y Pose se usa por frame y por herramienta.
+# tests/test_pose.py comprueba que ambas versiones coinciden.
+def _qmul(a, b):
+    ax, ay, az, aw = a
+    bx, by, bz, bw = b
+    return (
+        aw * bx + ax * bw + ay * bz - az * by,
+        aw * by - ax * bz + ay * bw + az * bx,
+        aw * bz + ax * by - ay * bx + az * bw,
+        aw * bw - ax * bx - ay * by - az * bz,
+    )
+
+
+def _qrotate(q, v):
+    x, y, z, w = q
+    vx, vy, vz = v
+
+    # v' = v + 2w (u x v) + 2 u x (u x v)
+    cx = y * vz - z * vy
+    cy = z * vx - x * vz
+    cz = x * vy - y * vx
+
+    return (
+        vx + 2.0 * (w * cx + y * cz - z * cy),
+        vy + 2.0 * (w * cy + z * cx - x * cz),
+        vz + 2.0 * (w * cz + x * cy - y * cx),
+    )
+
+
+def _qslerp(a, b, fraction):
+    ax, ay, az, aw = a
+    bx, by, bz, bw = b
+    dot = ax * bx + ay * by + az * bz + aw * bw
+
+    # Camino corto
+    if dot < 0.0:
+        bx, by, bz, bw = -bx, -by, -bz, -bw
+        dot = -dot
+
+    if dot > 0.9995:
+        # Casi paralelos: lineal normalizado
+        wa, wb = 1.0 - fraction, fraction
+    else:
+        theta = math.acos(dot)
+        sin_theta = math.sin(theta)
+        wa = math.sin((1.0 - fraction) * theta) / sin_theta
+        wb = math.sin(fraction * theta) / sin_theta
+
+    x = wa * ax + wb * bx
+    y = wa * ay + wb * by
+    z = wa * az + wb * bz
+    w = wa * aw + wb * bw
+    norm = math.sqrt(x * x + y * y + z * z + w * w)
+    return (x / norm, y / norm, z / norm, w / norm)
+
+
+def _quat_from_matrix(R):
+    (m00, m01, m02), (m10, m11, m12), (m20, m21, m22) = R
+    trace = m00 + m11 + m22
+
+    # Shepperd: rama con el pivote más grande
+    if trace >= m00 and trace >= m11 and trace >= m22:
+        s = 2.0 * math.sqrt(1.0 + trace)
+        q = ((m21 - m12) / s, (m02 - m20) / s, (m10 - m01) / s, 0.25 * s)
+    elif m00 >= m11 and m00 >= m22:
+        s = 2.0 * math.sqrt(1.0 + m00 - m11 - m22)
+        q = (0.25 * s, (m01 + m10) / s, (m02 + m20) / s, (m21 - m12) / s)
+    elif m11 >= m22:
+        s = 2.0 * math.sqrt(1.0 + m11 - m00 - m22)
+        q = ((m01 + m10) / s, 0.25 * s, (m12 + m21) / s, (m02 - m20) / s)
+    else:
+        s = 2.0 * math.sqrt(1.0 + m22 - m00 - m11)
+        q = ((m02 + m20) / s, (m12 + m21) / s, 0.25 * s, (m10 - m01) / s)
+
+    x, y, z, w = q
+    norm = math.sqrt(x * x + y * y + z * z + w * w)
+    if w < 0.0:
+        norm = -norm
+    return (x / norm, y / norm, z / norm, w / norm)
+
+
+def _rows_from_quat(q):
+    x, y, z, w = q
+    xx, yy, zz = x * x, y * y, z * z
+    xy, xz, yz = x * y, x * z, y * z
+    wx, wy, wz = w * x, w * y, w * z
+
+    return (
+        (1.0 - 2.0 * (yy + zz), 2.0 * (xy - wz), 2.0 * (xz + wy)),
+        (2.0 * (xy + wz), 1.0 - 2.0 * (xx + zz), 2.0 * (yz - wx)),
+        (2.0 * (xz - wy), 2.0 * (yz + wx), 1.0 - 2.0 * (xx + yy)),
+    )
@@ -0,0 +1,181 @@
+"""
+Operaciones vectorizadas con cuaternios unitarios.
+
+Convención: escalar al final (x, y, z, w), igual que SciPy.
+Todas las funciones aceptan arrays (..., 4) / (..., 3) / (..., 3, 3).
+"""
+
+import numpy as np
+
+
+def quat_normalize(q):
+    q = np.asarray(q, dtype=np.float64)
+    return q / np.linalg.norm(q, axis=-1, keepdims=True)
+
+
+def quat_conjugate(q):
+    q = np.asarray(q, dtype=np.float64)
+    return q * np.array([-1.0, -1.0, -1.0, 1.0])
+
+
+def quat_multiply(a, b):
+    """
+    Producto de Hamilton a * b: equivale a aplicar b y luego a.
+    """
+    a = np.asarray(a, dtype=np.float64)
+    b = np.asarray(b, dtype=np.float64)
+
+    ax, ay, az, aw = a[..., 0], a[..., 1], a[..., 2], a[..., 3]
+    bx, by, bz, bw = b[..., 0], b[..., 1], b[..., 2], b[..., 3]
+
+    return np.stack([
+        aw * bx + ax * bw + ay * bz - az * by,
+        aw * by - ax * bz + ay * bw + az * bx,
+        aw * bz + ax * by - ay * bx + az * bw,
+        aw * bw - ax * bx - ay * by - az * bz,
+    ], axis=-1)
+
+
+def quat_rotate(q, v):
+    """
+    Rota vectores v (..., 3) con q (..., 4).
+    """
+    q = np.asarray(q, dtype=np.float64)
+    v = np.asarray(v, dtype=np.float64)
+
+    xyz = q[..., :3]
+    w = q[..., 3:4]
+
+    # v' = v + 2w (u x v) + 2 u x (u x v)
+    uv = np.cross(xyz, v)
+    return v + 2.0 * (w * uv + np.cross(xyz, uv))
+
+
+def quat_to_matrix(q):
+    q = np.asarray(q, dtype=np.float64)
+    x, y, z, w = q[..., 0], q[..., 1], q[..., 2], q[..., 3]
+
+    xx, yy, zz = x * x, y * y, z * z
+    xy, xz, yz = x * y, x * z, y * z
+    wx, wy, wz = w * x, w * y, w * z
+
+    R = np.empty(q.shape[:-1] + (3, 3), dtype=np.float64)
+    R[..., 0, 0] = 1.0 - 2.0 * (yy + zz)
+    R[..., 0, 1] = 2.0 * (xy - wz)
+    R[..., 0, 2] = 2.0 * (xz + wy)
+    R[..., 1, 0] = 2.0 * (xy + wz)
+    R[..., 1, 1] = 1.0 - 2.0 * (xx + zz)
+    R[..., 1, 2] = 2.0 * (yz - wx)
+    R[..., 2, 0] = 2.0 * (xz - wy)
+    R[..., 2, 1] = 2.0 * (yz + wx)
+    R[..., 2, 2] = 1.0 - 2.0 * (xx + yy)
+    return R
+
+
+def quat_from_matrix(R):
+    """
+    Método de Shepperd: en cada matriz se usa la rama con el pivote más
+    grande para no dividir entre números pequeños. Devuelve w >= 0.
+    """
+    R = np.asarray(R, dtype=np.float64)
+    shape = R.shape[:-2]
+    R = R.reshape(-1, 3, 3)
+
+    m00, m11, m22 = R[:, 0, 0], R[:, 1, 1], R[:, 2, 2]
+    trace = m00 + m11 + m22
+
+    # Pivotes: 4w², 4x², 4y², 4z² (salvo factor común)
+    pivots = np.stack([trace, m00, m11, m22], axis=-1)
+    branch = np.argmax(pivots, axis=-1)
+
+    q = np.empty((len(R), 4), dtype=np.float64)
+
+    k = branch == 0
+    s = 2.0 * np.sqrt(1.0 + trace[k])
+    q[k, 3] = 0.25 * s
+    q[k, 0] = (R[k, 2, 1] - R[k, 1, 2]) / s
+    q[k, 1] = (R[k, 0, 2] - R[k, 2, 0]) / s
+    q[k, 2] = (R[k, 1, 0] - R[k, 0, 1]) / s
+
+    k = branch == 1
+    s = 2.0 * np.sqrt(1.0 + m00[k] - m11[k] - m22[k])
+    q[k, 3] = (R[k, 2, 1] - R[k, 1, 2]) / s
+    q[k, 0] = 0.25 * s
+    q[k, 1] = (R[k, 0, 1] + R[k, 1, 0]) / s
+    q[k, 2] = (R[k, 0, 2] + R[k, 2, 0]) / s
+
+    k = branch == 2
+    s = 2.0 * np.sqrt(1.0 + m11[k] - m00[k] - m22[k])
+    q[k, 3] = (R[k, 0, 2] - R[k, 2, 0]) / s
+    q[k, 0] = (R[k, 0, 1] + R[k, 1, 0]) / s
+    q[k, 1] = 0.25 * s
+    q[k, 2] = (R[k, 1, 2] + R[k, 2, 1]) / s
+
+    k = branch == 3
+    s = 2.0 * np.sqrt(1.0 + m22[k] - m00[k] - m11[k])
+    q[k, 3] = (R[k, 1, 0] - R[k, 0, 1]) / s
+    q[k, 0] = (R[k, 0, 2] + R[k, 2, 0]) / s
+    q[k, 1] = (R[k, 1, 2] + R[k, 2, 1]) / s
+    q[k, 2] = 0.25 * s
+
+    q[q[:, 3] < 0] *= -1.0
+    q = quat_normalize(q)
+    return q.reshape(shape + (4,))
+
+
+def quat_from_rotvec(rotvec):
+    """
+    Vector de rotación (Rodrigues, eje * ángulo) a cuaternio.
+    """
+    rotvec = np.asarray(rotvec, dtype=np.float64)
+    angle = np.linalg.norm(rotvec, axis=-1, keepdims=True)
+    half = 0.5 * angle
+
+    # sin(a/2)/a con serie de Taylor cerca de 0
+    small = angle < 1e-6
+    safe = np.where(small, 1.0, angle)
+    scale = np.where(small, 0.5 - angle * angle / 48.0, np.sin(half) / safe)
+
+    return np.concatenate([rotvec * scale, np.cos(half)], axis=-1)
+
+
+def quat_to_rotvec(q):
+    q = np.asarray(q, dtype=np.float64)
+
+    # Hemisferio w >= 0: ángulo en [0, pi]
+    q = np.where(q[..., 3:4] < 0, -q, q)
+    xyz = q[..., :3]
+    w = q[..., 3:4]
+
+    sin_half = np.linalg.norm(xyz, axis=-1, keepdims=True)
+    angle = 2.0 * np.arctan2(sin_half, w)
+
+    small = sin_half < 1e-6
+    safe = np.where(small, 1.0, sin_half)
+    scale = np.where(small, 2.0 / np.where(w == 0, 1.0, w), angle / safe)
+
+    return xyz * scale
+
+
+def quat_slerp(q0, q1, t):
+    """
+    Interpolación esférica de q0 (t=0) a q1 (t=1) por el camino corto.
+    t puede ser escalar o array que haga broadcast con (...,).
+    """
+    q0 = np.asarray(q0, dtype=np.float64)
+    q1 = np.asarray(q1, dtype=np.float64)
+    t = np.asarray(t, dtype=np.float64)[..., None]
+
+    dot = np.sum(q0 * q1, axis=-1, keepdims=True)
+    q1 = np.where(dot < 0, -q1, q1)
+    dot = np.abs(dot)
+
+    # Casi paralelos: interpolación lineal normalizada
+    near = dot > 0.9995
+    theta = np.arccos(np.clip(dot, -1.0, 1.0))
+    sin_theta = np.where(near, 1.0, np.sin(theta))
+
+    w0 = np.where(near, 1.0 - t, np.sin((1.0 - t) * theta) / sin_theta)
+    w1 = np.where(near, t, np.sin(t * theta) / sin_theta)
+
+    return quat_normalize(w0 * q0 + w1 * q1)
@@ -1,5 +1,11 @@
 import numpy as np
 import cv2
+from math3d.quaternion import (
+    quat_from_matrix,
+    quat_from_rotvec,
+    quat_to_matrix,
+    quat_to_rotvec,
+)
 
 
 class Transform:
@@ -8,16 +14,32 @@ class Transform:
     T_a_b transforma coordenadas expresadas en b hacia a.
     Vectores columna.
     Composición: T_a_c = T_a_b @ T_b_c
+
+    Las operaciones normales devuelven objetos/arrays nuevos. Para el lazo
+    de tracking existen variantes que escriben en memoria ya reservada:
+    inverse_into, compose_into y el parámetro out= de rotation/translation/
+    matrix. view() devuelve la matriz interna de solo lectura, sin copiar.
     """
 
-    def __init__(self, matrix: np.ndarray):
+    __slots__ = ("_T",)
+
+    def __init__(self, matrix: np.ndarray, copy=True):
         if matrix.shape != (4, 4):
             raise ValueError("Matrix must be 4x4.")
-        self._T = matrix.astype(np.float64)
+        if copy or matrix.dtype != np.float64:
+            matrix = matrix.astype(np.float64)
+        self._T = matrix
+
+    @staticmethod
+    def _wrap(matrix):
+        # Matriz float64 recién creada: no hace falta copiarla
+        T = Transform.__new__(Transform)
+        T._T = matrix
+        return T
 
     @staticmethod
     def identity():
-        return Transform(np.eye(4, dtype=np.float64))
+        return Transform._wrap(np.eye(4, dtype=np.float64))
 
     @staticmethod
     def from_rvec_tvec(rvec, tvec):
@@ -25,7 +47,7 @@ class Transform:
         T = np.eye(4, dtype=np.float64)
         T[:3, :3] = R
         T[:3, 3] = tvec.reshape(3)
-        return Transform(T)
+        return Transform._wrap(T)
 
     @staticmethod
     def from_rotation_translation(R: np.ndarray, t: np.ndarray):
@@ -37,29 +59,186 @@ class Transform:
         T = np.eye(4, dtype=np.float64)
         T[:3, :3] = R
         T[:3, 3] = t.reshape(3)
-        return Transform(T)
+        return Transform._wrap(T)
 
     def inverse(self):
-        R = self._T[:3, :3]
-        t = self._T[:3, 3]
+        return self.inverse_into(Transform.identity())
 
-        R_inv = R.T
-        t_inv = -R_inv @ t
+    def inverse_into(self, out):
+        """
+        Escribe la inversa en out (un Transform) y lo devuelve.
+        """
+        T = self._T
+        O = out._T
 
-        T_inv = np.eye(4, dtype=np.float64)
-        T_inv[:3, :3] = R_inv
-        T_inv[:3, 3] = t_inv
+        # -R^T t antes de escribir R^T: funciona también si out es self
+        t_inv = T[:3, 3] @ T[:3, :3]
+        O[:3, :3] = T[:3, :3].T
+        np.negative(t_inv, out=O[:3, 3])
+        O[3, :3] = 0.0
+        O[3, 3] = 1.0
+        return out
 
-        return Transform(T_inv)
+    def compose_into(self, other, out):
+        """
+        out = self @ other, sin reservar memoria. Devuelve out.
+        """
+        np.matmul(self._T, other._T, out=out._T)
+        return out
 
     def __matmul__(self, other: "Transform"):
-        return Transform(self._T @ other._T)
+        if other._T.ndim == 3:
+            # Transform @ TransformBatch
+            return TransformBatch(self._T @ other._T)
+        return Transform._wrap(self._T @ other._T)
+
+    def view(self):
+        """
+        Matriz 4x4 interna sin copiar (solo lectura).
+        """
+        view = self._T.view()
+        view.flags.writeable = False
+        return view
+
+    def rotation(self, out=None):
+        if out is None:
+            return self._T[:3, :3].copy()
+        out[...] = self._T[:3, :3]
+        return out
+
+    def translation(self, out=None):
+        if out is None:
+            return self._T[:3, 3].copy()
+        out[...] = self._T[:3, 3]
+        return out
+
+    def matrix(self, out=None):
+        if out is None:
+            return self._T.copy()
+        out[...] = self._T
+        return out
+
+
+class TransformBatch:
+    """
+    N transformaciones en un solo array (N, 4, 4), misma convención que
+    Transform. Composición, inversa y conversiones se hacen con una sola
+    llamada de NumPy para todo el lote.
+    """
+
+    def __init__(self, matrices: np.ndarray):
+        matrices = np.asarray(matrices, dtype=np.float64)
+        if matrices.ndim != 3 or matrices.shape[1:] != (4, 4):
+            raise ValueError("Matrices must be Nx4x4.")
+        self._T = matrices
+
+    @staticmethod
+    def identity(n):
+        return TransformBatch(np.tile(np.eye(4, dtype=np.float64), (n, 1, 1)))
+
+    @staticmethod
+    def from_transforms(transforms):
+        transforms = list(transforms)
+        if not transforms:
+            return TransformBatch(np.empty((0, 4, 4), dtype=np.float64))
+        return TransformBatch(np.stack([T._T for T in transforms]))
+
+    @staticmethod
+    def from_rotation_translation(R: np.ndarray, t: np.ndarray):
+        R = np.asarray(R, dtype=np.float64)
+        t = np.asarray(t, dtype=np.float64)
+        if R.ndim != 3 or R.shape[1:] != (3, 3):
+            raise ValueError("Rotations must be Nx3x3.")
+
+        t = t.reshape(len(R), 3)
+        T = np.zeros((len(R), 4, 4), dtype=np.float64)
+        T[:, :3, :3] = R
+        T[:, :3, 3] = t
+        T[:, 3, 3] = 1.0
+        return TransformBatch(T)
+
+    @staticmethod
+    def from_rvecs_tvecs(rvecs, tvecs):
+        """
+        rvecs, tvecs: (N, 3) o (N, 1, 3) como los devuelve OpenCV.
+        """
+        rvecs = np.asarray(rvecs, dtype=np.float64).reshape(-1, 3)
+        R = quat_to_matrix(quat_from_rotvec(rvecs))
+        return TransformBatch.from_rotation_translation(R, tvecs)
+
+    @staticmethod
+    def from_quaternions(quaternions, translations):
+        """
+        quaternions: (N, 4) en orden (x, y, z, w)
+        """
+        R = quat_to_matrix(np.asarray(quaternions, dtype=np.float64).reshape(-1, 4))
+        return TransformBatch.from_rotation_translation(R, translations)
+
+    def __len__(self):
+        return len(self._T)
+
+    def __getitem__(self, index):
+        """
+        Un índice entero devuelve un Transform; un slice, una máscara o un
+        array de índices devuelven otro TransformBatch.
+        """
+        if isinstance(index, (int, np.integer)):
+            return Transform(self._T[index])
+        return TransformBatch(self._T[index])
+
+    def __iter__(self):
+        for k in range(len(self._T)):
+            yield Transform(self._T[k])
+
+    def inverse(self):
+        R_inv = self._T[:, :3, :3].transpose(0, 2, 1)
+        t = self._T[:, :3, 3]
+
+        T_inv = np.zeros_like(self._T)
+        T_inv[:, :3, :3] = R_inv
+        T_inv[:, :3, 3] = -np.einsum("nij,nj->ni", R_inv, t)
+        T_inv[:, 3, 3] = 1.0
+
+        return TransformBatch(T_inv)
+
+    def __matmul__(self, other):
+        """
+        Lote @ lote (uno a uno) o lote @ Transform (el mismo a todos).
+        """
+        return TransformBatch(self._T @ other._T)
+
+    def transform_points(self, points):
+        """
+        points (M, 3): se aplican todas las transformaciones -> (N, M, 3)
+        points (N, M, 3): cada transformación a su grupo -> (N, M, 3)
+        """
+        points = np.asarray(points, dtype=np.float64)
+        R = self._T[:, :3, :3]
+        t = self._T[:, :3, 3]
+
+        if points.ndim == 2:
+            points = points[None]
+
+        return points @ R.transpose(0, 2, 1) + t[:, None, :]
+
+    def to_rvecs_tvecs(self):
+        rvecs = quat_to_rotvec(quat_from_matrix(self._T[:, :3, :3]))
+        return rvecs, self.translations()
+
+    def to_quaternions(self):
+        """
+        Devuelve (quaternions (N, 4) en orden (x, y, z, w), translations (N, 3)).
+        """
+        return quat_from_matrix(self._T[:, :3, :3]), self.translations()
+
+    def to_transforms(self):
+        return list(self)
 
-    def rotation(self):
-        return self._T[:3, :3].copy()
+    def rotations(self):
+        return self._T[:, :3, :3].copy()
 
-    def translation(self):
-        return self._T[:3, 3].copy()
+    def translations(self):
+        return self._T[:, :3, 3].copy()
 
-    def matrix(self):
-        return self._T.copy()
\ No newline at end of file
+    def matrices(self):
+        return self._T.copy()
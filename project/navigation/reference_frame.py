@@ -1,3 +1,6 @@
+from math3d.transforms import TransformBatch
+
+
 class ReferenceFrame:
     """
     Define un sistema de referencia basado en un marcador base fijo.
@@ -19,11 +22,9 @@ class ReferenceFrame:
 
         T_base_cam = T_cam_base.inverse()
 
-        relative_transforms = {}
-
-        for marker_id, T_cam_marker in transforms_dict.items():
-            T_base_marker = T_base_cam @ T_cam_marker
-
-            relative_transforms[marker_id] = T_base_marker
+        # Todas las composiciones en una sola multiplicación (N, 4, 4)
+        marker_ids = list(transforms_dict.keys())
+        T_cam_markers = TransformBatch.from_transforms(transforms_dict.values())
+        T_base_markers = T_base_cam @ T_cam_markers
 
-        return relative_transforms
+        return dict(zip(marker_ids, T_base_markers))
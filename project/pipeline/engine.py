@@ -0,0 +1,303 @@
+import threading
+import time
+from collections import deque
+
+
+_CLOSED = object()
+
+
+class BoundedQueue:
+    """
+    Cola acotada entre etapas.
+    drop_oldest=True descarta el elemento más viejo cuando está llena
+    (latencia acotada); con False el productor espera (contrapresión).
+    """
+
+    def __init__(self, maxsize=2, drop_oldest=False):
+        self.maxsize = maxsize
+        self.drop_oldest = drop_oldest
+        self.dropped = 0
+
+        self._items = deque()
+        self._cond = threading.Condition()
+        self._closed = False
+
+    def put(self, item):
+        with self._cond:
+            while len(self._items) >= self.maxsize and not self._closed:
+                if self.drop_oldest:
+                    self._items.popleft()
+                    self.dropped += 1
+                else:
+                    self._cond.wait()
+
+            if self._closed:
+                return
+
+            self._items.append(item)
+            self._cond.notify_all()
+
+    def get(self, timeout=None):
+        """
+        Devuelve el siguiente elemento, None si venció el timeout o
+        _CLOSED si la cola se cerró.
+        """
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._items or self._closed, timeout):
+                return None
+
+            if not self._items:
+                return _CLOSED
+
+            item = self._items.popleft()
+            self._cond.notify_all()
+            return item
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def __len__(self):
+        return len(self._items)
+
+
+class StageStats:
+    def __init__(self):
+        self.processed = 0
+        self.busy_time = 0.0
+        self.started = time.monotonic()
+
+    def as_dict(self, queue):
+        elapsed = max(time.monotonic() - self.started, 1e-9)
+        return {
+            "processed": self.processed,
+            "dropped": queue.dropped if queue is not None else 0,
+            "queued": len(queue) if queue is not None else 0,
+            "mean_ms": 1000.0 * self.busy_time / self.processed if self.processed else 0.0,
+            "fps": self.processed / elapsed,
+        }
+
+
+class Pipeline:
+    """
+    Motor de etapas: una fuente y una cadena de etapas, cada una en su
+    propio hilo y unidas por colas acotadas. OpenCV libera el GIL, así que
+    captura, detección y envío se solapan.
+
+    Cada etapa recibe el elemento de la anterior y devuelve el que pasa a la
+    siguiente; devolver None descarta el elemento. La etapa de display (si
+    existe) recibe la salida de la última etapa por una cola de un solo
+    lugar que descarta frames, y corre en el hilo que llama a run() porque
+    cv2.imshow debe ejecutarse en el hilo principal.
+
+    Si la fuente es Camera, usarla con threaded=False: el hilo de la fuente
+    ya hace de grabber y cada frame debe ser un array nuevo.
+
+    Si la fuente lanza EOFError (fin de ReplayCamera), las etapas terminan
+    lo que tienen encolado y el pipeline se detiene solo (running pasa a
+    False).
+    """
+
+    def __init__(self, idle_wait=0.001):
+        self.idle_wait = idle_wait
+        self._source = None
+        self._stages = []
+        self._display = None
+        self._threads = []
+
+        self._stop_event = threading.Event()
+        self.error = None
+
+    # -----------------------------
+    # Construcción
+    # -----------------------------
+    def source(self, name, read):
+        """
+        read(): devuelve el siguiente elemento (bloqueante) o None;
+        EOFError indica fin de la fuente. Tras un None la fuente se vuelve
+        a leer después de idle_wait segundos.
+        """
+        self._source = (name, read, None, StageStats())
+        return self
+
+    def stage(self, name, func, queue_size=2, drop_oldest=None):
+        """
+        queue_size/drop_oldest describen la cola de entrada de la etapa.
+        Por defecto la primera etapa descarta el más viejo para que una
+        cámara nunca acumule frames, y las demás aplican contrapresión.
+        drop_oldest=False en la primera etapa frena a la fuente en lugar de
+        descartar (replay a máxima velocidad sin perder frames).
+        """
+        if drop_oldest is None:
+            drop_oldest = not self._stages
+        self._stages.append((name, func, BoundedQueue(queue_size, drop_oldest), StageStats()))
+        return self
+
+    def display(self, name, func):
+        """
+        func(item): dibuja/muestra; devolver False detiene el pipeline.
+        """
+        self._display = (name, func, BoundedQueue(1, drop_oldest=True), StageStats())
+        return self
+
+    # -----------------------------
+    # Ejecución
+    # -----------------------------
+    def start(self):
+        if self._source is None:
+            raise RuntimeError("El pipeline necesita una fuente.")
+
+        self._stop_event.clear()
+
+        # Cada elemento escribe en la cola de entrada del siguiente
+        name, read, _, stats = self._source
+        self._spawn(name, self._source_loop, read, self._next_queue(-1), stats)
+
+        for i, (name, func, in_queue, stats) in enumerate(self._stages):
+            self._spawn(name, self._stage_loop, func, in_queue, self._next_queue(i), stats)
+
+        return self
+
+    def run(self, poll_timeout=0.05):
+        """
+        Arranca (si hace falta) y bloquea hasta stop(); atiende la etapa de
+        display en este hilo.
+        """
+        if not self._threads:
+            self.start()
+
+        try:
+            while not self._stop_event.is_set():
+                if self._display is None:
+                    self._stop_event.wait(poll_timeout)
+                    continue
+
+                _, func, queue, stats = self._display
+                item = queue.get(timeout=poll_timeout)
+                if item is _CLOSED:
+                    break
+                if item is None:
+                    continue
+
+                t0 = time.perf_counter()
+                keep_running = func(item)
+                stats.busy_time += time.perf_counter() - t0
+                stats.processed += 1
+
+                if keep_running is False:
+                    break
+        finally:
+            self.stop()
+
+        if self.error is not None:
+            raise self.error
+
+    def stop(self, timeout=2.0):
+        self._stop_event.set()
+
+        for queue in self._all_queues():
+            queue.close()
+
+        for thread in self._threads:
+            if thread is not threading.current_thread():
+                thread.join(timeout=timeout)
+        self._threads = []
+
+    @property
+    def running(self):
+        return bool(self._threads) and not self._stop_event.is_set()
+
+    def stats(self):
+        """
+        {etapa: {processed, dropped, queued, mean_ms, fps}}; dropped y queued
+        se refieren a la cola de entrada de cada etapa.
+        """
+        result = {}
+
+        for name, _, queue, stats in self._elements():
+            result[name] = stats.as_dict(queue)
+
+        return result
+
+    # -----------------------------
+    # Hilos
+    # -----------------------------
+    def _elements(self):
+        elements = []
+        if self._source is not None:
+            elements.append(self._source)
+        elements.extend(self._stages)
+        if self._display is not None:
+            elements.append(self._display)
+        return elements
+
+    def _next_queue(self, index):
+        # index = -1 es la fuente
+        if index + 1 < len(self._stages):
+            return self._stages[index + 1][2]
+        if self._display is not None:
+            return self._display[2]
+        return None
+
+    def _all_queues(self):
+        return [queue for _, _, queue, _ in self._elements() if queue is not None]
+
+    def _spawn(self, name, target, *args):
+        thread = threading.Thread(target=self._guard, args=(target, *args), name=name, daemon=True)
+        self._threads.append(thread)
+        thread.start()
+
+    def _guard(self, target, *args):
+        try:
+            target(*args)
+        except Exception as e:
+            if self.error is None:
+                self.error = e
+            self._stop_event.set()
+            for queue in self._all_queues():
+                queue.close()
+
+    def _source_loop(self, read, out_queue, stats):
+        while not self._stop_event.is_set():
+            t0 = time.perf_counter()
+            try:
+                item = read()
+            except EOFError:
+                self._finish(out_queue)
+                return
+            stats.busy_time += time.perf_counter() - t0
+
+            if item is None:
+                # Sin elemento: esperar un poco en lugar de girar en vacío
+                self._stop_event.wait(self.idle_wait)
+                continue
+
+            stats.processed += 1
+            if out_queue is not None:
+                out_queue.put(item)
+
+    def _finish(self, out_queue):
+        # Fin de la fuente: se cierra la cola siguiente para que la etapa
+        # vacíe lo pendiente; el último elemento detiene el pipeline
+        if out_queue is not None:
+            out_queue.close()
+        else:
+            self._stop_event.set()
+
+    def _stage_loop(self, func, in_queue, out_queue, stats):
+        while not self._stop_event.is_set():
+            item = in_queue.get(timeout=0.1)
+            if item is None:
+                continue
+            if item is _CLOSED:
+                self._finish(out_queue)
+                break
+
+            t0 = time.perf_counter()
+            result = func(item)
+            stats.busy_time += time.perf_counter() - t0
+            stats.processed += 1
+
+            if result is not None and out_queue is not None:
+                out_queue.put(result)
@@ -0,0 +1,185 @@
+import time
+from dataclasses import dataclass
+
+import numpy as np
+from diagnostics.profiler import profiler
+from filters.pose_filter import PoseEMAFilter
+from math3d.transforms import Transform
+
+
+@dataclass(slots=True)
+class NavigationState:
+    """
+    Elemento que recorre el pipeline de navegación.
+    reference: T_camera_reference
+    pointer:   T_reference_pointer (con tip offset), filtrado tras la etapa filter
+    rejected:  el puntero se detectó pero la etapa outliers lo descartó
+    """
+
+    frame: object
+    result: object = None
+    reference: Transform = None
+    pointer: Transform = None
+    rejected: bool = False
+
+
+class DetectStage:
+    def __init__(self, tracker):
+        self.tracker = tracker
+
+    def __call__(self, frame):
+        return NavigationState(frame, self.tracker.detect_frame(frame))
+
+
+class RelativePoseStage:
+    """
+    Calcula la punta del instrumento relativa al marcador de referencia.
+    """
+
+    def __init__(self, tip_offset, reference_id=0):
+        self.reference_id = reference_id
+        self.T_tip = Transform.from_rotation_translation(
+            np.eye(3), np.asarray(tip_offset, dtype=np.float64)
+        )
+
+        # Intermedios reutilizados entre frames; solo state.pointer es nuevo
+        self._T_reference_camera = Transform.identity()
+        self._T_camera_pointer = Transform.identity()
+
+    def __call__(self, state):
+        transforms = state.result.transforms
+
+        if self.reference_id in transforms:
+            state.reference = transforms[self.reference_id]
+
+            if "instrument" in transforms:
+                transforms["instrument"].compose_into(self.T_tip, self._T_camera_pointer)
+                state.reference.inverse_into(self._T_reference_camera)
+                state.pointer = self._T_reference_camera @ self._T_camera_pointer
+
+        return state
+
+
+class RecordStage:
+    """
+    Graba detecciones, poses y (según el SessionRecorder) la imagen.
+    """
+
+    def __init__(self, recorder):
+        self.recorder = recorder
+
+    def __call__(self, state):
+        self.recorder.record(state.result, state.frame.image)
+        return state
+
+
+class StabilityAuditStage:
+    """
+    Registra el puntero (T_reference_pointer) en un StabilityAuditor.
+    """
+
+    def __init__(self, auditor):
+        self.auditor = auditor
+
+    def __call__(self, state):
+        if state.pointer is not None:
+            self.auditor.add_transform("Pointer", state.pointer)
+        return state
+
+
+class OutlierRejectionStage:
+    """
+    Descarta poses atípicas del puntero antes del filtro (PoseOutlierRejector).
+    Un puntero descartado queda como None con rejected=True.
+    """
+
+    def __init__(self, rejector):
+        self.rejector = rejector
+
+    def __call__(self, state):
+        if state.pointer is not None:
+            t0 = profiler.start()
+            accepted = self.rejector.update("Pointer", state.pointer, state.frame.timestamp)
+            profiler.stop("outliers.update", t0)
+
+            if accepted is None:
+                state.pointer = None
+                state.rejected = True
+                profiler.count("outliers.rejected")
+        return state
+
+
+class PoseFilterStage:
+    """
+    EMA en traslación y SLERP en rotación; se reinicia al perder el tracking.
+    pose_filter: otro filtro con la misma interfaz (p. ej. OneEuroPoseFilter).
+    Si el filtro tiene coast() (PoseKalmanFilter), al perder el puntero se
+    sigue enviando la pose predicha durante su coast_time. Si el puntero
+    se descartó por atípico, los demás filtros mantienen la última pose
+    filtrada en lugar de reiniciarse.
+    """
+
+    def __init__(self, alpha=0.85, pose_filter=None):
+        self.filter = PoseEMAFilter(alpha) if pose_filter is None else pose_filter
+
+    def __call__(self, state):
+        if state.pointer is None:
+            coast = getattr(self.filter, "coast", None)
+            if coast is not None:
+                predicted = coast("Pointer", state.frame.timestamp)
+            elif state.rejected:
+                predicted = self.filter.filtered("Pointer")
+            else:
+                predicted = None
+
+            if predicted is None:
+                self.filter.reset("Pointer")
+            else:
+                state.pointer = predicted.transform()
+            return state
+
+        t0 = profiler.start()
+        filtered = self.filter.update("Pointer", state.pointer, state.frame.timestamp)
+        state.pointer = filtered.transform()
+        profiler.stop("filter.update", t0)
+        return state
+
+
+class SendStage:
+    """
+    predictor: filtro con predict(tool_id, timestamp) (PoseKalmanFilter);
+    si se da, el puntero se extrapola al instante de envío para compensar
+    la latencia de captura y procesamiento, y el timestamp enviado es ese
+    instante.
+    """
+
+    def __init__(self, igtl, predictor=None):
+        self.igtl = igtl
+        self.predictor = predictor
+
+    def __call__(self, state):
+        frame = state.frame
+        transforms = {}
+        timestamp = frame.wall_time
+
+        if state.reference is not None:
+            transforms["Reference"] = state.reference.view()
+
+        if state.pointer is not None:
+            transforms["Pointer"] = state.pointer.view()
+
+            if self.predictor is not None:
+                now = time.monotonic()
+                predicted = self.predictor.predict("Pointer", now)
+                if predicted is not None:
+                    transforms["Pointer"] = predicted.transform().view()
+                    timestamp = frame.wall_time + (now - frame.timestamp)
+
+        if transforms:
+            self.igtl.send_transforms(
+                transforms,
+                timestamp=timestamp,
+                sequence=frame.sequence,
+            )
+
+        return state
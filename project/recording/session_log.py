@@ -0,0 +1,437 @@
+"""
+Log de sesión reproducible: detecciones, poses y (opcional) frames.
+
+Un directorio por sesión:
+    session.json          metadatos (modo de frames, intrínsecos, ...)
+    chunk_00000.npz       chunk_frames frames: secuencia, timestamps,
+                          esquinas, ids, poses y, en modo "jpeg", las
+                          imágenes codificadas
+    frames_00000.npy      en modo "raw": imágenes del chunk, escritas en
+                          un segmento de NumPy mapeado a memoria
+
+Los datos de tamaño variable (marcadores y poses por frame) se guardan
+planos con offsets: los del frame k están en [offsets[k], offsets[k+1]).
+"""
+
+import json
+import os
+import queue
+import threading
+import time
+from dataclasses import dataclass
+
+import cv2
+import numpy as np
+from math3d.quaternion import quat_from_matrix
+from math3d.transforms import Transform
+
+FORMAT_VERSION = 1
+FRAME_MODES = ("none", "jpeg", "raw")
+
+
+@dataclass(slots=True)
+class RecordedFrame:
+    """
+    Un frame leído de un log. corners e ids tienen el formato de
+    cv2.aruco.detectMarkers; transforms es {tool_id: Transform}.
+    image es None si la sesión se grabó sin frames.
+    """
+
+    sequence: int
+    timestamp: float
+    wall_time: float
+    corners: tuple
+    ids: object
+    transforms: dict
+    image: np.ndarray = None
+
+
+class SessionRecorder:
+    """
+    Graba TrackingResult (y opcionalmente la imagen) sin frenar el tracking.
+
+    record() solo copia los datos del frame y los deja en una cola; un hilo
+    de fondo codifica y escribe los chunks. Si el disco no da abasto, la
+    cola se llena y los frames se descartan (contador dropped) en lugar de
+    bloquear al que llama.
+
+    frames: "none", "jpeg" (cv2.imencode en el hilo de fondo) o "raw"
+    metadata: dict serializable a JSON que se guarda en session.json
+    """
+
+    def __init__(
+        self,
+        path,
+        frames="none",
+        jpeg_quality=90,
+        chunk_frames=300,
+        queue_size=64,
+        metadata=None,
+    ):
+        if frames not in FRAME_MODES:
+            raise ValueError(f"frames debe ser uno de {FRAME_MODES}.")
+
+        self.path = str(path)
+        self.frames = frames
+        self.jpeg_quality = jpeg_quality
+        self.chunk_frames = chunk_frames
+
+        os.makedirs(self.path, exist_ok=True)
+
+        info = {
+            "version": FORMAT_VERSION,
+            "created": time.time(),
+            "frames": frames,
+            "chunk_frames": chunk_frames,
+            "metadata": metadata or {},
+        }
+        with open(os.path.join(self.path, "session.json"), "w", encoding="utf-8") as f:
+            json.dump(info, f, indent=2)
+
+        self.recorded = 0
+        self.dropped = 0
+        self.written = 0
+        self.chunks = 0
+        self._error = None
+
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._chunk = None
+        self._thread = threading.Thread(target=self._write_loop, daemon=True)
+        self._thread.start()
+
+    # -----------------------------
+    # Hilo del tracking
+    # -----------------------------
+    def record(self, result, image=None):
+        """
+        result: TrackingResult (detect_frame). image: imagen BGR del frame;
+        se copia, así puede venir de un buffer que la cámara reutiliza.
+        Devuelve False si el frame se descartó.
+        """
+        if self._error is not None:
+            raise self._error
+
+        ids = result.ids
+        count = 0 if ids is None else len(ids)
+        corners = (
+            np.concatenate(result.corners).reshape(count, 4, 2).astype(np.float32)
+            if count
+            else np.zeros((0, 4, 2), dtype=np.float32)
+        )
+
+        entry = (
+            result.sequence,
+            result.timestamp,
+            result.wall_time,
+            corners,
+            np.zeros(0, dtype=np.int32) if ids is None else np.asarray(ids, dtype=np.int32).reshape(-1),
+            [(str(tool_id), T.matrix()) for tool_id, T in result.transforms.items()],
+            None if image is None or self.frames == "none" else image.copy(),
+        )
+
+        try:
+            self._queue.put_nowait(entry)
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+        self.recorded += 1
+        return True
+
+    def close(self):
+        """
+        Escribe lo pendiente (incluido el último chunk incompleto).
+        """
+        if self._thread is None:
+            return
+
+        # Si el hilo de escritura murió con la cola llena, put() no volvería
+        while self._error is None and self._thread.is_alive():
+            try:
+                self._queue.put(None, timeout=0.1)
+                break
+            except queue.Full:
+                pass
+
+        self._thread.join()
+        self._thread = None
+
+        if self._error is not None:
+            raise self._error
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def stats(self):
+        return {
+            "recorded": self.recorded,
+            "written": self.written,
+            "dropped": self.dropped,
+            "chunks": self.chunks,
+            "queue_depth": self._queue.qsize(),
+        }
+
+    # -----------------------------
+    # Hilo de escritura
+    # -----------------------------
+    def _write_loop(self):
+        try:
+            while True:
+                entry = self._queue.get()
+                if entry is None:
+                    break
+                self._append(entry)
+
+            if self._chunk is not None:
+                self._flush()
+        except Exception as e:
+            self._error = e
+
+    def _append(self, entry):
+        sequence, timestamp, wall_time, corners, ids, poses, image = entry
+
+        if self._chunk is None:
+            self._chunk = _ChunkBuffer()
+
+        chunk = self._chunk
+        index = len(chunk.sequence)
+        chunk.add(sequence, timestamp, wall_time, corners, ids, poses)
+
+        if self.frames == "jpeg":
+            if image is None:
+                chunk.jpeg.append(b"")
+            else:
+                ok, data = cv2.imencode(".jpg", image, [cv2.IMWRITE_JPEG_QUALITY, self.jpeg_quality])
+                chunk.jpeg.append(data.tobytes() if ok else b"")
+
+        elif self.frames == "raw" and image is not None:
+            if chunk.raw is None:
+                chunk.raw = np.lib.format.open_memmap(
+                    self._chunk_path("frames", ".npy"),
+                    mode="w+",
+                    dtype=image.dtype,
+                    shape=(self.chunk_frames,) + image.shape,
+                )
+            chunk.raw[index] = image
+            chunk.has_image.append(True)
+        elif self.frames == "raw":
+            chunk.has_image.append(False)
+
+        self.written += 1
+        if index + 1 >= self.chunk_frames:
+            self._flush()
+
+    def _flush(self):
+        chunk = self._chunk
+        self._chunk = None
+
+        arrays = chunk.arrays()
+
+        if self.frames == "jpeg":
+            arrays["jpeg_offsets"] = _offsets([len(data) for data in chunk.jpeg])
+            arrays["jpeg_data"] = np.frombuffer(b"".join(chunk.jpeg), dtype=np.uint8)
+
+        elif self.frames == "raw":
+            arrays["has_image"] = np.array(chunk.has_image, dtype=bool)
+            if chunk.raw is not None:
+                chunk.raw.flush()
+                chunk.raw = None
+
+        np.savez(self._chunk_path("chunk", ".npz"), **arrays)
+        self.chunks += 1
+
+    def _chunk_path(self, prefix, extension):
+        return os.path.join(self.path, f"{prefix}_{self.chunks:05d}{extension}")
+
+
+class _ChunkBuffer:
+    __slots__ = (
+        "sequence",
+        "timestamp",
+        "wall_time",
+        "corners",
+        "ids",
+        "marker_counts",
+        "pose_ids",
+        "pose_matrices",
+        "pose_counts",
+        "jpeg",
+        "raw",
+        "has_image",
+    )
+
+    def __init__(self):
+        self.sequence = []
+        self.timestamp = []
+        self.wall_time = []
+        self.corners = []
+        self.ids = []
+        self.marker_counts = []
+        self.pose_ids = []
+        self.pose_matrices = []
+        self.pose_counts = []
+        self.jpeg = []
+        self.raw = None
+        self.has_image = []
+
+    def add(self, sequence, timestamp, wall_time, corners, ids, poses):
+        self.sequence.append(sequence)
+        self.timestamp.append(timestamp)
+        self.wall_time.append(wall_time)
+        self.corners.append(corners)
+        self.ids.append(ids)
+        self.marker_counts.append(len(ids))
+        self.pose_counts.append(len(poses))
+        for tool_id, matrix in poses:
+            self.pose_ids.append(tool_id)
+            self.pose_matrices.append(matrix)
+
+    def arrays(self):
+        return {
+            "sequence": np.array(self.sequence, dtype=np.int64),
+            "timestamp": np.array(self.timestamp, dtype=np.float64),
+            "wall_time": np.array(self.wall_time, dtype=np.float64),
+            "marker_offsets": _offsets(self.marker_counts),
+            "corners": np.concatenate(self.corners).astype(np.float32),
+            "ids": np.concatenate(self.ids).astype(np.int32),
+            "pose_offsets": _offsets(self.pose_counts),
+            "pose_ids": np.array(self.pose_ids, dtype=str),
+            "pose_matrices": (
+                np.array(self.pose_matrices, dtype=np.float64)
+                if self.pose_matrices
+                else np.zeros((0, 4, 4))
+            ),
+        }
+
+
+class SessionReader:
+    """
+    Lee un log de SessionRecorder frame a frame (carga un chunk a la vez).
+    """
+
+    def __init__(self, path):
+        self.path = str(path)
+
+        with open(os.path.join(self.path, "session.json"), encoding="utf-8") as f:
+            self.info = json.load(f)
+
+        self.frames = self.info["frames"]
+        self.metadata = self.info.get("metadata", {})
+
+        self._chunk_files = sorted(
+            name for name in os.listdir(self.path) if name.startswith("chunk_") and name.endswith(".npz")
+        )
+
+        # Frames por chunk sin cargar las imágenes (np.load es perezoso)
+        self._starts = [0]
+        for name in self._chunk_files:
+            with np.load(os.path.join(self.path, name)) as data:
+                self._starts.append(self._starts[-1] + len(data["sequence"]))
+
+        self._loaded_index = None
+        self._loaded = None
+        self._raw = None
+
+    def __len__(self):
+        return self._starts[-1]
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+
+        chunk_index = int(np.searchsorted(self._starts, index, side="right")) - 1
+        data = self._load(chunk_index)
+        k = index - self._starts[chunk_index]
+
+        m0, m1 = data["marker_offsets"][k], data["marker_offsets"][k + 1]
+        corners = tuple(c.reshape(1, 4, 2) for c in data["corners"][m0:m1])
+        ids = data["ids"][m0:m1].reshape(-1, 1) if m1 > m0 else None
+
+        p0, p1 = data["pose_offsets"][k], data["pose_offsets"][k + 1]
+        transforms = {
+            _tool_key(tool_id): Transform(matrix)
+            for tool_id, matrix in zip(data["pose_ids"][p0:p1], data["pose_matrices"][p0:p1])
+        }
+
+        return RecordedFrame(
+            int(data["sequence"][k]),
+            float(data["timestamp"][k]),
+            float(data["wall_time"][k]),
+            corners,
+            ids,
+            transforms,
+            self._image(data, k),
+        )
+
+    def pose_stream(self, tool_id):
+        """
+        (timestamps, translations, quaternions) de una herramienta en los
+        frames donde aparece; el formato de filters.evaluation.
+        """
+        key = str(tool_id)
+        timestamps = []
+        matrices = []
+
+        for chunk_index in range(len(self._chunk_files)):
+            with np.load(os.path.join(self.path, self._chunk_files[chunk_index])) as data:
+                offsets = data["pose_offsets"]
+                frame_of_pose = np.repeat(np.arange(len(offsets) - 1), np.diff(offsets))
+                selected = data["pose_ids"] == key
+                timestamps.append(data["timestamp"][frame_of_pose[selected]])
+                matrices.append(data["pose_matrices"][selected])
+
+        if not timestamps:
+            return np.zeros(0), np.zeros((0, 3)), np.zeros((0, 4))
+
+        matrices = np.concatenate(matrices)
+        return (
+            np.concatenate(timestamps),
+            matrices[:, :3, 3].copy(),
+            quat_from_matrix(matrices[:, :3, :3]),
+        )
+
+    def _load(self, chunk_index):
+        if chunk_index != self._loaded_index:
+            path = os.path.join(self.path, self._chunk_files[chunk_index])
+            with np.load(path) as data:
+                self._loaded = {name: data[name] for name in data.files}
+
+            self._raw = None
+            if self.frames == "raw":
+                raw_path = os.path.join(self.path, f"frames_{chunk_index:05d}.npy")
+                if os.path.exists(raw_path):
+                    self._raw = np.load(raw_path, mmap_mode="r")
+
+            self._loaded_index = chunk_index
+        return self._loaded
+
+    def _image(self, data, k):
+        if self.frames == "jpeg":
+            start, end = data["jpeg_offsets"][k], data["jpeg_offsets"][k + 1]
+            if end == start:
+                return None
+            return cv2.imdecode(data["jpeg_data"][start:end], cv2.IMREAD_COLOR)
+
+        if self.frames == "raw" and self._raw is not None and data["has_image"][k]:
+            return np.array(self._raw[k])
+
+        return None
+
+
+def _offsets(counts):
+    return np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+
+
+def _tool_key(tool_id):
+    # Los ids de marcador se graban como texto; "instrument" queda igual
+    tool_id = str(tool_id)
+    return int(tool_id) if tool_id.lstrip("-").isdigit() else tool_id
@@ -1,12 +1,16 @@
 import cv2
 import numpy as np
 
+from project.calibration.registry import load_intrinsics
 from project.camera.camera import Camera
 from project.tracking.aruco_tracker import ArucoTracker
+from project.tracking.marker import estimate_marker_poses
 from project.communication.igtl_sender import IGTLSender
+from project.diagnostics.stability import StabilityAuditor
+from project.filters.outliers import PoseOutlierRejector
+from project.filters.pose_filter import PoseEMAFilter
+from project.math3d.pose import Pose
 from project.math3d.transforms import Transform
-from scipy.spatial.transform import Rotation as R_scipy
-from scipy.spatial.transform import Slerp
 
 def main():
 
@@ -18,9 +22,7 @@ def main():
     # -----------------------------
     # Calibración real
     # -----------------------------
-    calib = np.load("project/calibration/calibration.npz")
-    camera_matrix = calib["mtx"]
-    dist_coeffs = calib["dist"]
+    camera_matrix, dist_coeffs = load_intrinsics()
 
     # -----------------------------
     # Tracker
@@ -34,49 +36,58 @@ def main():
     # -----------------------------
     # OpenIGTLink
     # -----------------------------
-    igtl = IGTLSender("127.0.0.1", 18944)
+    # Asíncrono: un Slicer trabado no frena la captura ni la detección
+    igtl = IGTLSender("127.0.0.1", 18944, asynchronous=True)
 
     smoothed_distances = {}
 
-    translations_x = []
-    translations_y = []
-    translations_z = []
-    distances = []
+    # Últimos 1000 frames del puntero; se imprime con la tecla "a"
+    auditor = StabilityAuditor(capacity=1000)
 
     alpha = 0.7
     
-    filtered_translation = None
-    filtered_rotation = None
     filter_alpha = 0.85
+    # La traslación pasa sin filtrar: solo z se suaviza aparte
+    pose_filter = PoseEMAFilter(alpha=filter_alpha, translation_alpha=0.0)
     
+    # Saltos de profundidad y giros bruscos se descartan antes de suavizar
+    rejector = PoseOutlierRejector()
+
     filtered_z = None
     z_alpha = 0.9
-    max_z_jump = 0.01
+
+    tip_demo_offset = np.array([0, -0.02, 0])  # 10 cm hacia atrás
+    T_demo_offset = Transform.from_rotation_translation(
+        np.eye(3),
+        tip_demo_offset
+    )
+
+    T_camera_pointer = Transform.identity()
+    T_reference_camera = Transform.identity()
+    T_reference_pointer = Transform.identity()
 
     while True:
 
-        frame = camera.read()
+        captured = camera.read_frame()
+        frame = captured.image
 
-        transforms, corners, ids, rvecs = tracker.detect(frame)
+        transforms, corners, ids, rvecs = tracker.detect(captured)
 
         # Dibujar marcadores y detectar componente 10
         if ids is not None:
             cv2.aruco.drawDetectedMarkers(frame, corners, ids)
             
-            ids_flat = ids.flatten()
-            if 10 in ids_flat:
-                idx = np.where(ids_flat == 10)[0][0]
-                marker_corners = np.array([corners[idx]])
-                
-                rvecs_10, tvecs_10, _ = cv2.aruco.estimatePoseSingleMarkers(
-                    marker_corners,
-                    tracker.marker_length,
-                    camera_matrix,
-                    dist_coeffs
-                )
-                
-                rvec_marker = rvecs_10[0][0]
-                tvec_marker = tvecs_10[0][0]
+            pose_ids, rvecs_10, tvecs_10 = estimate_marker_poses(
+                corners,
+                ids,
+                tracker.marker_length,
+                camera_matrix,
+                dist_coeffs,
+                wanted_ids=[10],
+            )
+            if len(pose_ids) > 0:
+                rvec_marker = rvecs_10[0]
+                tvec_marker = tvecs_10[0]
                 
                 R_marker, _ = cv2.Rodrigues(rvec_marker)
                 
@@ -142,87 +153,61 @@ def main():
         # Enviar transforms a Slicer
         # ---------------------------------
         reference_id = 0
+        outgoing = {}
 
         if reference_id in transforms:
             T_camera_reference = transforms[reference_id]
-
-            igtl.send_transform(
-                name="Reference",
-                matrix=T_camera_reference.matrix(),
-            )
+            outgoing["Reference"] = T_camera_reference.view()
 
         if reference_id in transforms and "instrument" in transforms:
 
             T_camera_reference = transforms[reference_id]
-            T_camera_pointer = transforms["instrument"]
 
-            tip_demo_offset = np.array([0, -0.02, 0])  # 10 cm hacia atrás
-            T_demo_offset = Transform.from_rotation_translation(
-                np.eye(3),
-                tip_demo_offset
-            )
-
-            T_camera_pointer = T_camera_pointer @ T_demo_offset
-
-            T_reference_pointer = T_camera_reference.inverse() @ T_camera_pointer
+            # Sin reservar memoria por frame: se escribe en los buffers fijos
+            transforms["instrument"].compose_into(T_demo_offset, T_camera_pointer)
+            T_camera_reference.inverse_into(T_reference_camera)
+            T_reference_camera.compose_into(T_camera_pointer, T_reference_pointer)
             
             translation = T_reference_pointer.translation()
             distance = np.linalg.norm(translation)
 
-            # EMA filtering for translation
-            tx, ty, tz = translation
+            accepted = rejector.update(
+                "Pointer",
+                Pose.from_transform(T_reference_pointer),
+                captured.timestamp,
+            )
 
-            if filtered_z is None:
-                filtered_z = tz
-            else:
-                # limitar saltos grandes en profundidad
-                if abs(tz - filtered_z) > max_z_jump:
-                    tz = filtered_z
-                filtered_z = z_alpha * filtered_z + (1 - z_alpha) * tz
-            
-            translation_filtered = np.array([tx, ty, filtered_z])
-                
-            # SLERP filtering for rotation
-            R_current = R_scipy.from_matrix(T_reference_pointer.rotation())
-            
-            if filtered_rotation is None:
-                filtered_rotation = R_current
-            else:
-                key_rots = R_scipy.from_quat(
-                    np.vstack([
-                        filtered_rotation.as_quat(),
-                        R_current.as_quat()
-                    ])
-                )
-                
-                slerp_interp = Slerp([0, 1], key_rots)
-                
-                filtered_rotation = slerp_interp([1 - filter_alpha])[0]
+            if accepted is not None:
+                # EMA filtering for translation
+                tx, ty, tz = accepted.translation
 
-            T_filtered = Transform.from_rotation_translation(
-                filtered_rotation.as_matrix(),
-                translation_filtered
-            )
+                if filtered_z is None:
+                    filtered_z = tz
+                else:
+                    filtered_z = z_alpha * filtered_z + (1 - z_alpha) * tz
 
-            if len(translations_x) >= 1000:
-                translations_x.pop(0)
-                translations_y.pop(0)
-                translations_z.pop(0)
-                distances.pop(0)
+                # SLERP filtering for rotation
+                measured = Pose(accepted.quaternion, [tx, ty, filtered_z])
+                filtered = pose_filter.update("Pointer", measured)
+            else:
+                # Atípica: se mantiene la última pose filtrada
+                filtered = pose_filter.filtered("Pointer")
 
-            translations_x.append(translation[0])
-            translations_y.append(translation[1])
-            translations_z.append(translation[2])
-            distances.append(distance)
+            auditor.add("Pointer", translation, distance)
 
-            igtl.send_transform(
-                name="Pointer",
-                matrix=T_filtered.matrix(),
-            )
+            if filtered is not None:
+                outgoing["Pointer"] = filtered.transform().view()
         else:
             filtered_z = None
-            filtered_translation = None
-            filtered_rotation = None
+            pose_filter.reset("Pointer")
+
+        # Reference y Pointer del mismo frame salen en un solo lote
+        if outgoing:
+            igtl.send_transforms(
+                outgoing,
+                timestamp=captured.wall_time,
+                sequence=captured.sequence,
+            )
 
         # ---------------------------------
         # Distancia entre marcadores
@@ -252,30 +237,11 @@ def main():
         if key == ord("q"):
             break
         elif key == ord("a"):
-            frames_analyzed = len(distances)
-            if frames_analyzed > 0:
-                mean_x = np.mean(translations_x)
-                mean_y = np.mean(translations_y)
-                mean_z = np.mean(translations_z)
-                std_x = np.std(translations_x)
-                std_y = np.std(translations_y)
-                std_z = np.std(translations_z)
-                
-                mean_distance = np.mean(distances)
-                std_distance = np.std(distances)
-                max_deviation = np.max(np.abs(np.array(distances) - mean_distance))
-
-                print("\n--- Stability Audit Report ---")
-                print(f"Frames analyzed: {frames_analyzed}")
-                print(f"Mean (X, Y, Z): ({mean_x:.4f}, {mean_y:.4f}, {mean_z:.4f})")
-                print(f"Std (X, Y, Z): ({std_x:.4f}, {std_y:.4f}, {std_z:.4f})")
-                print(f"Mean distance: {mean_distance:.4f}")
-                print(f"Std distance: {std_distance:.4f}")
-                print(f"Max deviation: {max_deviation:.4f}")
-                print("------------------------------\n")
-            else:
-                print("\nNo data to analyze yet.\n")
+            print("\n" + auditor.format_report("Pointer"))
+            print(f"Outliers: {rejector.stats()['rejected']}")
+            print()
 
+    igtl.close()
     camera.release()
     cv2.destroyAllWindows()
 
@@ -1,6 +1,7 @@
 import cv2
-import numpy as np
+from calibration.registry import load_intrinsics
 from camera.camera import Camera
+from filters.kalman import PoseKalmanFilter
 from filters.smoothing import smooth_vector
 from navigation.reference_frame import ReferenceFrame
 from navigation.roles import MarkerRoles
@@ -13,9 +14,7 @@ def main():
     camera = Camera(index=0, width=1920, height=1080)
 
     # Cargar calibración real
-    calib = np.load("project/calibration/calibration.npz")
-    camera_matrix = calib["mtx"]
-    dist_coeffs = calib["dist"]
+    camera_matrix, dist_coeffs = load_intrinsics()
 
     tracker = ArucoTracker(
         marker_length=0.045,
@@ -28,19 +27,19 @@ def main():
 
     reference_frame = ReferenceFrame(base_marker_id=base_id)
 
-    last_transforms = {}
+    # Predice los marcadores durante dropouts cortos en lugar de congelarlos
+    kalman = PoseKalmanFilter(coast_time=0.2)
     smoothed_vectors = {}
     alpha = 0.85
 
     while True:
-        frame = camera.read()
+        captured = camera.read_frame()
+        frame = captured.image
 
-        transforms, corners, ids, _ = tracker.detect(frame)
+        transforms, corners, ids, _ = tracker.detect(captured)
 
-        if transforms:
-            last_transforms = transforms
-        else:
-            transforms = last_transforms
+        tracked = kalman.update_all(transforms, captured.timestamp)
+        transforms = {marker_id: t.pose.transform() for marker_id, t in tracked.items()}
 
         relative_transforms = reference_frame.compute_relative_transforms(transforms)
 
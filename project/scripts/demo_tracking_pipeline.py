@@ -0,0 +1,82 @@
+import cv2
+import numpy as np
+
+from project.calibration.registry import load_intrinsics
+from project.camera.camera import Camera
+from project.tracking.aruco_tracker import ArucoTracker
+from project.communication.igtl_sender import IGTLSender
+from project.pipeline.engine import Pipeline
+from project.pipeline.tracking_stages import (
+    DetectStage,
+    PoseFilterStage,
+    RelativePoseStage,
+    SendStage,
+)
+
+
+def draw(state):
+    frame = state.frame.image
+    result = state.result
+
+    if result.ids is not None:
+        cv2.aruco.drawDetectedMarkers(frame, result.corners, result.ids)
+
+    if state.pointer is not None:
+        dist_mm = np.linalg.norm(state.pointer.translation()) * 1000.0
+        cv2.putText(
+            frame,
+            f"Pointer | Dist: {dist_mm:.1f} mm",
+            (50, 80),
+            cv2.FONT_HERSHEY_SIMPLEX,
+            1,
+            (0, 255, 0),
+            2,
+            cv2.LINE_AA,
+        )
+
+    cv2.imshow("Tracking Pipeline → 3D Slicer", frame)
+
+    return (cv2.waitKey(1) & 0xFF) != ord("q")
+
+
+def main():
+
+    # Sin threaded: el hilo de captura del pipeline ya hace de grabber
+    camera = Camera(index=0, width=1920, height=1080)
+
+    camera_matrix, dist_coeffs = load_intrinsics()
+
+    tracker = ArucoTracker(
+        marker_length=0.045,
+        camera_matrix=camera_matrix,
+        dist_coeffs=dist_coeffs,
+        roi_tracking=True,
+    )
+
+    # Asíncrono: un Slicer trabado no frena la etapa de envío
+    igtl = IGTLSender("127.0.0.1", 18944, asynchronous=True)
+
+    pipeline = (
+        Pipeline()
+        .source("capture", camera.read_frame)
+        .stage("detect", DetectStage(tracker))
+        .stage("pose", RelativePoseStage(tracker.tip_offset))
+        .stage("filter", PoseFilterStage(alpha=0.85))
+        .stage("send", SendStage(igtl))
+        .display("display", draw)
+    )
+
+    try:
+        pipeline.run()
+    finally:
+        for name, stats in pipeline.stats().items():
+            print(
+                f"{name:>8}: {stats['fps']:.1f} fps, {stats['mean_ms']:.2f} ms, "
+                f"dropped {stats['dropped']}"
+            )
+        igtl.close()
+        camera.release()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,26 +1,26 @@
 import cv2
 import numpy as np
 
+from project.calibration.registry import load_intrinsics
 from project.camera.camera import Camera
 from project.tracking.aruco_tracker import ArucoTracker
 from project.communication.igtl_sender import IGTLSender
+from project.diagnostics.stability import StabilityAuditor
+from project.filters.pose_filter import PoseEMAFilter
 from project.math3d.transforms import Transform
 from scipy.spatial.transform import Rotation as R_scipy
-from scipy.spatial.transform import Slerp
 
 def main():
 
     # -----------------------------
     # Cámara
     # -----------------------------
-    camera = Camera(index=0, width=1920, height=1080)
+    camera = Camera(index=0, width=1920, height=1080, threaded=True)
 
     # -----------------------------
     # Calibración real
     # -----------------------------
-    calib = np.load("project/calibration/calibration.npz")
-    camera_matrix = calib["mtx"]
-    dist_coeffs = calib["dist"]
+    camera_matrix, dist_coeffs = load_intrinsics()
 
     # -----------------------------
     # Tracker
@@ -29,31 +29,52 @@ def main():
         marker_length=0.045,
         camera_matrix=camera_matrix,
         dist_coeffs=dist_coeffs,
+        roi_tracking=True,
     )
 
     # -----------------------------
     # OpenIGTLink
     # -----------------------------
-    igtl = IGTLSender("127.0.0.1", 18944)
+    igtl = IGTLSender("127.0.0.1", 18944, asynchronous=True)
+
+    # Tiempos por etapa (tracker, filtro, envío); se imprimen con la tecla "p"
+    profiler = tracker.profiler
+    profiler.enable()
 
     smoothed_distances = {}
 
-    translations_x = []
-    translations_y = []
-    translations_z = []
-    distances = []
+    # Últimos 1000 frames del puntero; se imprime con la tecla "a"
+    auditor = StabilityAuditor(capacity=1000)
 
     alpha = 0.7
     
-    filtered_translation = None
-    filtered_rotation = None
     filter_alpha = 0.85
+    pose_filter = PoseEMAFilter(alpha=filter_alpha)
+
+    # Offsets constantes del instrumento: board -> instrumento -> punta
+    R_board_to_instrument = R_scipy.from_euler("xyz", [0, 0, 0], degrees=True).as_matrix()
+
+    T_board_to_instrument = Transform.from_rotation_translation(
+        R_board_to_instrument,
+        np.zeros(3)
+    )
+
+    T_tip = Transform.from_rotation_translation(
+        np.eye(3),
+        tracker.tip_offset
+    )
+    T_board_tip = T_board_to_instrument @ T_tip
+
+    T_camera_pointer = Transform.identity()
+    T_reference_camera = Transform.identity()
+    T_reference_pointer = Transform.identity()
 
     while True:
 
-        frame = camera.read()
+        captured = camera.read_frame()
+        frame = captured.image
 
-        transforms, corners, ids, rvecs = tracker.detect(frame)
+        transforms, corners, ids, rvecs = tracker.detect(captured)
 
         # Dibujar marcadores
         if ids is not None:
@@ -103,89 +124,42 @@ def main():
         # Enviar transforms a Slicer
         # ---------------------------------
         reference_id = 0
+        outgoing = {}
 
         if reference_id in transforms:
             T_camera_reference = transforms[reference_id]
-
-            igtl.send_transform(
-                name="Reference",
-                matrix=T_camera_reference.matrix(),
-            )
+            outgoing["Reference"] = T_camera_reference.view()
 
         if reference_id in transforms and "instrument" in transforms:
 
             T_camera_reference = transforms[reference_id]
-            T_camera_pointer = transforms["instrument"]
-
-            R_board_to_instrument = R_scipy.from_euler("xyz", [0, 0, 0], degrees=True).as_matrix()
-
-            T_board_to_instrument = Transform.from_rotation_translation(
-                R_board_to_instrument,
-                np.zeros(3)
-            )
 
-            T_camera_pointer = T_camera_pointer @ T_board_to_instrument
-            
-            T_tip = Transform.from_rotation_translation(
-                np.eye(3),
-                tracker.tip_offset
-            )           
-            T_camera_pointer = T_camera_pointer @ T_tip
-
-            T_reference_pointer = T_camera_reference.inverse() @ T_camera_pointer
+            # Sin reservar memoria por frame: se escribe en los buffers fijos
+            transforms["instrument"].compose_into(T_board_tip, T_camera_pointer)
+            T_camera_reference.inverse_into(T_reference_camera)
+            T_reference_camera.compose_into(T_camera_pointer, T_reference_pointer)
             
             translation = T_reference_pointer.translation()
             distance = np.linalg.norm(translation)
 
-            # EMA filtering for translation
-            if filtered_translation is None:
-                filtered_translation = translation
-            else:
-                filtered_translation = (
-                    filter_alpha * filtered_translation +
-                    (1 - filter_alpha) * translation
-                )
-                
-            # SLERP filtering for rotation
-            R_current = R_scipy.from_matrix(T_reference_pointer.rotation())
-            
-            if filtered_rotation is None:
-                filtered_rotation = R_current
-            else:
-                key_rots = R_scipy.from_quat(
-                    np.vstack([
-                        filtered_rotation.as_quat(),
-                        R_current.as_quat()
-                    ])
-                )
-                
-                slerp_interp = Slerp([0, 1], key_rots)
-                
-                filtered_rotation = slerp_interp([1 - filter_alpha])[0]
-
-            T_filtered = Transform.from_rotation_translation(
-                filtered_rotation.as_matrix(),
-                filtered_translation
-            )
-
-            if len(translations_x) >= 1000:
-                translations_x.pop(0)
-                translations_y.pop(0)
-                translations_z.pop(0)
-                distances.pop(0)
+            # EMA en traslación y SLERP en rotación
+            t0 = profiler.start()
+            T_filtered = pose_filter.update("Pointer", T_reference_pointer).transform()
+            profiler.stop("filter.update", t0)
 
-            translations_x.append(translation[0])
-            translations_y.append(translation[1])
-            translations_z.append(translation[2])
-            distances.append(distance)
+            auditor.add("Pointer", translation, distance)
 
-            igtl.send_transform(
-                name="Pointer",
-                matrix=T_filtered.matrix(),
-            )
+            outgoing["Pointer"] = T_filtered.view()
         else:
-            filtered_translation = None
-            filtered_rotation = None
+            pose_filter.reset("Pointer")
+
+        # Reference y Pointer del mismo frame salen en un solo lote
+        if outgoing:
+            igtl.send_transforms(
+                outgoing,
+                timestamp=captured.wall_time,
+                sequence=captured.sequence,
+            )
 
         # ---------------------------------
         # Distancia entre marcadores
@@ -215,29 +189,11 @@ def main():
         if key == ord("q"):
             break
         elif key == ord("a"):
-            frames_analyzed = len(distances)
-            if frames_analyzed > 0:
-                mean_x = np.mean(translations_x)
-                mean_y = np.mean(translations_y)
-                mean_z = np.mean(translations_z)
-                std_x = np.std(translations_x)
-                std_y = np.std(translations_y)
-                std_z = np.std(translations_z)
-                
-                mean_distance = np.mean(distances)
-                std_distance = np.std(distances)
-                max_deviation = np.max(np.abs(np.array(distances) - mean_distance))
-
-                print("\n--- Stability Audit Report ---")
-                print(f"Frames analyzed: {frames_analyzed}")
-                print(f"Mean (X, Y, Z): ({mean_x:.4f}, {mean_y:.4f}, {mean_z:.4f})")
-                print(f"Std (X, Y, Z): ({std_x:.4f}, {std_y:.4f}, {std_z:.4f})")
-                print(f"Mean distance: {mean_distance:.4f}")
-                print(f"Std distance: {std_distance:.4f}")
-                print(f"Max deviation: {max_deviation:.4f}")
-                print("------------------------------\n")
-            else:
-                print("\nNo data to analyze yet.\n")
+            print("\n" + auditor.format_report("Pointer"))
+            print()
+        elif key == ord("p"):
+            print("\n" + profiler.format_report())
+            print()
 
     camera.release()
     cv2.destroyAllWindows()
@@ -0,0 +1,83 @@
+"""
+Compara filtros de pose offline: jitter en reposo contra retraso.
+
+    python -m project.scripts.evaluate_filters                  # stream sintético
+    python -m project.scripts.evaluate_filters poses.npz        # stream grabado
+    python -m project.scripts.evaluate_filters poses.csv --betas 5 20 50
+    python -m project.scripts.evaluate_filters sesion/ --tool 0 # sesión grabada
+
+poses.npz: timestamps (N,), translations (N, 3), quaternions (N, 4) (x, y, z, w)
+poses.csv: t, x, y, z, qx, qy, qz, qw con encabezado
+sesion/:   directorio de SessionRecorder (tracking_service --record)
+"""
+
+import argparse
+import os
+
+from project.filters.evaluation import evaluate, load_pose_stream, synthetic_pose_stream
+from project.filters.kalman import PoseKalmanFilter
+from project.filters.one_euro import OneEuroPoseFilter
+from project.filters.pose_filter import PoseEMAFilter
+from project.recording.session_log import SessionReader
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        "stream", nargs="?", default=None, help=".npz, .csv o sesión grabada; sin archivo usa uno sintético"
+    )
+    parser.add_argument(
+        "--tool", default="instrument", help="sesión grabada: \"instrument\" o el id de un marcador"
+    )
+    parser.add_argument("--alphas", type=float, nargs="+", default=[0.5, 0.85, 0.9])
+    parser.add_argument("--min-cutoffs", type=float, nargs="+", default=[0.3, 1.0])
+    parser.add_argument("--betas", type=float, nargs="+", default=[5.0, 20.0, 50.0])
+    parser.add_argument("--rotation-beta", type=float, default=0.5)
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    true_translations = None
+    if args.stream is None:
+        timestamps, translations, quaternions, true_translations, _ = synthetic_pose_stream()
+        print("Stream sintético: reposo, 0.5 Hz y 2 Hz (ruido 0.5 mm / 0.17°)")
+    elif os.path.isdir(args.stream):
+        timestamps, translations, quaternions = SessionReader(args.stream).pose_stream(args.tool)
+        print(f"{args.stream}: {len(timestamps)} poses de {args.tool}")
+    else:
+        timestamps, translations, quaternions = load_pose_stream(args.stream)
+        print(f"{args.stream}: {len(timestamps)} poses")
+
+    candidates = [("crudo", PoseEMAFilter(0.0))]
+    candidates += [(f"ema alpha={alpha}", PoseEMAFilter(alpha)) for alpha in args.alphas]
+    candidates += [
+        (
+            f"one-euro fc={min_cutoff} beta={beta}",
+            OneEuroPoseFilter(min_cutoff, beta, rotation_beta=args.rotation_beta),
+        )
+        for min_cutoff in args.min_cutoffs
+        for beta in args.betas
+    ]
+    candidates.append(("kalman cv", PoseKalmanFilter()))
+
+    header = f"{'filtro':<30} {'jitter mm':>10} {'jitter °':>10} {'retraso ms':>11}"
+    if true_translations is not None:
+        header += f" {'error mm':>9}"
+    print(header)
+
+    for name, pose_filter in candidates:
+        result = evaluate(pose_filter, timestamps, translations, quaternions, true_translations)
+
+        line = (
+            f"{name:<30} {result['jitter_mm']:>10.3f} "
+            f"{result['rotation_jitter_deg']:>10.4f} {result['lag_ms']:>11.1f}"
+        )
+        if "rms_error_mm" in result:
+            line += f" {result['rms_error_mm']:>9.2f}"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
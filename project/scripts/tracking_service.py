@@ -0,0 +1,339 @@
+import argparse
+import signal
+import threading
+import time
+
+import cv2
+import numpy as np
+
+from project.calibration.registry import load_intrinsics
+from project.camera.camera import Camera
+from project.camera.replay import ReplayCamera
+from project.tracking.aruco_tracker import ArucoTracker
+from project.communication.igtl_sender import IGTLSender
+from project.diagnostics.stability import StabilityAuditor
+from project.filters.kalman import PoseKalmanFilter
+from project.filters.one_euro import OneEuroPoseFilter
+from project.filters.outliers import PoseOutlierRejector
+from project.pipeline.engine import Pipeline
+from project.recording.session_log import FRAME_MODES, SessionRecorder
+from project.pipeline.tracking_stages import (
+    DetectStage,
+    OutlierRejectionStage,
+    PoseFilterStage,
+    RecordStage,
+    RelativePoseStage,
+    SendStage,
+    StabilityAuditStage,
+)
+
+
+class PreviewStage:
+    """
+    Vista previa de baja frecuencia: una imagen reducida cada 1/rate_hz s,
+    en ventana o como snapshot JPEG. El resto de los frames pasan sin tocar.
+
+    Con window=True debe ir como display del pipeline (hilo principal):
+    HighGUI no es thread-safe en varios backends. La tecla "q" en la
+    ventana detiene el servicio.
+    """
+
+    def __init__(self, rate_hz=5.0, scale=0.25, window=False, snapshot_path=None):
+        self.period = 1.0 / rate_hz
+        self.scale = scale
+        self.window = window
+        self.snapshot_path = snapshot_path
+        self._last = 0.0
+
+    def __call__(self, state):
+        now = time.monotonic()
+        if now - self._last >= self.period:
+            self._last = now
+            self._show(state)
+
+        # La ventana necesita waitKey en cada frame para responder
+        if self.window and cv2.waitKey(1) & 0xFF == ord("q"):
+            return False
+
+        return state
+
+    def _show(self, state):
+        small = cv2.resize(
+            state.frame.image, None, fx=self.scale, fy=self.scale, interpolation=cv2.INTER_AREA
+        )
+
+        result = state.result
+        if result.ids is not None and len(result.ids) > 0:
+            corners = tuple(c * self.scale for c in result.corners)
+            cv2.aruco.drawDetectedMarkers(small, corners, result.ids)
+
+        if self.snapshot_path is not None:
+            cv2.imwrite(self.snapshot_path, small, [cv2.IMWRITE_JPEG_QUALITY, 80])
+
+        if self.window:
+            cv2.imshow("Tracking preview", small)
+
+
+def build_pipeline(
+    camera,
+    tracker,
+    igtl,
+    preview=None,
+    filter_alpha=0.85,
+    pose_filter=None,
+    predict=False,
+    rejector=None,
+    auditor=None,
+    recorder=None,
+    lossless=False,
+):
+    """
+    lossless=True: la detección frena a la fuente en lugar de descartar
+    frames (replay a máxima velocidad, donde cada frame cuenta).
+    """
+    pipeline = (
+        Pipeline()
+        .source("capture", camera.read_frame)
+        .stage("detect", DetectStage(tracker), drop_oldest=not lossless)
+        .stage("pose", RelativePoseStage(tracker.tip_offset))
+        .stage("outliers", OutlierRejectionStage(rejector or PoseOutlierRejector()))
+        .stage("filter", PoseFilterStage(alpha=filter_alpha, pose_filter=pose_filter))
+        .stage("send", SendStage(igtl, predictor=pose_filter if predict else None))
+    )
+
+    # Grabación y auditoría tras el envío: no añaden latencia al puntero
+    if recorder is not None:
+        pipeline.stage("record", RecordStage(recorder), queue_size=8, drop_oldest=True)
+
+    if auditor is not None:
+        pipeline.stage("audit", StabilityAuditStage(auditor), queue_size=8, drop_oldest=True)
+
+    # La vista previa va fuera de la cadena crítica: descarta si se atrasa.
+    # La ventana corre en el hilo principal (Pipeline.run); solo el
+    # snapshot puede ir en un hilo de etapa.
+    if preview is not None and preview.window:
+        pipeline.display("preview", preview)
+    elif preview is not None:
+        pipeline.stage("preview", preview, queue_size=1, drop_oldest=True)
+
+    return pipeline
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Servicio de tracking sin GUI hacia 3D Slicer")
+    parser.add_argument("--camera", type=int, default=0)
+    parser.add_argument("--replay", default=None, help="video, directorio de imágenes o sesión grabada en lugar de la cámara")
+    parser.add_argument("--paced", action="store_true", help="replay al ritmo original en lugar de a máxima velocidad")
+    parser.add_argument("--width", type=int, default=1920)
+    parser.add_argument("--height", type=int, default=1080)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=18944)
+    parser.add_argument("--marker-length", type=float, default=0.045)
+    parser.add_argument(
+        "--undistort",
+        action="store_true",
+        help="detectar sobre la imagen corregida (lentes con mucha distorsión, marcadores en los bordes); "
+        "las esquinas de la vista previa quedan en coordenadas corregidas",
+    )
+    parser.add_argument("--preview-window", action="store_true", help="ventana reducida a baja frecuencia")
+    parser.add_argument("--preview-snapshot", default=None, help="ruta JPEG que se sobrescribe periódicamente")
+    parser.add_argument("--preview-hz", type=float, default=5.0)
+    parser.add_argument("--preview-scale", type=float, default=0.25)
+    parser.add_argument("--filter", choices=("ema", "one-euro", "kalman"), default="ema")
+    parser.add_argument("--min-cutoff", type=float, default=0.3, help="One Euro: Hz en reposo")
+    parser.add_argument("--beta", type=float, default=20.0, help="One Euro: s/m")
+    parser.add_argument("--rotation-beta", type=float, default=0.5, help="One Euro: s/rad")
+    parser.add_argument("--coast-time", type=float, default=0.2, help="Kalman: segundos de predicción sin detección")
+    parser.add_argument(
+        "--predict",
+        action="store_true",
+        help="Kalman: extrapolar el puntero al instante de envío (con --replay, solo con --paced)",
+    )
+    parser.add_argument(
+        "--audit",
+        action="store_true",
+        help="auditoría de estabilidad del puntero en cada reporte (y con SIGUSR1)",
+    )
+    parser.add_argument("--record", default=None, help="directorio donde grabar la sesión")
+    parser.add_argument("--record-frames", choices=FRAME_MODES, default="none", help="imágenes en la grabación")
+    parser.add_argument("--profile", action="store_true", help="tiempos por etapa (p50/p95/p99) en cada reporte")
+    parser.add_argument(
+        "--profile-file",
+        default=None,
+        help="vuelca el perfil en cada reporte: texto de Prometheus si termina en .prom, JSON si no",
+    )
+    parser.add_argument("--stats-interval", type=float, default=10.0, help="segundos entre reportes (0 = nunca)")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    if args.replay:
+        camera = ReplayCamera(args.replay, paced=args.paced)
+    else:
+        camera = Camera(index=args.camera, width=args.width, height=args.height)
+
+    # Una sesión grabada trae los intrínsecos de la cámara que la grabó
+    metadata = getattr(camera, "metadata", {})
+    if "camera_matrix" in metadata and "dist_coeffs" in metadata:
+        camera_matrix = np.array(metadata["camera_matrix"], dtype=np.float64)
+        dist_coeffs = np.array(metadata["dist_coeffs"], dtype=np.float64)
+    else:
+        camera_matrix, dist_coeffs = load_intrinsics()
+
+    tracker = ArucoTracker(
+        marker_length=args.marker_length,
+        camera_matrix=camera_matrix,
+        dist_coeffs=dist_coeffs,
+        roi_tracking=True,
+        undistort=args.undistort,
+    )
+
+    # Asíncrono: un Slicer lento o caído no frena el tracking
+    igtl = IGTLSender(args.host, args.port, asynchronous=True)
+
+    # El mismo perfilador global que usan las etapas del pipeline
+    profiler = tracker.profiler
+    if args.profile or args.profile_file:
+        profiler.enable()
+
+    preview = None
+    if args.preview_window or args.preview_snapshot:
+        preview = PreviewStage(
+            rate_hz=args.preview_hz,
+            scale=args.preview_scale,
+            window=args.preview_window,
+            snapshot_path=args.preview_snapshot,
+        )
+
+    pose_filter = None
+    if args.filter == "one-euro":
+        pose_filter = OneEuroPoseFilter(args.min_cutoff, args.beta, rotation_beta=args.rotation_beta)
+    elif args.filter == "kalman":
+        pose_filter = PoseKalmanFilter(coast_time=args.coast_time)
+
+    # Un replay a máxima velocidad no corre en tiempo real: extrapolar al
+    # instante de envío daría un dt sin sentido
+    predict = args.predict and args.filter == "kalman"
+    if predict and args.replay and not args.paced:
+        print("Aviso: --predict requiere --paced con --replay; predicción desactivada.")
+        predict = False
+
+    rejector = PoseOutlierRejector()
+    auditor = StabilityAuditor() if args.audit else None
+
+    recorder = None
+    if args.record:
+        recorder = SessionRecorder(
+            args.record,
+            frames=args.record_frames,
+            metadata={
+                "camera_matrix": camera_matrix.tolist(),
+                "dist_coeffs": dist_coeffs.tolist(),
+                "marker_length": args.marker_length,
+            },
+        )
+
+    pipeline = build_pipeline(
+        camera,
+        tracker,
+        igtl,
+        preview,
+        pose_filter=pose_filter,
+        predict=predict,
+        rejector=rejector,
+        auditor=auditor,
+        recorder=recorder,
+        # Sin --paced el replay no es tiempo real: procesar todos los frames
+        lossless=args.replay is not None and not args.paced,
+    )
+
+    # SIGINT/SIGTERM detienen el servicio en lugar de la tecla "q"
+    stop = threading.Event()
+
+    def request_stop(signum, _frame):
+        print(f"Señal {signum} recibida, deteniendo...")
+        stop.set()
+
+    signal.signal(signal.SIGINT, request_stop)
+    signal.signal(signal.SIGTERM, request_stop)
+
+    # Sin teclado: la auditoría se pide con kill -USR1 <pid>
+    if auditor is not None and hasattr(signal, "SIGUSR1"):
+        signal.signal(signal.SIGUSR1, lambda signum, _frame: print(auditor.format_report("Pointer")))
+
+    def report():
+        for name, stats in pipeline.stats().items():
+            print(f"{name:>8}: {stats['fps']:.1f} fps, {stats['mean_ms']:.2f} ms, dropped {stats['dropped']}")
+
+        igtl_stats = igtl.stats()
+        print(
+            f"    igtl: {igtl_stats['state']}, "
+            f"enviados {igtl_stats['sent']}, descartados {igtl_stats['dropped']}, "
+            f"pendientes {igtl_stats['queue_depth']}, "
+            f"coalescidos {igtl_stats['coalesced']}, "
+            f"latencia {igtl_stats['mean_latency_ms']:.2f} ms (max {igtl_stats['max_latency_ms']:.2f})"
+        )
+
+        outlier_stats = rejector.stats()
+        print(
+            f"outliers: aceptados {outlier_stats['accepted']}, "
+            f"rechazados {outlier_stats['rejected']}, "
+            f"reiniciados {outlier_stats['reinitialized']}"
+        )
+
+        if recorder is not None:
+            record_stats = recorder.stats()
+            print(
+                f"  record: escritos {record_stats['written']}, "
+                f"descartados {record_stats['dropped']}, chunks {record_stats['chunks']}"
+            )
+
+        if auditor is not None:
+            print(auditor.format_report("Pointer"))
+
+        if args.profile:
+            print(profiler.format_report())
+        if args.profile_file:
+            profiler.write(args.profile_file)
+
+    def report_loop():
+        next_report = time.monotonic() + args.stats_interval
+
+        # Espera corta: el fin de un replay se nota enseguida
+        while not stop.is_set() and pipeline.running:
+            stop.wait(0.1)
+
+            if args.stats_interval > 0 and time.monotonic() >= next_report and not stop.is_set():
+                report()
+                next_report += args.stats_interval
+
+        # Con la ventana, esto saca a pipeline.run() del hilo principal
+        pipeline.stop()
+
+    print("Tracking en marcha. Ctrl+C o SIGTERM para detener.")
+
+    try:
+        pipeline.start()
+
+        if preview is not None and preview.window:
+            # cv2.imshow solo en el hilo principal: los reportes van en otro hilo
+            threading.Thread(target=report_loop, daemon=True).start()
+            pipeline.run()
+        else:
+            report_loop()
+    finally:
+        stop.set()
+        pipeline.stop()
+        if recorder is not None:
+            recorder.close()
+        igtl.close()
+        camera.release()
+
+    if pipeline.error is not None:
+        raise pipeline.error
+
+
+if __name__ == "__main__":
+    main()
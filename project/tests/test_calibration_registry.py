@@ -0,0 +1,61 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+from calibration.registry import CalibrationRegistry
+
+
+def write_intrinsics(path, fx):
+    mtx = np.array([[fx, 0.0, 960.0], [0.0, fx, 540.0], [0.0, 0.0, 1.0]])
+    np.savez(path, mtx=mtx, dist=np.zeros((1, 5)))
+
+
+def test_intrinsics_are_memoized(tmp_path):
+    path = tmp_path / "calibration.npz"
+    write_intrinsics(path, 1400.0)
+    registry = CalibrationRegistry(intrinsics_path=path)
+
+    first = registry.intrinsics()
+    second = registry.intrinsics()
+
+    assert first is second
+    assert not first[0].flags.writeable
+    assert not registry.changed()
+
+
+def test_intrinsics_reload_when_file_changes(tmp_path):
+    path = tmp_path / "calibration.npz"
+    write_intrinsics(path, 1400.0)
+    registry = CalibrationRegistry(intrinsics_path=path)
+    registry.intrinsics()
+
+    write_intrinsics(path, 1500.0)
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+    assert registry.changed()
+    camera_matrix, _ = registry.intrinsics()
+    assert camera_matrix[0, 0] == 1500.0
+
+
+def test_default_board_loads():
+    registry = CalibrationRegistry()
+
+    board, tip_offset = registry.instrument_board()
+
+    assert len(board.getIds()) > 0
+    assert np.allclose(tip_offset, [0.0, 0.0, 0.2013])
+
+
+def test_both_import_paths_share_one_registry():
+    project_dir = Path(__file__).resolve().parents[1]
+    code = (
+        "import project.calibration.registry as a\n"
+        "import calibration.registry as b\n"
+        "from project.tracking.aruco_tracker import calibration_registry\n"
+        "assert a.registry is b.registry is calibration_registry\n"
+    )
+    env = dict(os.environ, PYTHONPATH=str(project_dir))
+    subprocess.run([sys.executable, "-c", code], cwd=project_dir.parent, env=env, check=True)
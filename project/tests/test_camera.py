@@ -0,0 +1,101 @@
+import threading
+import time
+
+import cv2
+import numpy as np
+import pytest
+from camera.camera import Camera
+
+
+class GatedCapture:
+    """
+    VideoCapture falso: cada grab() espera un permiso del test y el frame
+    n tiene todos sus píxeles en n. fail() hace que el próximo grab falle.
+    """
+
+    def __init__(self):
+        self.permits = threading.Semaphore(1)   # el primer frame lo lee el constructor
+        self.grabs = 0
+        self.failing = False
+
+    def isOpened(self):
+        return True
+
+    def set(self, prop, value):
+        return True
+
+    def get(self, prop):
+        return 0.0
+
+    def grab(self):
+        self.permits.acquire()
+        if self.failing:
+            return False
+        self.grabs += 1
+        return True
+
+    def retrieve(self, image=None):
+        if image is None:
+            image = np.empty((4, 4, 3), dtype=np.uint8)
+        image[...] = self.grabs
+        return True, image
+
+    def allow(self, count=1):
+        for _ in range(count):
+            self.permits.release()
+
+    def fail(self):
+        self.failing = True
+        self.allow()
+
+    def release(self):
+        pass
+
+
+def wait_until(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline
+        time.sleep(0.001)
+
+
+def test_threaded_capture_drops_stale_frames_and_raises_grabber_errors(monkeypatch):
+    captures = []
+
+    def open_capture(index, backend):
+        captures.append(GatedCapture())
+        return captures[-1]
+
+    monkeypatch.setattr(cv2, "VideoCapture", open_capture)
+
+    camera = Camera(threaded=True)
+    cap = captures[0]
+
+    first = camera.read_frame()
+    assert first.sequence == 1 and first.image[0, 0, 0] == 1
+
+    # Tres frames sin leer: el 2 y el 3 se descartan, read_next da el 4
+    cap.allow(3)
+    wait_until(lambda: camera.frames_dropped == 2)
+    newest = camera.read_frame()
+    assert newest.sequence == 4 and newest.image[0, 0, 0] == 4
+    assert camera.frames_captured == 4
+
+    # latest no espera; next sí
+    assert camera.read_frame(latest=True).sequence == 4
+    with pytest.raises(RuntimeError, match="Tiempo de espera"):
+        camera.read_next(timeout=0.05)
+
+    # El frame 5 llega antes del fallo: se entrega y después el error
+    cap.allow()
+    wait_until(lambda: camera.frames_captured == 5)
+    cap.fail()
+    wait_until(lambda: camera._error is not None)
+
+    assert camera.read_frame(latest=True).sequence == 5
+    with pytest.raises(RuntimeError, match="No se pudo leer frame"):
+        camera.read_latest()
+    with pytest.raises(RuntimeError, match="No se pudo leer frame"):
+        camera.read_next()
+
+    camera.release()
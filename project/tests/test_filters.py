@@ -0,0 +1,246 @@
+import threading
+
+import numpy as np
+import pytest
+from filters.evaluation import estimate_lag, evaluate, synthetic_pose_stream
+from filters.kalman import PoseKalmanFilter
+from filters.one_euro import OneEuroFilter, OneEuroPoseFilter
+from filters.outliers import PoseOutlierRejector
+from filters.pose_filter import PoseEMAFilter
+from filters.smoothing import smooth_vector_timed
+from math3d.pose import Pose
+from math3d.transforms import Transform
+from scipy.spatial.transform import Rotation, Slerp
+
+
+def test_timed_smoothing_first_sample_passthrough():
+    storage = {}
+    v = np.array([1.0, 2.0, 3.0])
+
+    out = smooth_vector_timed(0, v, storage, 0.1, timestamp=5.0)
+
+    assert np.allclose(out, v)
+
+
+def test_timed_smoothing_longer_gap_weights_new_sample_more():
+    a = np.zeros(3)
+    b = np.ones(3)
+
+    short = {}
+    smooth_vector_timed(0, a, short, 0.1, timestamp=0.0)
+    out_short = smooth_vector_timed(0, b, short, 0.1, timestamp=0.033)
+
+    long = {}
+    smooth_vector_timed(0, a, long, 0.1, timestamp=0.0)
+    out_long = smooth_vector_timed(0, b, long, 0.1, timestamp=0.066)
+
+    assert np.allclose(out_short, 1 - np.exp(-0.33))
+    assert out_long[0] > out_short[0]
+
+
+def test_pose_filter_matches_scipy_slerp_ema():
+    alpha = 0.85
+    pose_filter = PoseEMAFilter(alpha)
+    rng = np.random.default_rng(0)
+
+    filtered_rotation = None
+    filtered_translation = None
+
+    for _ in range(10):
+        T = Transform.from_rvec_tvec(rng.uniform(-1.0, 1.0, 3), rng.uniform(-0.1, 0.1, 3))
+        out = pose_filter.update("Pointer", T)
+
+        # Implementación anterior de los demos
+        R_current = Rotation.from_matrix(T.rotation())
+        if filtered_rotation is None:
+            filtered_rotation = R_current
+            filtered_translation = T.translation()
+        else:
+            key_rots = Rotation.from_quat(np.vstack([filtered_rotation.as_quat(), R_current.as_quat()]))
+            filtered_rotation = Slerp([0, 1], key_rots)([1 - alpha])[0]
+            filtered_translation = alpha * filtered_translation + (1 - alpha) * T.translation()
+
+        assert np.allclose(out.rotation_matrix(), filtered_rotation.as_matrix(), atol=1e-9)
+        assert np.allclose(out.translation, filtered_translation, atol=1e-12)
+
+
+def test_pose_filter_state_is_per_tool_and_resets():
+    pose_filter = PoseEMAFilter(0.5)
+    a = Pose.from_rvec_tvec(np.zeros(3), np.zeros(3))
+    b = Pose.from_rvec_tvec(np.zeros(3), np.ones(3))
+
+    pose_filter.update("Pointer", a)
+    pose_filter.update("Probe", b)
+
+    assert np.allclose(pose_filter.update("Pointer", b).translation, 0.5)
+    assert np.allclose(pose_filter.filtered("Probe").translation, 1.0)
+
+    pose_filter.reset("Pointer")
+    assert np.allclose(pose_filter.update("Pointer", b).translation, 1.0)
+
+
+def test_pose_filter_time_constants_per_component():
+    with pytest.raises(ValueError):
+        PoseEMAFilter(translation_alpha=0.0, time_constant=0.1)
+
+    pose_filter = PoseEMAFilter(time_constant=0.1, translation_time_constant=0.0)
+    a = Pose.from_rvec_tvec(np.zeros(3), np.zeros(3))
+    b = Pose.from_rvec_tvec(np.array([0.0, 0.0, 0.5]), np.ones(3))
+
+    pose_filter.update("Pointer", a, timestamp=0.0)
+    out = pose_filter.update("Pointer", b, timestamp=0.033)
+
+    # Traslación sin filtrar; rotación con alpha = exp(-dt / 0.1)
+    assert np.allclose(out.translation, 1.0)
+    assert np.isclose(out.angle_to(a), 0.5 * (1.0 - np.exp(-0.33)))
+
+
+def test_one_euro_follows_fast_motion_with_less_lag():
+    slow = OneEuroFilter(min_cutoff=1.0, beta=0.0)
+    fast = OneEuroFilter(min_cutoff=1.0, beta=50.0)
+
+    for k in range(30):
+        value = np.array([0.01 * k, 0.0, 0.0])
+        out_slow = slow.update(value, timestamp=k / 30.0)
+        out_fast = fast.update(value, timestamp=k / 30.0)
+
+    assert abs(out_fast[0] - 0.29) < abs(out_slow[0] - 0.29)
+
+
+def test_estimate_lag_refines_sub_sample_delays():
+    timestamps = np.arange(300) / 30.0
+    raw = np.stack([np.sin(2.0 * np.pi * 0.5 * timestamps)] * 3, axis=-1)
+
+    for delay in (0.3 / 30.0, -0.3 / 30.0, 2.4 / 30.0):
+        filtered = np.stack([np.sin(2.0 * np.pi * 0.5 * (timestamps - delay))] * 3, axis=-1)
+        assert abs(estimate_lag(timestamps, raw, filtered) - delay) < 0.002
+
+    assert estimate_lag(timestamps, raw, raw) == 0.0
+
+
+def test_one_euro_pose_beats_ema_on_synthetic_stream():
+    timestamps, translations, quaternions, truth, _ = synthetic_pose_stream()
+
+    ema = evaluate(PoseEMAFilter(0.85), timestamps, translations, quaternions, truth)
+    one_euro = evaluate(OneEuroPoseFilter(0.3, 20.0, rotation_beta=0.5), timestamps, translations, quaternions, truth)
+
+    assert one_euro["lag_ms"] < 0.5 * ema["lag_ms"]
+    assert one_euro["jitter_mm"] < ema["jitter_mm"]
+
+
+def test_kalman_coasts_through_short_dropout_then_forgets():
+    kalman = PoseKalmanFilter(coast_time=0.2)
+
+    with pytest.raises(ValueError):
+        kalman.update("Pointer", Pose([0, 0, 0, 1], [0.0, 0.0, 0.3]))
+
+    for k in range(30):
+        pose = Pose([0, 0, 0, 1], [0.1 * k / 30.0, 0.0, 0.3])
+        kalman.update("Pointer", pose, k / 30.0)
+
+    # Sin medición: sigue la velocidad de 0.1 m/s
+    coasted = kalman.coast("Pointer", 1.0)
+    assert coasted is not None
+    assert abs(coasted.translation[0] - 0.1) < 0.005
+
+    assert kalman.coast("Pointer", 29 / 30.0 + 0.25) is None
+    assert kalman.filtered("Pointer") is None
+
+
+def test_kalman_predict_extrapolates_without_changing_state():
+    kalman = PoseKalmanFilter()
+    rotation = Rotation.from_rotvec([0.0, 0.0, 0.5])
+
+    for k in range(60):
+        t = k / 30.0
+        q = (rotation ** t).as_quat()
+        kalman.update("Pointer", Pose(q, [0.05 * t, 0.0, 0.0]), t)
+
+    last = 59 / 30.0
+    before = kalman.filtered("Pointer")
+    predicted = kalman.predict("Pointer", last + 0.1)
+
+    expected = Pose((rotation ** (last + 0.1)).as_quat(), [0.05 * (last + 0.1), 0.0, 0.0])
+    assert abs(predicted.translation[0] - expected.translation[0]) < 0.001
+    assert predicted.angle_to(expected) < np.radians(0.5)
+    assert np.allclose(kalman.filtered("Pointer").translation, before.translation)
+
+
+def test_kalman_readers_are_safe_while_tools_are_added():
+    kalman = PoseKalmanFilter()
+    kalman.update(0, Pose([0, 0, 0, 1], [0.0, 0.0, 0.3]), 0.0)
+    done = threading.Event()
+    errors = []
+
+    def read():
+        # Cada herramienta nueva realoca los arrays del estado
+        try:
+            while not done.is_set():
+                kalman.filtered(0)
+                kalman.covariance(0)
+                kalman.predict(0, 1.0)
+        except Exception as e:
+            errors.append(e)
+
+    reader = threading.Thread(target=read)
+    reader.start()
+    for tool_id in range(1, 300):
+        kalman.update(tool_id, Pose([0, 0, 0, 1], [0.0, 0.0, 0.3]), 0.0)
+        kalman.reset(tool_id)
+    done.set()
+    reader.join()
+
+    assert errors == []
+
+
+def test_kalman_update_all_tracks_several_tools():
+    kalman = PoseKalmanFilter(coast_time=0.2)
+    measurements = {
+        marker_id: Transform.from_rvec_tvec(np.zeros(3), np.array([0.1 * marker_id, 0.0, 0.3]))
+        for marker_id in range(4)
+    }
+
+    kalman.update_all(measurements, 0.0)
+    del measurements[2]
+    tracked = kalman.update_all(measurements, 1 / 30.0)
+
+    assert set(tracked) == {0, 1, 2, 3}
+    assert tracked[2].coasting and not tracked[1].coasting
+    assert tracked[3].covariance.shape == (6, 6)
+    assert np.allclose(tracked[3].pose.translation, [0.3, 0.0, 0.3])
+
+
+def test_outlier_rejector_drops_depth_spike_and_rotation_flip():
+    rejector = PoseOutlierRejector()
+    rng = np.random.default_rng(0)
+
+    for k in range(20):
+        pose = Pose([0, 0, 0, 1], [0.0, 0.0, 0.3] + rng.normal(0.0, 0.0003, 3))
+        assert rejector.update("Pointer", pose, k / 30.0) is not None
+
+    spike = Pose([0, 0, 0, 1], [0.0, 0.0, 0.33])
+    flipped = Pose(Rotation.from_euler("x", 60, degrees=True).as_quat(), [0.0, 0.0, 0.3])
+
+    assert rejector.update("Pointer", spike, 20 / 30.0) is None
+    assert rejector.update("Pointer", flipped, 21 / 30.0) is None
+    assert rejector.update("Pointer", Pose([0, 0, 0, 1], [0.0, 0.0, 0.3]), 22 / 30.0) is not None
+
+    stats = rejector.stats()
+    assert stats["rejected"]["innovation"] == 1
+    assert stats["rejected"]["rotation"] == 1
+    assert stats["tools"]["Pointer"] == 2
+
+
+def test_outlier_rejector_reinitializes_after_sustained_jump():
+    rejector = PoseOutlierRejector(max_consecutive_rejects=3)
+
+    for k in range(10):
+        rejector.update("Pointer", Pose([0, 0, 0, 1], [0.0, 0.0, 0.3]), k / 30.0)
+
+    moved = Pose([0, 0, 0, 1], [0.0, 0.0, 0.4])
+    results = [rejector.update("Pointer", moved, (10 + k) / 30.0) for k in range(4)]
+
+    # Dos rechazos y luego acepta el nuevo valor en lugar de quedarse bloqueado
+    assert results[0] is None and results[1] is None
+    assert results[2] is not None and results[3] is not None
+    assert rejector.stats()["reinitialized"] == 1
@@ -0,0 +1,179 @@
+import socket
+import struct
+import threading
+import time
+
+import numpy as np
+import pyigtl
+import pytest
+from communication.connection import CONNECTED, DOWN, RECONNECTING
+from communication.igtl_sender import IGTLSender
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def wait_until(condition, timeout=3.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def receive(server, count, timeout=3.0):
+    received = {}
+
+    def done():
+        for msg in server.get_latest_messages():
+            received[msg.device_name] = msg
+        return len(received) >= count
+
+    wait_until(done, timeout)
+    return received
+
+
+class GatedConnection:
+    """
+    Conexión falsa: el primer send() espera a que se abra la compuerta,
+    así los lotes siguientes quedan pendientes en el sender.
+    """
+
+    state = CONNECTED
+
+    def __init__(self):
+        self.gate = threading.Event()
+        self.writes = []
+
+    def send(self, data):
+        if not self.writes:
+            self.writes.append(None)
+            self.gate.wait(3.0)
+            self.writes[0] = data
+        else:
+            self.writes.append(data)
+        return True
+
+    def stats(self):
+        return {}
+
+    def close(self):
+        self.gate.set()
+
+
+def parse_devices(data):
+    """
+    [(device_name, timestamp)] de los mensajes IGTL concatenados en data.
+    """
+    devices = []
+    while data:
+        name = data[14:34].rstrip(b"\0").decode()
+        seconds, fraction = struct.unpack(">II", data[34:42])
+        (body_size,) = struct.unpack(">Q", data[42:50])
+        devices.append((name, round(seconds + fraction / 2**32, 3)))
+        data = data[58 + body_size:]
+    return devices
+
+
+@pytest.fixture
+def port():
+    return free_port()
+
+
+def test_batch_arrives_with_shared_timestamp(port):
+    server = pyigtl.OpenIGTLinkServer(port=port)
+    sender = IGTLSender("127.0.0.1", port)
+
+    try:
+        assert sender.connection.wait_connected(timeout=3.0)
+
+        matrix = np.eye(4)
+        matrix[:3, 3] = [0.1, 0.2, 0.3]
+        sender.send_transforms(
+            {"Reference": np.eye(4), "Pointer": matrix},
+            timestamp=12.5,
+            sequence=7,
+            status={"ok": True},
+        )
+
+        received = receive(server, 3)
+        assert set(received) == {"Reference", "Pointer", "TrackingStatus"}
+        assert all(msg.timestamp == 12.5 for msg in received.values())
+        assert np.allclose(received["Pointer"].matrix[:3, 3], [0.1, 0.2, 0.3])
+
+        devices = sender.stats()["devices"]
+        assert devices["Pointer"] == {"sent": 1, "dropped": 0}
+    finally:
+        sender.close()
+        server.stop()
+
+
+def test_send_without_server_does_not_block(port):
+    sender = IGTLSender("127.0.0.1", port, initial_backoff=0.01, max_backoff=0.05, down_after=0.1)
+
+    try:
+        start = time.perf_counter()
+        for _ in range(100):
+            sender.send_transform("Pointer", np.eye(4))
+        elapsed = time.perf_counter() - start
+
+        assert elapsed < 0.1
+        assert sender.stats()["devices"]["Pointer"] == {"sent": 0, "dropped": 100}
+        assert sender.state == RECONNECTING
+        assert wait_until(lambda: sender.state == DOWN)
+        assert sender.connection.backoff == pytest.approx(0.05)
+    finally:
+        sender.close()
+
+
+def test_reconnects_after_server_restart(port):
+    server = pyigtl.OpenIGTLinkServer(port=port)
+    sender = IGTLSender("127.0.0.1", port, asynchronous=True, initial_backoff=0.01, max_backoff=0.05)
+
+    try:
+        assert sender.connection.wait_connected(timeout=3.0)
+        server.stop()
+        assert wait_until(lambda: sender.state != CONNECTED)
+
+        server = pyigtl.OpenIGTLinkServer(port=port)
+        assert wait_until(lambda: sender.state == CONNECTED)
+        assert sender.connection.connects >= 2
+
+        sender.send_transform("Pointer", np.eye(4))
+        assert "Pointer" in receive(server, 1)
+    finally:
+        sender.close()
+        server.stop()
+
+
+def test_async_never_sends_stale_value_after_newer_one(port):
+    sender = IGTLSender("127.0.0.1", port, asynchronous=True)
+    sender.connection.close()
+    connection = GatedConnection()
+    sender.connection = connection
+
+    try:
+        sender.send_transforms({"Reference": np.eye(4)}, timestamp=0.5)
+        assert wait_until(lambda: connection.writes)
+
+        # Mientras el primer envío está bloqueado
+        sender.send_transforms({"Reference": np.eye(4)}, timestamp=1.0)
+        sender.send_transforms({"Reference": np.eye(4), "Pointer": np.eye(4)}, timestamp=2.0)
+        sender.send_transforms({"Reference": np.eye(4)}, timestamp=3.0)
+
+        connection.gate.set()
+        assert wait_until(lambda: len(connection.writes) == 3)
+
+        sent = [parse_devices(data) for data in connection.writes]
+        assert sent == [
+            [("Reference", 0.5)],
+            [("Pointer", 2.0)],
+            [("Reference", 3.0)],
+        ]
+        assert sender.coalesced == 2
+    finally:
+        sender.close()
@@ -0,0 +1,64 @@
+import cv2
+import numpy as np
+from tracking.marker import estimate_marker_poses, marker_object_points
+
+
+CAMERA_MATRIX = np.array([
+    [1400.0, 0.0, 960.0],
+    [0.0, 1400.0, 540.0],
+    [0.0, 0.0, 1.0],
+])
+DIST_COEFFS = np.array([0.05, -0.1, 0.0, 0.0, 0.0])
+MARKER_LENGTH = 0.045
+
+
+def project_marker(rvec, tvec):
+    pts, _ = cv2.projectPoints(
+        marker_object_points(MARKER_LENGTH), rvec, tvec, CAMERA_MATRIX, DIST_COEFFS
+    )
+    return pts.reshape(1, 4, 2).astype(np.float32)
+
+
+def test_recovers_known_poses():
+    rvecs = np.array([[0.2, -0.1, 0.05], [-0.3, 0.25, 1.2]])
+    tvecs = np.array([[0.05, -0.02, 0.4], [-0.1, 0.08, 0.55]])
+
+    corners = tuple(project_marker(r, t) for r, t in zip(rvecs, tvecs))
+    ids = np.array([[0], [1]], dtype=np.int32)
+
+    pose_ids, r_est, t_est = estimate_marker_poses(
+        corners, ids, MARKER_LENGTH, CAMERA_MATRIX, DIST_COEFFS
+    )
+
+    assert list(pose_ids) == [0, 1]
+    assert r_est.shape == (2, 3) and r_est.flags["C_CONTIGUOUS"]
+    assert np.allclose(t_est, tvecs, atol=1e-6)
+
+    for k in range(2):
+        R_true, _ = cv2.Rodrigues(rvecs[k])
+        R_est, _ = cv2.Rodrigues(r_est[k])
+        assert np.allclose(R_est, R_true, atol=1e-6)
+
+
+def test_only_requested_ids_are_solved():
+    corners = tuple(
+        project_marker(np.array([0.1, 0.0, 0.0]), np.array([0.02 * k, 0.0, 0.5]))
+        for k in range(4)
+    )
+    ids = np.array([[12], [0], [15], [1]], dtype=np.int32)
+
+    pose_ids, r_est, t_est = estimate_marker_poses(
+        corners, ids, MARKER_LENGTH, CAMERA_MATRIX, DIST_COEFFS, wanted_ids=(0, 1)
+    )
+
+    assert list(pose_ids) == [0, 1]
+    assert np.allclose(t_est[:, 0], [0.02, 0.06], atol=1e-6)
+
+
+def test_no_detections():
+    pose_ids, r_est, t_est = estimate_marker_poses(
+        (), None, MARKER_LENGTH, CAMERA_MATRIX, DIST_COEFFS
+    )
+
+    assert len(pose_ids) == 0
+    assert r_est.shape == (0, 3)
@@ -0,0 +1,129 @@
+import threading
+
+import cv2
+import numpy as np
+import pytest
+from camera.frame import Frame
+from camera.multi_camera import MultiCamera
+
+
+class ScriptedCamera:
+    """
+    Entrega frames con timestamps dados y luego EOFError, como ReplayCamera.
+    """
+
+    threaded = False
+
+    def __init__(self, timestamps):
+        self.timestamps = list(timestamps)
+        self.sequence = 0
+
+    def read_frame(self):
+        if self.sequence >= len(self.timestamps):
+            raise EOFError("fin")
+        timestamp = self.timestamps[self.sequence]
+        self.sequence += 1
+        return Frame(np.full((4, 4, 3), self.sequence, dtype=np.uint8), self.sequence, timestamp, 1000.0 + timestamp)
+
+    def release(self):
+        pass
+
+
+def test_frames_are_paired_by_nearest_timestamp():
+    period = 1 / 30.0
+    left = [k * period for k in range(10)]
+    # Derecha adelantada 3 ms, sin el frame 4 y con uno intermedio a 15 ms
+    right = [k * period + 0.003 for k in range(10) if k != 4]
+    right.insert(2, 1 * period + 0.015)
+
+    cameras = MultiCamera([ScriptedCamera(left), ScriptedCamera(right)], tolerance=0.008, buffer_size=32)
+
+    sets = []
+    with pytest.raises(EOFError):
+        while True:
+            sets.append(cameras.read_frame_set())
+
+    assert [s.frames[0].sequence for s in sets] == [1, 2, 3, 4, 6, 7, 8, 9, 10]
+    for frame_set in sets:
+        left_frame, right_frame = frame_set.frames
+        assert frame_set.timestamp == left_frame.timestamp
+        assert frame_set.skew == pytest.approx(0.003)
+        assert abs(right_frame.timestamp - left_frame.timestamp) == pytest.approx(0.003)
+
+    stats = cameras.stats()
+    assert stats["sets"] == 9
+    assert stats["unmatched"] == 1
+    assert stats["max_skew_ms"] == pytest.approx(3.0)
+
+    cameras.release()
+
+
+def test_latest_skips_older_sets_and_threaded_cameras_are_rejected():
+    timestamps = [k / 30.0 for k in range(6)]
+    cameras = MultiCamera([ScriptedCamera(timestamps), ScriptedCamera(timestamps)], buffer_size=16)
+
+    # Esperar a que ambos hilos terminen de leer
+    for thread in cameras._threads:
+        thread.join(timeout=1.0)
+
+    frame_set = cameras.read_frame_set(latest=True)
+    assert [f.sequence for f in frame_set.frames] == [6, 6]
+    assert frame_set.skew == 0.0
+    assert cameras.skipped == 5
+
+    with pytest.raises(EOFError):
+        cameras.read_frame_set()
+    cameras.release()
+
+    threaded = ScriptedCamera(timestamps)
+    threaded.threaded = True
+    with pytest.raises(ValueError):
+        MultiCamera([ScriptedCamera(timestamps), threaded])
+
+
+class BrokenCamera(ScriptedCamera):
+    """
+    Falla con cv2.error en el tercer frame.
+    """
+
+    def read_frame(self):
+        if self.sequence == 2:
+            raise cv2.error("backend caído")
+        return super().read_frame()
+
+
+class HeldCamera(ScriptedCamera):
+    """
+    Tras sus frames se bloquea en read_frame() hasta que el test la suelta.
+    """
+
+    def __init__(self, timestamps=()):
+        super().__init__(timestamps)
+        self.gate = threading.Event()
+        self.released = False
+
+    def read_frame(self):
+        if self.sequence >= len(self.timestamps):
+            self.gate.wait()
+        return super().read_frame()
+
+    def release(self):
+        self.released = True
+
+
+def test_any_camera_error_reaches_the_consumer_and_stuck_cameras_are_not_released():
+    timestamps = [k / 30.0 for k in range(6)]
+    held = HeldCamera(timestamps)
+    cameras = MultiCamera([held, BrokenCamera(timestamps)], buffer_size=16)
+
+    sequences = [cameras.read_frame_set().frames[1].sequence for _ in range(2)]
+    assert sequences == [1, 2]
+    with pytest.raises(cv2.error, match="backend caído"):
+        cameras.read_frame_set()
+
+    # La primera cámara sigue dentro de read_frame(): no se libera
+    with pytest.warns(RuntimeWarning):
+        cameras.release(timeout=0.05)
+    assert not held.released
+
+    held.gate.set()
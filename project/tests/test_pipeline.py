@@ -0,0 +1,119 @@
+import threading
+import time
+
+import pytest
+from pipeline.engine import BoundedQueue, Pipeline
+
+
+def counter_source(limit):
+    lock = threading.Lock()
+    state = {"n": 0}
+
+    def read():
+        with lock:
+            state["n"] += 1
+            return state["n"] if state["n"] <= limit else None
+
+    return read
+
+
+def test_bounded_queue_drops_oldest():
+    queue = BoundedQueue(maxsize=2, drop_oldest=True)
+
+    for i in range(5):
+        queue.put(i)
+
+    assert queue.dropped == 3
+    assert queue.get(timeout=0) == 3
+    assert queue.get(timeout=0) == 4
+
+
+def test_items_flow_through_stages_in_order():
+    received = []
+    done = threading.Event()
+
+    def sink(x):
+        received.append(x)
+        if x == 40:
+            done.set()
+        return x
+
+    pipeline = (
+        Pipeline()
+        .source("source", counter_source(20))
+        .stage("double", lambda x: 2 * x, queue_size=100)
+        .stage("sink", sink, queue_size=100)
+    )
+    pipeline.start()
+    done.wait(timeout=5)
+    pipeline.stop()
+
+    # La primera cola puede descartar, pero el orden se conserva
+    assert received == sorted(received)
+    assert received[-1] == 40
+
+
+def test_idle_source_is_not_polled_in_a_busy_loop():
+    calls = []
+
+    def idle():
+        calls.append(None)
+        return None
+
+    pipeline = Pipeline(idle_wait=0.01).source("idle", idle).stage("sink", lambda x: x)
+    pipeline.start()
+    time.sleep(0.2)
+    pipeline.stop()
+
+    assert 5 <= len(calls) <= 30
+
+
+def test_display_can_stop_pipeline():
+    shown = []
+
+    def show(x):
+        shown.append(x)
+        return len(shown) < 3
+
+    pipeline = Pipeline().source("source", counter_source(10**9)).stage("id", lambda x: x).display("display", show)
+    pipeline.run()
+
+    assert len(shown) == 3
+    assert not pipeline.running
+
+
+def test_stage_error_is_raised_from_run():
+    def fail(x):
+        raise ValueError("stage failed")
+
+    pipeline = Pipeline().source("source", counter_source(10)).stage("fail", fail)
+
+    with pytest.raises(ValueError):
+        pipeline.run()
+
+
+def test_end_of_stream_drains_stages_and_stops():
+    received = []
+    items = iter(range(1, 6))
+
+    def read():
+        value = next(items, None)
+        if value is None:
+            raise EOFError
+        return value
+
+    pipeline = (
+        Pipeline()
+        .source("source", read)
+        .stage("first", lambda x: x, queue_size=100)
+        .stage("sink", received.append, queue_size=100)
+    )
+    pipeline.start()
+
+    deadline = time.monotonic() + 5
+    while pipeline.running and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert not pipeline.running
+    assert received == [1, 2, 3, 4, 5]
+    pipeline.stop()
@@ -0,0 +1,91 @@
+import numpy as np
+from math3d.pose import Pose
+from math3d.quaternion import quat_from_matrix, quat_multiply, quat_slerp
+from math3d.transforms import Transform
+from scipy.spatial.transform import Rotation, Slerp
+
+
+def random_pose(seed):
+    rng = np.random.default_rng(seed)
+    return Transform.from_rvec_tvec(rng.uniform(-3.0, 3.0, 3), rng.uniform(-1.0, 1.0, 3))
+
+
+def test_matrix_roundtrip():
+    for seed in range(20):
+        T = random_pose(seed)
+        assert np.allclose(Pose.from_transform(T).matrix(), T.matrix(), atol=1e-12)
+
+
+def test_rvec_matches_transform():
+    rvec = np.array([0.3, -2.0, 1.1])
+    tvec = np.array([0.1, 0.2, 0.5])
+
+    pose = Pose.from_rvec_tvec(rvec, tvec)
+    expected = Transform.from_rvec_tvec(rvec, tvec)
+
+    assert np.allclose(pose.matrix(), expected.matrix(), atol=1e-12)
+
+
+def test_compose_and_inverse_match_transform():
+    T_a_b = random_pose(1)
+    T_b_c = random_pose(2)
+    P_a_b = Pose.from_transform(T_a_b)
+    P_b_c = Pose.from_transform(T_b_c)
+
+    assert np.allclose((P_a_b @ P_b_c).matrix(), (T_a_b @ T_b_c).matrix(), atol=1e-12)
+    assert np.allclose(P_a_b.inverse().matrix(), T_a_b.inverse().matrix(), atol=1e-12)
+
+    point = np.array([0.2, -0.3, 0.4])
+    assert np.allclose(P_a_b.transform_point(point), T_a_b.matrix()[:3, :3] @ point + T_a_b.translation())
+
+
+def test_slerp_matches_scipy():
+    P0 = Pose.from_transform(random_pose(3))
+    P1 = Pose.from_transform(random_pose(4))
+
+    key_rots = Rotation.from_quat(np.vstack([P0.quaternion, P1.quaternion]))
+    expected = Slerp([0, 1], key_rots)([0.15])[0]
+
+    P = P0.slerp(P1, 0.15)
+
+    assert np.allclose(P.rotation_matrix(), expected.as_matrix(), atol=1e-12)
+    assert np.allclose(P.translation, 0.85 * P0.translation + 0.15 * P1.translation)
+
+
+def test_interpolate_by_timestamp():
+    P0 = Pose.from_rvec_tvec(np.zeros(3), np.zeros(3))
+    P1 = Pose.from_rvec_tvec(np.array([0.0, 0.0, 0.2]), np.array([1.0, 0.0, 0.0]))
+
+    middle = Pose.interpolate(P0, 10.0, P1, 10.1, 10.05)
+    ahead = Pose.interpolate(P0, 10.0, P1, 10.1, 10.2)
+
+    assert np.allclose(middle.translation, [0.5, 0.0, 0.0])
+    assert np.isclose(P0.angle_to(middle), 0.1)
+    assert np.allclose(ahead.translation, [2.0, 0.0, 0.0])
+    assert np.isclose(P0.angle_to(ahead), 0.4)
+
+
+def test_quaternion_translation_roundtrip():
+    P = Pose.from_transform(random_pose(5))
+
+    copy = Pose.from_quaternion_translation(P.quaternion_tuple, P.translation_tuple, normalized=True)
+    scaled = Pose.from_quaternion_translation(2.0 * P.quaternion, list(P.translation))
+
+    assert copy.quaternion_tuple == P.quaternion_tuple
+    assert copy.translation_tuple == P.translation_tuple
+    assert np.allclose(scaled.matrix(), P.matrix(), atol=1e-12)
+    assert all(type(v) is float for v in copy.quaternion_tuple + copy.translation_tuple)
+
+
+def test_scalar_quaternions_match_vectorized_module():
+    for seed in range(10):
+        T0, T1 = random_pose(seed), random_pose(seed + 100)
+        P0, P1 = Pose.from_transform(T0), Pose.from_transform(T1)
+
+        assert np.allclose(P0.quaternion, quat_from_matrix(T0.rotation()), atol=1e-12)
+        assert np.allclose((P0 @ P1).quaternion, quat_multiply(P0.quaternion, P1.quaternion), atol=1e-12)
+
+        # Mismo cuaternio o el opuesto (los dos representan la rotación)
+        expected = quat_slerp(P0.quaternion, P1.quaternion, 0.3)
+        q = P0.slerp(P1, 0.3).quaternion
+        assert np.allclose(q, expected, atol=1e-12) or np.allclose(q, -expected, atol=1e-12)
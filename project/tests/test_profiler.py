@@ -0,0 +1,80 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import cv2
+import numpy as np
+from diagnostics.profiler import Profiler
+from tracking.aruco_tracker import ArucoTracker
+
+CAMERA_MATRIX = np.array([[800.0, 0.0, 320.0], [0.0, 800.0, 240.0], [0.0, 0.0, 1.0]])
+
+
+def test_profiler_percentiles_counters_and_exports():
+    profiler = Profiler(capacity=100)
+
+    # Desactivado no registra nada
+    profiler.stop("stage", profiler.start())
+    profiler.count("frames")
+    assert profiler.snapshot() == {"stages": {}, "counters": {}}
+
+    profiler.enable()
+    for k in range(1, 201):
+        # Duraciones sintéticas de k µs: la ventana guarda las últimas 100
+        now = profiler.start()
+        profiler.stop("stage", now - 1000 * k)
+        profiler.count("frames")
+
+    stage = profiler.snapshot()["stages"]["stage"]
+    assert stage["count"] == 200
+    assert 0.14 < stage["p50_ms"] < 0.16
+    assert 0.19 < stage["p99_ms"] <= 0.2
+    assert 0.2 <= stage["max_ms"] < 0.25
+
+    assert json.loads(profiler.to_json())["counters"] == {"frames": 200}
+
+    text = profiler.to_prometheus()
+    assert 'navigation_stage_seconds{stage="stage",quantile="0.95"}' in text
+    assert 'navigation_stage_seconds_count{stage="stage"} 200' in text
+    assert "navigation_frames_total 200" in text
+
+
+def test_tracker_records_stage_times():
+    dictionary = cv2.aruco.getPredefinedDictionary(cv2.aruco.DICT_6X6_250)
+    image = np.full((480, 640), 255, dtype=np.uint8)
+    image[180:300, 260:380] = cv2.aruco.generateImageMarker(dictionary, 0, 120)
+    image = cv2.cvtColor(image, cv2.COLOR_GRAY2BGR)
+
+    profiler = Profiler(enabled=True)
+    tracker = ArucoTracker(0.045, CAMERA_MATRIX, np.zeros(5), profiler=profiler)
+
+    for _ in range(3):
+        tracker.detect(image)
+    tracker.detect(np.full_like(image, 255))
+
+    snapshot = profiler.snapshot()
+    assert set(snapshot["stages"]) == {
+        "tracker.gray",
+        "tracker.detect_markers",
+        "tracker.marker_pose",
+        "tracker.board_pose",
+    }
+    assert snapshot["stages"]["tracker.gray"]["count"] == 4
+    assert snapshot["stages"]["tracker.marker_pose"]["count"] == 3
+    assert snapshot["counters"] == {"tracker.frames": 4, "tracker.no_markers": 1}
+
+
+def test_both_import_paths_share_the_global_profiler():
+    project_dir = Path(__file__).resolve().parents[1]
+    code = (
+        "from project.diagnostics.profiler import profiler\n"
+        "from project.tracking.aruco_tracker import ArucoTracker\n"
+        "import numpy as np\n"
+        "profiler.enable()\n"
+        "tracker = ArucoTracker(0.045, np.eye(3), np.zeros(5))\n"
+        "assert tracker.profiler is profiler and tracker.profiler.enabled\n"
+    )
+    env = dict(os.environ, PYTHONPATH=str(project_dir))
+    subprocess.run([sys.executable, "-c", code], cwd=project_dir.parent, env=env, check=True)
@@ -0,0 +1,100 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import cv2
+import numpy as np
+import pytest
+from camera.replay import EndOfStream, ReplayCamera
+from recording.session_log import SessionRecorder
+from tracking.aruco_tracker import ArucoTracker, TrackingResult
+
+CAMERA_MATRIX = np.array([[800.0, 0.0, 320.0], [0.0, 800.0, 240.0], [0.0, 0.0, 1.0]])
+
+
+def marker_image(marker_id, x):
+    dictionary = cv2.aruco.getPredefinedDictionary(cv2.aruco.DICT_6X6_250)
+    marker = cv2.aruco.generateImageMarker(dictionary, marker_id, 120)
+    image = np.full((480, 640), 255, dtype=np.uint8)
+    image[180:300, x:x + 120] = marker
+    return cv2.cvtColor(image, cv2.COLOR_GRAY2BGR)
+
+
+def test_image_directory_replay_runs_tracker_at_full_speed(tmp_path):
+    for k in range(5):
+        cv2.imwrite(str(tmp_path / f"frame_{k:03d}.png"), marker_image(0, 100 + 20 * k))
+
+    camera = ReplayCamera(tmp_path, fps=30.0)
+    tracker = ArucoTracker(0.045, CAMERA_MATRIX, np.zeros(5))
+
+    assert (camera.width, camera.height) == (640, 480)
+
+    frames = []
+    for _ in range(5):
+        frame = camera.read_frame()
+        transforms, _, ids, _ = tracker.detect(frame)
+        assert ids.ravel().tolist() == [0]
+        assert 0 in transforms
+        frames.append(frame)
+
+    assert [f.sequence for f in frames] == [1, 2, 3, 4, 5]
+    assert np.allclose(np.diff([f.timestamp for f in frames]), 1 / 30.0)
+
+    with pytest.raises(EndOfStream):
+        camera.read_frame()
+
+
+def test_session_replay_keeps_recorded_timing_and_loops(tmp_path):
+    with SessionRecorder(tmp_path, frames="jpeg") as recorder:
+        for k in range(3):
+            result = TrackingResult({}, (), None, {}, k + 1, 100.0 + 0.05 * k, 1e9 + 0.05 * k)
+            recorder.record(result, marker_image(1, 200))
+
+    camera = ReplayCamera(tmp_path, paced=True, speed=10.0, loop=True)
+    frames = [camera.read_frame() for _ in range(5)]
+
+    timestamps = np.array([f.timestamp for f in frames])
+    assert np.allclose(np.diff(timestamps), 0.005, atol=1e-9)
+    assert frames[1].wall_time == pytest.approx(1e9 + 0.05)
+    assert frames[0].image.shape == (480, 640, 3)
+
+
+def test_unpaced_replay_through_service_pipeline_keeps_every_frame(tmp_path):
+    for k in range(20):
+        cv2.imwrite(str(tmp_path / f"frame_{k:03d}.png"), marker_image(0, 100 + 10 * k))
+
+    # build_pipeline vive en los scripts, que importan vía project.*
+    project_dir = Path(__file__).resolve().parents[1]
+    code = f"""
+import time
+import numpy as np
+from project.camera.replay import ReplayCamera
+from project.scripts.tracking_service import build_pipeline
+from project.tracking.aruco_tracker import ArucoTracker
+
+class SlowTracker(ArucoTracker):
+    def detect_frame(self, frame):
+        time.sleep(0.005)
+        return super().detect_frame(frame)
+
+class CountingSender:
+    sequences = []
+    def send_transforms(self, transforms, timestamp=None, sequence=None):
+        self.sequences.append(sequence)
+
+camera_matrix = np.array({CAMERA_MATRIX.tolist()})
+tracker = SlowTracker(0.045, camera_matrix, np.zeros(5))
+igtl = CountingSender()
+pipeline = build_pipeline(ReplayCamera({str(tmp_path)!r}), tracker, igtl, lossless=True).start()
+while pipeline.running:
+    time.sleep(0.01)
+pipeline.stop()
+print(igtl.sequences)
+"""
+    env = dict(os.environ, PYTHONPATH=str(project_dir))
+    output = subprocess.run(
+        [sys.executable, "-c", code], cwd=project_dir.parent, env=env, check=True, capture_output=True, text=True
+    ).stdout
+
+    assert output.strip() == str(list(range(1, 21)))
@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+from benchmarks.synthetic import SyntheticScene, spread_board
+from calibration.registry import registry as calibration_registry
+from tracking.aruco_tracker import ArucoTracker
+from tracking.roi import predict_rois, roi_area
+
+# El marcador de referencia desaparece en el frame 4
+HIDDEN_FRAME = 4
+
+
+@pytest.fixture(scope="module")
+def scene_frames():
+    board, _ = calibration_registry.instrument_board()
+    scene = SyntheticScene(board=spread_board(board, 0.05), seed=2)
+    frames = [scene.render(k, hidden=(0,) if k == HIDDEN_FRAME else ()) for k in range(9)]
+    return scene, frames
+
+
+def make_tracker(scene, **options):
+    tracker = ArucoTracker(scene.marker_length, scene.camera_matrix, scene.dist_coeffs, **options)
+    tracker.board = scene.board
+    return tracker
+
+
+def detections(tracker, image):
+    _, corners, ids, _ = tracker.detect(image)
+    if ids is None:
+        return {}
+    return {int(i): c.reshape(4, 2) for i, c in zip(ids.ravel(), corners)}
+
+
+def assert_same_corners(a, b):
+    assert set(a) == set(b)
+    for marker_id in a:
+        assert np.abs(a[marker_id] - b[marker_id]).max() < 0.05
+
+
+def test_roi_tracking_matches_full_search_and_reacquires_on_full_search(scene_frames):
+    scene, frames = scene_frames
+    full = make_tracker(scene)
+    roi = make_tracker(scene, roi_tracking=True, full_search_interval=3)
+
+    since_full = []
+    for k, frame in enumerate(frames):
+        expected = detections(full, frame.image)
+        found = detections(roi, frame.image)
+        since_full.append(roi._frames_since_full)
+
+        if k in (HIDDEN_FRAME + 1, HIDDEN_FRAME + 2):
+            # Tras perderse, la referencia solo se busca en la búsqueda completa
+            assert 0 in expected and 0 not in found
+            expected.pop(0)
+
+        assert_same_corners(found, expected)
+
+    # Búsqueda completa forzada cada 3 frames, y al perder la referencia
+    assert since_full == [0, 1, 2, 0, 0, 1, 2, 0, 1]
+    assert 0 not in detections(full, frames[HIDDEN_FRAME].image)
+
+
+def test_large_rois_fall_back_to_full_search(scene_frames):
+    scene, frames = scene_frames
+    full = make_tracker(scene)
+    roi = make_tracker(scene, roi_tracking=True, max_roi_fraction=0.001)
+
+    for frame in frames[:4]:
+        assert_same_corners(detections(roi, frame.image), detections(full, frame.image))
+        assert roi._frames_since_full == 0
+
+
+def test_predict_rois_shifts_clamps_and_merges():
+    square = np.array([[100, 100], [120, 100], [120, 120], [100, 120]], dtype=np.float32)
+    edge = np.array([[0, 470], [20, 470], [20, 479], [0, 479]], dtype=np.float32)
+
+    rois = predict_rois([square, edge], (480, 640), margin=0.5, velocities=[np.array([5.0, 0.0]), np.zeros(2)])
+    assert sorted(rois) == [(0, 460, 31, 480), (95, 90, 136, 131)]
+
+    # Dos marcadores solapados quedan en una sola región
+    merged = predict_rois([square, square + 15], (480, 640), margin=0.5)
+    assert merged == [(90, 90, 146, 146)]
+    assert roi_area(merged) == 56 * 56
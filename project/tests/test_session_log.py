@@ -0,0 +1,97 @@
+import threading
+
+import numpy as np
+from math3d.transforms import Transform
+from recording.session_log import SessionReader, SessionRecorder
+from tracking.aruco_tracker import TrackingResult
+
+
+def make_result(k):
+    corners = (np.full((1, 4, 2), k, dtype=np.float32), np.full((1, 4, 2), -k, dtype=np.float32))
+    ids = np.array([[0], [10]], dtype=np.int32) if k % 2 == 0 else None
+    transforms = {}
+    if ids is not None:
+        transforms[0] = Transform.from_rvec_tvec(np.zeros(3), np.array([0.0, 0.0, 0.3 + 0.001 * k]))
+        transforms["instrument"] = Transform.from_rvec_tvec(np.array([0.1, 0.0, 0.0]), np.array([0.05, 0.0, 0.3]))
+    return TrackingResult(transforms, corners if ids is not None else (), ids, {}, k + 1, 10.0 + k / 30.0, 1e9 + k)
+
+
+def test_round_trip_across_chunks_with_jpeg_frames(tmp_path):
+    image = np.zeros((48, 64, 3), dtype=np.uint8)
+    image[10:20, 10:30] = 255
+
+    with SessionRecorder(tmp_path, frames="jpeg", chunk_frames=4, metadata={"camera": 0}) as recorder:
+        for k in range(10):
+            assert recorder.record(make_result(k), image)
+
+    assert recorder.stats()["written"] == 10
+    assert recorder.stats()["chunks"] == 3
+
+    reader = SessionReader(tmp_path)
+    assert len(reader) == 10
+    assert reader.metadata == {"camera": 0}
+
+    frames = list(reader)
+    assert [f.sequence for f in frames] == list(range(1, 11))
+
+    even, odd = frames[6], frames[7]
+    assert even.ids.ravel().tolist() == [0, 10]
+    assert np.allclose(even.corners[0], 6)
+    assert set(even.transforms) == {0, "instrument"}
+    assert np.allclose(even.transforms[0].translation(), [0.0, 0.0, 0.306])
+    assert odd.ids is None and odd.transforms == {}
+
+    assert even.image.shape == image.shape
+    assert np.abs(even.image.astype(int) - image).mean() < 5
+
+
+def test_raw_frames_and_pose_stream(tmp_path):
+    images = [np.full((8, 8, 3), k, dtype=np.uint8) for k in range(5)]
+
+    with SessionRecorder(tmp_path, frames="raw", chunk_frames=3) as recorder:
+        for k in range(5):
+            recorder.record(make_result(k), images[k])
+
+    reader = SessionReader(tmp_path)
+    assert np.array_equal(reader[4].image, images[4])
+    assert np.array_equal(reader[1].image, images[1])
+
+    timestamps, translations, quaternions = reader.pose_stream(0)
+    assert np.allclose(timestamps, [10.0, 10.0 + 2 / 30.0, 10.0 + 4 / 30.0])
+    assert np.allclose(translations[:, 2], [0.3, 0.302, 0.304])
+    assert quaternions.shape == (3, 4)
+
+
+def test_close_does_not_hang_after_writer_error(tmp_path):
+    recorder = SessionRecorder(tmp_path, queue_size=4)
+    entered = threading.Event()
+    release = threading.Event()
+
+    def failing_append(entry):
+        entered.set()
+        release.wait(3.0)
+        raise OSError("disco lleno")
+
+    recorder._append = failing_append
+
+    recorder.record(make_result(0))
+    assert entered.wait(3.0)
+    # La cola se llena mientras el escritor está atascado y luego muere
+    for k in range(1, 10):
+        recorder.record(make_result(k))
+    assert recorder.stats()["dropped"] > 0
+    release.set()
+
+    errors = []
+
+    def close():
+        try:
+            recorder.close()
+        except OSError as e:
+            errors.append(e)
+
+    closer = threading.Thread(target=close, daemon=True)
+    closer.start()
+    closer.join(3.0)
+    assert not closer.is_alive()
+    assert [str(e) for e in errors] == ["disco lleno"]
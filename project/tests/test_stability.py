@@ -0,0 +1,42 @@
+import numpy as np
+from diagnostics.stability import StabilityAuditor
+from math3d.transforms import Transform
+
+
+def test_window_statistics_match_numpy_after_wraparound():
+    rng = np.random.default_rng(0)
+    samples = rng.normal([0.01, -0.02, 0.3], 0.001, (250, 3))
+
+    auditor = StabilityAuditor(capacity=100)
+    for sample in samples:
+        auditor.add("Pointer", sample)
+
+    report = auditor.report("Pointer")
+    window = samples[-100:]
+    distances = np.linalg.norm(window, axis=1)
+
+    assert report["frames"] == 100
+    assert report["total_frames"] == 250
+    assert np.allclose(report["mean"], window.mean(axis=0))
+    assert np.allclose(report["std"], window.std(axis=0))
+    assert np.allclose(report["min"], window.min(axis=0))
+    assert np.allclose(report["max"], window.max(axis=0))
+    assert np.isclose(report["std_distance"], distances.std())
+    assert np.isclose(report["distance_percentiles"][95], np.percentile(distances, 95))
+    assert np.isclose(report["max_deviation"], np.max(np.abs(distances - distances.mean())))
+
+
+def test_auditor_is_per_tool_and_resets():
+    auditor = StabilityAuditor(capacity=10)
+
+    assert auditor.report("Pointer") is None
+    assert "No data" in auditor.format_report("Pointer")
+
+    auditor.add_transform("Pointer", Transform.from_rotation_translation(np.eye(3), np.array([0.0, 0.0, 0.3])))
+    auditor.add("Reference", [0.0, 0.0, 0.5])
+
+    assert np.isclose(auditor.report("Pointer")["mean_distance"], 0.3)
+    assert "Frames analyzed: 1" in auditor.format_report("Reference")
+
+    auditor.reset("Pointer")
+    assert auditor.tools == ["Reference"]
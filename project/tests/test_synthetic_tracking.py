@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+from benchmarks.synthetic import SyntheticScene, pose_error, spread_board
+from calibration.registry import registry as calibration_registry
+from tracking.aruco_tracker import ArucoTracker
+
+
+def test_tracker_recovers_rendered_poses():
+    board, _ = calibration_registry.instrument_board()
+    scene = SyntheticScene(board=spread_board(board, 0.05), seed=1)
+
+    tracker = ArucoTracker(scene.marker_length, scene.camera_matrix, scene.dist_coeffs)
+    tracker.board = scene.board
+
+    for k in (0, 15, 30):
+        frame = scene.render(k)
+        assert frame.image.shape == (1080, 1920, 3)
+
+        transforms, _, _, _ = tracker.detect(frame.image)
+
+        for tool_id in (0, "instrument"):
+            translation_mm, rotation_deg = pose_error(transforms[tool_id], frame.truth[tool_id])
+            assert translation_mm < 2.0
+            assert rotation_deg < 1.0
+
+
+def test_pyramid_detection_matches_full_resolution_corners():
+    board, _ = calibration_registry.instrument_board()
+    scene = SyntheticScene(board=spread_board(board, 0.05), seed=3)
+
+    full = ArucoTracker(scene.marker_length, scene.camera_matrix, scene.dist_coeffs)
+    pyramid = ArucoTracker(scene.marker_length, scene.camera_matrix, scene.dist_coeffs, pyramid_levels=1)
+
+    for k in (0, 20):
+        image = scene.render(k).image
+        _, full_corners, full_ids, _ = full.detect(image)
+        _, corners, ids, _ = pyramid.detect(image)
+
+        expected = {int(i): c.reshape(4, 2) for i, c in zip(full_ids.ravel(), full_corners)}
+        found = {int(i): c.reshape(4, 2) for i, c in zip(ids.ravel(), corners)}
+
+        assert set(found) == set(expected)
+        for marker_id, points in found.items():
+            assert np.abs(points - expected[marker_id]).max() < 0.5
+
+
+@pytest.mark.parametrize("roi_tracking", [False, True])
+def test_undistort_mode_gives_same_poses_on_distorted_frames(roi_tracking):
+    board, _ = calibration_registry.instrument_board()
+    scene = SyntheticScene(board=spread_board(board, 0.05), seed=4)
+    # Los intrínsecos del registro tienen distorsión radial fuerte
+    assert abs(scene.dist_coeffs.ravel()[0]) > 0.1
+
+    plain = ArucoTracker(scene.marker_length, scene.camera_matrix, scene.dist_coeffs, roi_tracking=roi_tracking)
+    undistorted = ArucoTracker(
+        scene.marker_length, scene.camera_matrix, scene.dist_coeffs, roi_tracking=roi_tracking, undistort=True
+    )
+    plain.board = undistorted.board = scene.board
+
+    for k in range(3):
+        frame = scene.render(k)
+        expected, _, _, _ = plain.detect(frame.image)
+        transforms, _, _, _ = undistorted.detect(frame.image)
+
+        for tool_id in (0, "instrument"):
+            translation_mm, rotation_deg = pose_error(transforms[tool_id], expected[tool_id])
+            assert translation_mm < 1.0
+            assert rotation_deg < 1.0
+
+            translation_mm, rotation_deg = pose_error(transforms[tool_id], frame.truth[tool_id])
+            assert translation_mm < 2.0
+            assert rotation_deg < 1.0
@@ -0,0 +1,84 @@
+import cv2
+import numpy as np
+from math3d.quaternion import quat_from_matrix, quat_to_matrix
+from math3d.transforms import Transform, TransformBatch
+from scipy.spatial.transform import Rotation
+
+
+def random_batch(n, seed=0):
+    rng = np.random.default_rng(seed)
+    rvecs = rng.uniform(-np.pi, np.pi, size=(n, 3))
+    tvecs = rng.uniform(-1.0, 1.0, size=(n, 3))
+    return rvecs, tvecs
+
+
+def test_from_rvecs_matches_rodrigues():
+    rvecs, tvecs = random_batch(20)
+    batch = TransformBatch.from_rvecs_tvecs(rvecs, tvecs)
+
+    for k in range(len(rvecs)):
+        expected = Transform.from_rvec_tvec(rvecs[k], tvecs[k])
+        assert np.allclose(batch[k].matrix(), expected.matrix(), atol=1e-12)
+
+
+def test_rvec_roundtrip():
+    rvecs, tvecs = random_batch(20, seed=1)
+    batch = TransformBatch.from_rvecs_tvecs(rvecs, tvecs)
+
+    rvecs_back, tvecs_back = batch.to_rvecs_tvecs()
+    again = TransformBatch.from_rvecs_tvecs(rvecs_back, tvecs_back)
+
+    assert np.allclose(again.matrices(), batch.matrices(), atol=1e-12)
+    assert np.allclose(tvecs_back, tvecs)
+
+
+def test_quaternions_match_scipy():
+    rotations = Rotation.random(50, random_state=2)
+    R = rotations.as_matrix()
+
+    q = quat_from_matrix(R)
+    expected = rotations.as_quat()
+    expected[expected[:, 3] < 0] *= -1.0
+
+    assert np.allclose(q, expected, atol=1e-12)
+    assert np.allclose(quat_to_matrix(q), R, atol=1e-12)
+
+
+def test_compose_and_inverse_match_single_transforms():
+    rvecs, tvecs = random_batch(10, seed=3)
+    a = TransformBatch.from_rvecs_tvecs(rvecs, tvecs)
+    b = TransformBatch.from_rvecs_tvecs(rvecs[::-1], tvecs[::-1])
+
+    composed = a.inverse() @ b
+
+    for k in range(len(a)):
+        expected = a[k].inverse() @ b[k]
+        assert np.allclose(composed[k].matrix(), expected.matrix(), atol=1e-12)
+
+    identity = (a @ a.inverse()).matrices()
+    assert np.allclose(identity, np.eye(4), atol=1e-12)
+
+
+def test_broadcast_with_single_transform():
+    rvecs, tvecs = random_batch(5, seed=4)
+    batch = TransformBatch.from_rvecs_tvecs(rvecs, tvecs)
+    T = Transform.from_rotation_translation(np.eye(3), np.array([0.0, 0.0, 0.2]))
+
+    left = T @ batch
+    right = batch @ T
+
+    assert isinstance(left, TransformBatch)
+    assert np.allclose(left[2].matrix(), (T @ batch[2]).matrix())
+    assert np.allclose(right[2].matrix(), (batch[2] @ T).matrix())
+
+
+def test_transform_points():
+    rvecs, tvecs = random_batch(4, seed=5)
+    batch = TransformBatch.from_rvecs_tvecs(rvecs, tvecs)
+    points = np.array([[0.0, 0.0, 0.0], [0.1, 0.2, 0.3]])
+
+    transformed = batch.transform_points(points)
+
+    assert transformed.shape == (4, 2, 3)
+    R, _ = cv2.Rodrigues(rvecs[1])
+    assert np.allclose(transformed[1, 1], R @ points[1] + tvecs[1])
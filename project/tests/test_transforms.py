@@ -117,4 +117,36 @@ def test_rotation_determinant():
 
     det = np.linalg.det(R)
 
-    assert np.isclose(det, 1.0, atol=1e-9)
\ No newline at end of file
+    assert np.isclose(det, 1.0, atol=1e-9)
+
+def test_into_variants_match_operators():
+    T_a_b = Transform.from_rvec_tvec(np.array([0.1, -0.4, 0.9]), np.array([0.3, 0.2, 1.0]))
+    T_b_c = Transform.from_rvec_tvec(np.array([-1.2, 0.5, 0.2]), np.array([0.0, -0.1, 0.4]))
+
+    out = Transform.identity()
+    assert T_a_b.compose_into(T_b_c, out) is out
+    assert np.allclose(out.matrix(), (T_a_b @ T_b_c).matrix(), atol=1e-12)
+
+    T_a_b.inverse_into(out)
+    assert np.allclose(out.matrix(), np.linalg.inv(T_a_b.matrix()), atol=1e-12)
+
+    # La inversa en su propio buffer
+    out.inverse_into(out)
+    assert np.allclose(out.matrix(), T_a_b.matrix(), atol=1e-12)
+
+
+def test_out_parameters_and_readonly_view():
+    t = np.array([1.0, 2.0, 3.0])
+    T = Transform.from_rotation_translation(np.eye(3), t)
+
+    buffer = np.zeros(3)
+    assert T.translation(out=buffer) is buffer
+    assert np.allclose(buffer, t)
+
+    view = T.view()
+    assert not view.flags.writeable
+    assert np.shares_memory(view, T.view())
+
+    # Las copias por defecto no comparten memoria con el Transform
+    T.matrix()[0, 3] = 99.0
+    assert T.translation()[0] == 1.0
@@ -1,14 +1,80 @@
+from dataclasses import dataclass
+
 import cv2
+import numpy as np
+from calibration.registry import registry as calibration_registry
+from camera.camera_model import CameraModel
+from camera.frame import frame_image
+from diagnostics.profiler import profiler as default_profiler
 from math3d.transforms import Transform
-from project.tracking.instrument_board import create_instrument_board
+from tracking.marker import estimate_marker_poses
+from tracking.roi import predict_rois, roi_area
+
+
+@dataclass(slots=True)
+class TrackingResult:
+    """
+    Salida de ArucoTracker.detect_frame: poses y detecciones junto con
+    el timestamp y la secuencia del frame del que provienen.
+    """
+
+    transforms: dict
+    corners: tuple
+    ids: object
+    rvecs: object
+    sequence: int
+    timestamp: float
+    wall_time: float
 
 
 class ArucoTracker:
-    def __init__(self, marker_length, camera_matrix, dist_coeffs):
+    """
+    roi_tracking: busca solo alrededor de las esquinas del frame anterior.
+    Se hace búsqueda completa cada full_search_interval frames, cuando se
+    pierde algún marcador o cuando las ROIs cubren más de max_roi_fraction
+    de la imagen.
+
+    pyramid_levels: detecta candidatos en la imagen reducida 2**n veces (sin
+    refinamiento) y luego refina las esquinas con cornerSubPix solo en
+    parches de la imagen a resolución completa.
+
+    undistort: detecta sobre la imagen corregida con mapas precalculados
+    (CameraModel); la pose se resuelve con intrínsecos sin distorsión. En
+    modo ROI solo se corrigen los recortes. Las esquinas devueltas quedan en
+    coordenadas de la imagen corregida.
+
+    profiler: Profiler para los tiempos por etapa de detect(); por defecto
+    el global de diagnostics.profiler (desactivado salvo --profile).
+    """
+
+    def __init__(
+        self,
+        marker_length,
+        camera_matrix=None,
+        dist_coeffs=None,
+        roi_tracking=False,
+        full_search_interval=30,
+        roi_margin=0.6,
+        max_roi_fraction=0.5,
+        pyramid_levels=0,
+        reference_ids=(0, 1),
+        undistort=False,
+        profiler=None,
+    ):
         self.marker_length = marker_length
+        self.reference_ids = tuple(reference_ids)
+
+        # Sin intrínsecos explícitos se usan los del registro de calibración
+        self._intrinsics_from_registry = camera_matrix is None
+        if self._intrinsics_from_registry:
+            camera_matrix, dist_coeffs = calibration_registry.intrinsics()
         self.camera_matrix = camera_matrix
         self.dist_coeffs = dist_coeffs
-        self.board, self.tip_offset = create_instrument_board()
+
+        self.undistort = undistort
+        self._set_camera_model()
+
+        self.board, self.tip_offset = calibration_registry.instrument_board()
 
         self.aruco_dict = cv2.aruco.getPredefinedDictionary(cv2.aruco.DICT_6X6_250)
         self.parameters = cv2.aruco.DetectorParameters()
@@ -24,40 +90,255 @@ class ArucoTracker:
         self.parameters.cornerRefinementWinSize = 5
         self.detector = cv2.aruco.ArucoDetector(self.aruco_dict, self.parameters)
 
+        self.pyramid_levels = pyramid_levels
+        if pyramid_levels > 0:
+            coarse = cv2.aruco.DetectorParameters()
+            coarse.adaptiveThreshWinSizeMin = self.parameters.adaptiveThreshWinSizeMin
+            coarse.adaptiveThreshWinSizeMax = self.parameters.adaptiveThreshWinSizeMax
+            coarse.adaptiveThreshWinSizeStep = self.parameters.adaptiveThreshWinSizeStep
+            coarse.minMarkerPerimeterRate = self.parameters.minMarkerPerimeterRate
+            coarse.maxMarkerPerimeterRate = self.parameters.maxMarkerPerimeterRate
+            coarse.cornerRefinementMethod = cv2.aruco.CORNER_REFINE_NONE
+            self.coarse_detector = cv2.aruco.ArucoDetector(self.aruco_dict, coarse)
+
+            # La ventana cubre el error de esquina de la imagen reducida
+            win = self.parameters.cornerRefinementWinSize + 2 ** pyramid_levels
+            self._refine_win = (win, win)
+            self._refine_criteria = (
+                cv2.TERM_CRITERIA_EPS + cv2.TERM_CRITERIA_MAX_ITER,
+                self.parameters.cornerRefinementMaxIterations,
+                self.parameters.cornerRefinementMinAccuracy,
+            )
+
+        self.roi_tracking = roi_tracking
+        self.full_search_interval = full_search_interval
+        self.roi_margin = roi_margin
+        self.max_roi_fraction = max_roi_fraction
+
+        self._prev_corners = {}
+        self._prev_centers = {}
+        self._frames_since_full = 0
+
+        self.profiler = default_profiler if profiler is None else profiler
+
+    def reload_calibration(self):
+        """
+        Vuelve a leer board, tip offset e intrínsecos (si vinieron del
+        registro) cuando los archivos cambiaron en disco.
+        Devuelve True si se recargó algo.
+        """
+        if not calibration_registry.changed():
+            return False
+
+        self.board, self.tip_offset = calibration_registry.instrument_board()
+        if self._intrinsics_from_registry:
+            self.camera_matrix, self.dist_coeffs = calibration_registry.intrinsics()
+            self._set_camera_model()
+        return True
+
+    def _set_camera_model(self):
+        # Intrínsecos usados para la pose; sin distorsión si se corrige la imagen
+        self.pose_camera_matrix = self.camera_matrix
+        self.pose_dist_coeffs = self.dist_coeffs
+        self.camera_model = None
+
+        if self.undistort:
+            self.camera_model = CameraModel(self.camera_matrix, self.dist_coeffs)
+            self._undistorted_size = None
+
+    def detect_frame(self, frame):
+        """
+        Recibe un Frame y devuelve un TrackingResult con sus timestamps.
+        """
+        transforms, corners, ids, rvecs = self.detect(frame)
+        return TrackingResult(
+            transforms,
+            corners,
+            ids,
+            rvecs,
+            frame.sequence,
+            frame.timestamp,
+            frame.wall_time,
+        )
+
     def detect(self, frame):
+        """
+        frame: Frame o imagen BGR.
+        Devuelve (transforms, corners, ids, rvecs); rvecs es {marker_id: rvec}
+        solo para reference_ids.
+        """
+        profiler = self.profiler
+        t0 = profiler.start()
+
+        gray = cv2.cvtColor(frame_image(frame), cv2.COLOR_BGR2GRAY)
+        t0 = profiler.stop("tracker.gray", t0)
 
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        if self.camera_model is not None:
+            self._update_pose_intrinsics(gray.shape)
 
-        corners, ids, rejected = self.detector.detectMarkers(gray)
+        if self.roi_tracking:
+            corners, ids = self._detect_tracked(gray)
+        else:
+            corners, ids = self._detect_markers(self._view(gray))
+        t0 = profiler.stop("tracker.detect_markers", t0)
+        profiler.count("tracker.frames")
 
         transforms = {}
-        rvecs = None
+        rvecs = {}
 
-        if ids is not None:
-            # 1. Detectar poses individuales para los marcadores de referencia (0 y 1)
-            rvecs, tvecs, _ = cv2.aruco.estimatePoseSingleMarkers(
-                corners, self.marker_length, self.camera_matrix, self.dist_coeffs
+        if ids is None:
+            profiler.count("tracker.no_markers")
+        else:
+            # 1. Poses individuales solo para los marcadores de referencia (0 y 1)
+            pose_ids, ref_rvecs, ref_tvecs = estimate_marker_poses(
+                corners,
+                ids,
+                self.marker_length,
+                self.pose_camera_matrix,
+                self.pose_dist_coeffs,
+                wanted_ids=self.reference_ids,
             )
 
-            for i in range(len(ids)):
-                marker_id = int(ids[i][0])
-                if marker_id in [0, 1]:
-                    T = Transform.from_rvec_tvec(rvecs[i], tvecs[i])
-                    transforms[marker_id] = T
+            for k in range(len(pose_ids)):
+                marker_id = int(pose_ids[k])
+                transforms[marker_id] = Transform.from_rvec_tvec(ref_rvecs[k], ref_tvecs[k])
+                rvecs[marker_id] = ref_rvecs[k]
+            t0 = profiler.stop("tracker.marker_pose", t0)
 
             # 2. Estimar pose del instrumento usando el board
             retval, rvec, tvec = cv2.aruco.estimatePoseBoard(
                 corners,
                 ids,
                 self.board,
-                self.camera_matrix,
-                self.dist_coeffs,
+                self.pose_camera_matrix,
+                self.pose_dist_coeffs,
                 None,
                 None
             )
 
+            profiler.stop("tracker.board_pose", t0)
+
             if retval > 0:
                 T = Transform.from_rvec_tvec(rvec, tvec)
                 transforms["instrument"] = T
 
         return transforms, corners, ids, rvecs
+
+    def _update_pose_intrinsics(self, shape):
+        size = (shape[1], shape[0])
+        if size != self._undistorted_size:
+            rectified = self.camera_model.undistorted(size)
+            self.pose_camera_matrix = rectified.camera_matrix
+            self.pose_dist_coeffs = rectified.dist_coeffs
+            self._undistorted_size = size
+
+    def _view(self, gray, roi=None):
+        """
+        Recorte (o imagen completa) listo para detectar: corregido si
+        undistort está activo.
+        """
+        if self.camera_model is not None:
+            return self.camera_model.undistort(gray, roi)
+
+        if roi is None:
+            return gray
+
+        x0, y0, x1, y1 = roi
+        return gray[y0:y1, x0:x1]
+
+    def _detect_markers(self, gray):
+        if self.pyramid_levels == 0:
+            corners, ids, _ = self.detector.detectMarkers(gray)
+            return corners, ids
+
+        small = gray
+        for _ in range(self.pyramid_levels):
+            small = cv2.pyrDown(small)
+
+        corners, ids, _ = self.coarse_detector.detectMarkers(small)
+        if ids is None:
+            return corners, ids
+
+        # Centros de pixel: x_full = (x + 0.5) * s - 0.5
+        scale = 2 ** self.pyramid_levels
+        pts = np.concatenate(corners).reshape(-1, 1, 2)
+        pts = (pts + 0.5) * scale - 0.5
+
+        cv2.cornerSubPix(gray, pts, self._refine_win, (-1, -1), self._refine_criteria)
+
+        corners = tuple(pts.reshape(-1, 1, 4, 2))
+        return corners, ids
+
+    # -----------------------------
+    # Modo ROI
+    # -----------------------------
+    def reset_tracking(self):
+        self._prev_corners = {}
+        self._prev_centers = {}
+        self._frames_since_full = 0
+
+    def _detect_tracked(self, gray):
+        self._frames_since_full += 1
+
+        if self._prev_corners and self._frames_since_full < self.full_search_interval:
+            corners, ids = self._detect_in_rois(gray)
+
+            # Si se perdió algún marcador seguido, buscar en toda la imagen
+            if corners is not None:
+                self._remember(corners, ids)
+                return corners, ids
+
+        corners, ids = self._detect_markers(self._view(gray))
+        self._frames_since_full = 0
+        self._remember(corners, ids)
+        return corners, ids
+
+    def _detect_in_rois(self, gray):
+        tracked_ids = list(self._prev_corners.keys())
+
+        velocities = []
+        for marker_id in tracked_ids:
+            center = self._prev_corners[marker_id].mean(axis=0)
+            previous = self._prev_centers.get(marker_id)
+            velocities.append(np.zeros(2, np.float32) if previous is None else center - previous)
+
+        rois = predict_rois(
+            [self._prev_corners[i] for i in tracked_ids],
+            gray.shape,
+            self.roi_margin,
+            velocities,
+        )
+
+        if roi_area(rois) > self.max_roi_fraction * gray.shape[0] * gray.shape[1]:
+            return None, None
+
+        all_corners = []
+        all_ids = []
+
+        for x0, y0, x1, y1 in rois:
+            c, i = self._detect_markers(self._view(gray, (x0, y0, x1, y1)))
+
+            if i is None:
+                continue
+
+            offset = np.array([x0, y0], dtype=np.float32)
+            for k in range(len(i)):
+                all_corners.append(c[k] + offset)
+                all_ids.append(i[k])
+
+        found = {int(i[0]) for i in all_ids}
+        if not found.issuperset(tracked_ids):
+            return None, None
+
+        return tuple(all_corners), np.array(all_ids, dtype=np.int32).reshape(-1, 1)
+
+    def _remember(self, corners, ids):
+        previous = self._prev_corners
+        self._prev_centers = {i: c.mean(axis=0) for i, c in previous.items()}
+        self._prev_corners = {}
+
+        if ids is None:
+            return
+
+        for k in range(len(ids)):
+            self._prev_corners[int(ids[k][0])] = corners[k].reshape(4, 2)
@@ -3,11 +3,23 @@ import numpy as np
 import json
 import os
 
-def create_instrument_board():
+DEFAULT_JSON_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "calibration",
+    "instrument_marker_calibration.json",
+)
+
+TIP_OFFSET = (0.0, 0.0, 0.2013)  # metros, en el sistema del board
+
+
+def create_instrument_board(json_path=DEFAULT_JSON_PATH):
+    """
+    Preferir calibration.registry.load_instrument_board(), que memoiza
+    el resultado en lugar de reconstruir el board en cada llamada.
+    """
     marker_size = 0.045  # metros
     half = marker_size / 2.0
     
-    json_path = "project/calibration/instrument_marker_calibration.json"
     if not os.path.exists(json_path):
         raise FileNotFoundError(f"No se encuentra el archivo de calibracion JSON en: {json_path}")
         
@@ -53,6 +65,6 @@ def create_instrument_board():
     else:
         board = cv2.aruco.Board_create(np.array(objectPoints), aruco_dict, ids)
         
-    tip_offset = np.array([0.0, 0.0, 0.2013], dtype=np.float32)
+    tip_offset = np.array(TIP_OFFSET, dtype=np.float32)
     
     return board, tip_offset
@@ -0,0 +1,76 @@
+import cv2
+import numpy as np
+
+
+def marker_object_points(marker_length):
+    """
+    Esquinas 3D de un marcador cuadrado en su propio sistema, en el orden
+    que esperan detectMarkers y SOLVEPNP_IPPE_SQUARE.
+    """
+    half = marker_length / 2.0
+    return np.array([
+        [-half,  half, 0.0],
+        [ half,  half, 0.0],
+        [ half, -half, 0.0],
+        [-half, -half, 0.0],
+    ], dtype=np.float64)
+
+
+def select_markers(corners, ids, wanted_ids=None):
+    """
+    Filtra las detecciones por ID.
+    Devuelve (ids (N,), corners (N, 4, 2)) como arrays contiguos.
+    """
+    if ids is None or len(ids) == 0:
+        return np.empty(0, dtype=np.int32), np.empty((0, 4, 2), dtype=np.float64)
+
+    flat_ids = np.asarray(ids, dtype=np.int32).reshape(-1)
+    all_corners = np.asarray(corners, dtype=np.float64).reshape(-1, 4, 2)
+
+    if wanted_ids is None:
+        return flat_ids, all_corners
+
+    mask = np.isin(flat_ids, np.asarray(wanted_ids, dtype=np.int32))
+    return flat_ids[mask], all_corners[mask]
+
+
+def estimate_marker_poses(
+    corners, ids, marker_length, camera_matrix, dist_coeffs, wanted_ids=None
+):
+    """
+    Reemplazo de cv2.aruco.estimatePoseSingleMarkers (deprecado).
+
+    Solo resuelve los IDs pedidos. Las esquinas de todos los marcadores se
+    normalizan con una sola llamada a undistortPoints y cada pose se resuelve
+    con SOLVEPNP_IPPE_SQUARE sobre coordenadas normalizadas.
+
+    Devuelve (pose_ids (N,), rvecs (N, 3), tvecs (N, 3)).
+    """
+    pose_ids, image_points = select_markers(corners, ids, wanted_ids)
+    n = len(pose_ids)
+
+    rvecs = np.zeros((n, 3), dtype=np.float64)
+    tvecs = np.zeros((n, 3), dtype=np.float64)
+
+    if n == 0:
+        return pose_ids, rvecs, tvecs
+
+    normalized = cv2.undistortPoints(
+        image_points.reshape(-1, 1, 2), camera_matrix, dist_coeffs
+    ).reshape(n, 4, 2)
+
+    object_points = marker_object_points(marker_length)
+    identity = np.eye(3, dtype=np.float64)
+
+    for k in range(n):
+        _, rvec, tvec = cv2.solvePnP(
+            object_points,
+            normalized[k],
+            identity,
+            None,
+            flags=cv2.SOLVEPNP_IPPE_SQUARE,
+        )
+        rvecs[k] = rvec.reshape(3)
+        tvecs[k] = tvec.reshape(3)
+
+    return pose_ids, rvecs, tvecs
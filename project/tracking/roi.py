@@ -0,0 +1,71 @@
+import numpy as np
+
+
+def predict_rois(previous_corners, image_shape, margin=0.5, velocities=None):
+    """
+    Calcula regiones de búsqueda a partir de las esquinas del frame anterior.
+
+    previous_corners: lista de arrays (1, 4, 2) o (4, 2) en píxeles
+    margin: expansión relativa al tamaño del marcador en cada lado
+    velocities: desplazamiento (dx, dy) esperado por marcador, o None
+    Devuelve lista de (x0, y0, x1, y1) recortados a la imagen.
+    """
+    height, width = image_shape[:2]
+    rois = []
+
+    for i, c in enumerate(previous_corners):
+        pts = np.asarray(c, dtype=np.float32).reshape(4, 2)
+
+        if velocities is not None:
+            pts = pts + velocities[i]
+
+        x_min, y_min = pts.min(axis=0)
+        x_max, y_max = pts.max(axis=0)
+
+        pad = margin * max(x_max - x_min, y_max - y_min)
+
+        x0 = int(max(x_min - pad, 0))
+        y0 = int(max(y_min - pad, 0))
+        x1 = int(min(x_max + pad + 1, width))
+        y1 = int(min(y_max + pad + 1, height))
+
+        if x1 > x0 and y1 > y0:
+            rois.append((x0, y0, x1, y1))
+
+    return merge_rois(rois)
+
+
+def merge_rois(rois):
+    """
+    Une rectángulos que se solapan para no detectar dos veces el mismo marcador.
+    """
+    merged = list(rois)
+
+    changed = True
+    while changed:
+        changed = False
+        result = []
+
+        while merged:
+            x0, y0, x1, y1 = merged.pop()
+
+            i = 0
+            while i < len(merged):
+                a0, b0, a1, b1 = merged[i]
+                if a0 < x1 and x0 < a1 and b0 < y1 and y0 < b1:
+                    x0, y0 = min(x0, a0), min(y0, b0)
+                    x1, y1 = max(x1, a1), max(y1, b1)
+                    merged.pop(i)
+                    changed = True
+                else:
+                    i += 1
+
+            result.append((x0, y0, x1, y1))
+
+        merged = result
+
+    return merged
+
+
+def roi_area(rois):
+    return sum((x1 - x0) * (y1 - y0) for x0, y0, x1, y1 in rois)